@@ -89,6 +89,127 @@ def get_lead_grade(score):
     else:
         return 'D급 ⚪'
 
+# ============================================
+# 컬럼 단위 스코어링 (벡터 연산)
+# ============================================
+
+# 청약 자격이 없는 것으로 보는 Q7 라벨
+NO_SUBSCRIPTION_LABELS = ['', '무응답', '기타', 'nan']
+
+
+def _lookup_by_value(series, func):
+    """
+    값별 점수 함수를 고유값마다 한 번만 호출해 전체 행에 적용
+
+    category는 범주 목록에, 그 외에는 factorize 결과에 func를 적용한 뒤
+    코드로 꺼내옵니다 (결측은 func(np.nan)).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    table = np.array([func(v) for v in uniques] + [func(np.nan)], dtype=np.int64)
+    return table[np.where(codes < 0, len(uniques), codes)]
+
+
+def _has_subscription(series):
+    """
+    청약 자격 보유(특별공급, 1순위, 2순위) 여부 bool 배열
+
+    고유 라벨만 문자열로 정리해 isin으로 판정한 뒤 코드로 꺼내옵니다
+    (결측은 'nan'으로 보아 자격 없음).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    labels = pd.Index([str(v).strip() for v in uniques] + ['nan'], dtype=object)
+    eligible = ~labels.isin(NO_SUBSCRIPTION_LABELS)
+    return eligible[np.where(codes < 0, len(uniques), codes)]
+
+
+def _purpose_points(purpose):
+    if pd.isna(purpose):
+        return 0
+    if '실거주' in str(purpose):
+        return 15
+    if '투자' in str(purpose):
+        return 10
+    return 5
+
+
+def _channel_points(channel):
+    if pd.isna(channel):
+        return 0
+    channel_str = str(channel).lower()
+    if '지인' in channel_str or '추천' in channel_str:
+        return 15
+    if '현장' in channel_str or '방문' in channel_str:
+        return 12
+    if '온라인' in channel_str or '인터넷' in channel_str:
+        return 8
+    return 5
+
+
+def _numeric_column(df, col, default):
+    """숫자 컬럼을 float 배열로 (컬럼이 없으면 default로 채움)"""
+    if col not in df.columns:
+        return np.full(len(df), default, dtype=float)
+    return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+def calculate_lead_scores(df, price_range=(13, 16)):
+    """
+    전체 고객의 리드 스코어를 컬럼 단위로 계산
+
+    calculate_lead_score()와 같은 규칙을 np.select와 값별 점수표로
+    계산하므로 행 단위 apply 없이 같은 결과를 냅니다.
+
+    Args:
+        df: 분석용 데이터셋
+        price_range: 실제 분양가 범위 (억 단위, 예: (13, 16))
+
+    Returns:
+        Series: 리드 스코어 (0-100, df와 같은 인덱스)
+    """
+    # 1. 계약 의향 점수 (Q6_Intent) - 최대 30점
+    intent = _numeric_column(df, 'Q6_Intent', 0)
+    score = np.select([intent >= 7, intent >= 5, intent >= 3], [30, 20, 10], default=0)
+
+    # 2. 청약 자격 (Q7_Label) - 최대 25점
+    if 'Q7_Label' in df.columns:
+        score += np.where(_has_subscription(df['Q7_Label']), 25, 0)
+
+    # 3. 구매 목적 (Q4_Label) - 최대 15점 (컬럼이 없으면 '기타'로 보고 5점)
+    if 'Q4_Label' in df.columns:
+        score += _lookup_by_value(df['Q4_Label'], _purpose_points)
+    else:
+        score += 5
+
+    # 4. 희망 분양가 적합성 (Q8_Price) - 최대 20점
+    price = _numeric_column(df, 'Q8_Price', 0)
+    in_range = (price >= price_range[0]) & (price <= price_range[1])
+    near_range = np.abs(price - sum(price_range) / 2) <= 2
+    score += np.select([in_range, near_range], [20, 10], default=0)
+
+    # 5. 유입 채널 (Q2_Label) - 최대 15점 (컬럼이 없으면 5점)
+    if 'Q2_Label' in df.columns:
+        score += _lookup_by_value(df['Q2_Label'], _channel_points)
+    else:
+        score += 5
+
+    return pd.Series(score.astype(np.int64), index=df.index)
+
+
+def get_lead_grades(scores):
+    """리드 스코어 Series를 등급 Series로 변환 (get_lead_grade와 같은 기준)"""
+    labels = pd.Series(['D급 ⚪', 'C급 🟡', 'B급 🟠', 'A급 🔴'])
+    bins = np.searchsorted([40, 60, 80], scores.to_numpy(), side='right')
+    return pd.Series(labels.array.take(bins), index=scores.index)
+
+
 def apply_lead_scoring(df, price_range=(13, 16)):
     """
     전체 DataFrame에 리드 스코어링 적용
@@ -97,10 +218,8 @@ def apply_lead_scoring(df, price_range=(13, 16)):
         DataFrame with 'Lead_Score' and 'Lead_Grade' columns
     """
     df_result = df.copy()
-    df_result['Lead_Score'] = df_result.apply(
-        lambda row: calculate_lead_score(row, price_range), axis=1
-    )
-    df_result['Lead_Grade'] = df_result['Lead_Score'].apply(get_lead_grade)
+    df_result['Lead_Score'] = calculate_lead_scores(df_result, price_range)
+    df_result['Lead_Grade'] = get_lead_grades(df_result['Lead_Score'])
     return df_result
 
 def get_lead_score_summary(df):
@@ -132,6 +251,17 @@ def get_lead_score_summary(df):
 # RFIE 분석 (RFM 변형)
 # ============================================
 
+# R 점수 구간 경계 (경과 일수): ≤3, ≤7, ≤14, ≤21, 그 외
+RECENCY_DAY_BINS = [3, 7, 14, 21]
+
+# I 점수 구간 (Q6_Intent, 왼쪽 포함): [-inf,2)→1, [2,3)→2, [3,5)→3, [5,7)→4, [7,inf)→5
+INTENT_BINS = [-np.inf, 2, 3, 5, 7, np.inf]
+
+# RFIE 세그먼트 (점수 오름차순)와 구간 하한: <5, 5~7, 8~11, 12~14, ≥15
+RFIE_SEGMENTS = ['❌ Lost', '💤 At Risk', '🌱 Promising', '⭐ Loyal', '🏆 Champion']
+RFIE_SEGMENT_BINS = [5, 8, 12, 15]
+
+
 def calculate_rfie_scores(df, reference_date=None):
     """
     RFIE (Recency, Frequency, Intent, Eligibility) 분석
@@ -149,63 +279,35 @@ def calculate_rfie_scores(df, reference_date=None):
     if reference_date is None:
         reference_date = datetime.now()
     
-    # R (Recency) Score
+    # R (Recency) Score - 최근 응답일로부터 경과 일수 구간 (날짜 없으면 중간값 3)
     if 'Date' in df_result.columns:
         df_result['Date_parsed'] = pd.to_datetime(df_result['Date'], errors='coerce')
-        max_date = df_result['Date_parsed'].max()
-        
-        def r_score(date):
-            if pd.isna(date):
-                return 3  # 중간값
-            days_diff = (max_date - date).days
-            if days_diff <= 3:
-                return 5
-            elif days_diff <= 7:
-                return 4
-            elif days_diff <= 14:
-                return 3
-            elif days_diff <= 21:
-                return 2
-            else:
-                return 1
-        
-        df_result['R_Score'] = df_result['Date_parsed'].apply(r_score)
+        dates = df_result['Date_parsed'].to_numpy(dtype='datetime64[ns]')
+        valid = ~np.isnat(dates)
+        r_score = np.full(len(dates), 3, dtype=np.int64)
+        if valid.any():
+            days_diff = (dates[valid].max() - dates[valid]) // np.timedelta64(1, 'D')
+            # ≤3일: 5, ≤7일: 4, ≤14일: 3, ≤21일: 2, 그 외: 1
+            r_score[valid] = 5 - np.searchsorted(RECENCY_DAY_BINS, days_diff, side='left')
+        df_result['R_Score'] = r_score
     else:
         df_result['R_Score'] = 3  # 날짜 없으면 중간값
     
     # F (Frequency) Score - 현재는 1회 응답이므로 고정
     df_result['F_Score'] = 3  # 향후 CRM 연동 시 확장
     
-    # I (Intent) Score - Q6_Intent를 1-5점으로 변환
-    def i_score(intent):
-        if pd.isna(intent):
-            return 3
-        if intent >= 7:
-            return 5
-        elif intent >= 5:
-            return 4
-        elif intent >= 3:
-            return 3
-        elif intent >= 2:
-            return 2
-        else:
-            return 1
-    
+    # I (Intent) Score - Q6_Intent를 1-5점으로 변환 (≥7: 5, ≥5: 4, ≥3: 3, ≥2: 2, 그 외: 1)
     if 'Q6_Intent' in df_result.columns:
-        df_result['I_Score'] = df_result['Q6_Intent'].apply(i_score)
+        intent = pd.to_numeric(df_result['Q6_Intent'], errors='coerce')
+        i_bins = pd.cut(intent, bins=INTENT_BINS, right=False, labels=False)
+        df_result['I_Score'] = (i_bins + 1).fillna(3).astype(np.int64)
     else:
         df_result['I_Score'] = 3
     
     # E (Eligibility) Score - 청약 자격
     # 청약 자격 보유: 특별공급, 1순위, 2순위 (무응답 제외)
-    def e_score(subscription_label):
-        label = str(subscription_label).strip()
-        if pd.notna(subscription_label) and label not in ['', '무응답', '기타', 'nan']:
-            return 2
-        return 0
-    
     if 'Q7_Label' in df_result.columns:
-        df_result['E_Score'] = df_result['Q7_Label'].apply(e_score)
+        df_result['E_Score'] = np.where(_has_subscription(df_result['Q7_Label']), 2, 0)
     else:
         df_result['E_Score'] = 0
     
@@ -217,20 +319,9 @@ def calculate_rfie_scores(df, reference_date=None):
         df_result['E_Score']
     )
     
-    # RFIE Segment
-    def rfie_segment(score):
-        if score >= 15:
-            return '🏆 Champion'
-        elif score >= 12:
-            return '⭐ Loyal'
-        elif score >= 8:
-            return '🌱 Promising'
-        elif score >= 5:
-            return '💤 At Risk'
-        else:
-            return '❌ Lost'
-    
-    df_result['RFIE_Segment'] = df_result['RFIE_Score'].apply(rfie_segment)
+    # RFIE Segment - 점수 구간 → 세그먼트 라벨 표
+    segment_codes = np.searchsorted(RFIE_SEGMENT_BINS, df_result['RFIE_Score'].to_numpy(), side='right')
+    df_result['RFIE_Segment'] = pd.Series(RFIE_SEGMENTS).array.take(segment_codes)
     
     return df_result
 
@@ -0,0 +1,226 @@
+"""
+집계 큐브 모듈 (Aggregate Cube)
+- 필터 상태별로 한 번만 데이터를 훑어 다차원 건수 큐브 생성
+- 셀: 접수일 × 시/도 × 시/군/구 × 거점 × 담당자 × 등급
+- 측정값: 셀별 문항(Q1~Q8) 응답 코드 건수
+- 대시보드의 모든 차트/표는 큐브의 슬라이스 또는 롤업으로 계산
+"""
+
+import numpy as np
+import pandas as pd
+
+# 큐브의 셀을 구성하는 차원 (Date는 일 단위로 절삭)
+CUBE_DIMENSIONS = ['Date', 'Addr_City', 'Addr_Gu', 'Spot', 'Manager', 'Grade']
+
+# 셀별로 응답 코드 분포를 저장하는 문항 컬럼
+CUBE_MEASURES = ['Q1_Label', 'Q2_Label', 'Q3_Label', 'Q4_Label', 'Q5_Label', 'Q6_Intent', 'Q7_Label', 'Q8_Label']
+
+# 결합 키가 이 값을 넘기 전에 재인코딩 (int64 overflow 방지)
+_KEY_LIMIT = 2 ** 31
+
+
+def _factorize(series):
+    """(코드, 값 목록) 반환 - 결측은 -1, category는 기존 코드 재사용"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64), series.cat.categories
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes.astype(np.int64), uniques
+
+
+def _decode(codes, uniques, categorical):
+    """코드 배열을 값 Series로 복원 (-1 → 결측)"""
+    if categorical:
+        return pd.Series(pd.Categorical.from_codes(codes, categories=uniques))
+    if len(uniques) == 0:
+        return pd.Series(np.full(len(codes), np.nan))
+    values = pd.Series(uniques.take(np.where(codes < 0, 0, codes)))
+    return values.where(codes >= 0)
+
+
+class CountCube:
+    """셀 목록 + 문항별 셀×응답 건수 행렬"""
+
+    def __init__(self, cells, counts, values):
+        """
+        초기화 (직접 만들기보다 build_count_cube() 사용)
+
+        Args:
+            cells: 셀 차원 값과 'Count'(셀 응답 수)를 담은 DataFrame
+            counts: 문항 → (셀 수 × 응답 값 수 + 1) 건수 행렬, 마지막 열은 무응답
+            values: 문항 → 응답 값 Index
+        """
+        self.cells = cells
+        self.counts = counts
+        self.values = values
+
+    @property
+    def total(self):
+        """전체 응답 수"""
+        return int(self.cells['Count'].sum())
+
+    def has(self, name):
+        """셀 차원 또는 문항으로 사용할 수 있는지 여부"""
+        return name in self.counts or name in self.cells.columns
+
+    # ------------------------------------------
+    # 슬라이스
+    # ------------------------------------------
+
+    def _subset(self, mask):
+        mask = np.asarray(mask, dtype=bool)
+        cells = self.cells[mask].reset_index(drop=True)
+        counts = {name: matrix[mask] for name, matrix in self.counts.items()}
+        return CountCube(cells, counts, self.values)
+
+    def slice(self, **conditions):
+        """
+        셀 차원 값으로 큐브 자르기
+
+        예: cube.slice(Addr_Gu=['마포구'])  (값 목록이 비어 있으면 조건 무시)
+        """
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, selected in conditions.items():
+            if selected:
+                mask &= self.cells[dim].isin(list(selected)).to_numpy()
+        return self._subset(mask)
+
+    def assign_cells(self, **columns):
+        """셀 단위 파생 차원 추가 (예: 주차 라벨) - 건수 행렬은 공유"""
+        return CountCube(self.cells.assign(**columns), self.counts, self.values)
+
+    # ------------------------------------------
+    # 롤업
+    # ------------------------------------------
+
+    def _measure_frame(self, measure):
+        """응답 값별 건수 DataFrame (무응답 열 제외)"""
+        matrix = self.counts[measure][:, :-1]
+        return pd.DataFrame(matrix, columns=self.values[measure])
+
+    def value_counts(self, name):
+        """
+        value_counts()와 같은 형태의 건수 Series (건수 내림차순, 0건/결측 제외)
+
+        Args:
+            name: 문항 컬럼 또는 셀 차원
+        """
+        if name in self.counts:
+            counts = pd.Series(
+                self.counts[name][:, :-1].sum(axis=0), index=self.values[name], name='count'
+            )
+        else:
+            # 동률 순서를 Series.value_counts()와 맞춤:
+            # category는 범주 순서, 그 외는 등장 순서 (셀은 첫 등장 행 순서로 생성됨)
+            categorical = isinstance(self.cells[name].dtype, pd.CategoricalDtype)
+            counts = self.cells.groupby(name, observed=True, sort=categorical)['Count'].sum()
+        counts = counts[counts > 0]
+        counts.index.name = name
+        return counts.sort_values(ascending=False, kind='stable').rename('count')
+
+    def group_counts(self, keys, measure=None):
+        """
+        groupby(keys + [measure]).size()와 같은 형태의 long DataFrame
+
+        Args:
+            keys: 셀 차원 목록
+            measure: 문항 컬럼 (없으면 셀 차원만으로 집계)
+
+        Returns:
+            DataFrame: keys (+ measure) + 'Count' 컬럼, 0건/결측 키 제외
+        """
+        keys = list(keys)
+        group_keys = [self.cells[k] for k in keys]
+        if measure is None:
+            grouped = self.cells.groupby(group_keys, observed=True)['Count'].sum()
+            grouped = grouped[grouped > 0]
+            return grouped.reset_index(name='Count')
+
+        grouped = self._measure_frame(measure).groupby(group_keys, observed=True).sum()
+        grouped.columns.name = measure
+        long = grouped.stack()
+        long = long[long > 0]
+        return long.reset_index(name='Count')
+
+    def score_stats(self, keys, measure='Q6_Intent', threshold=6):
+        """
+        점수 문항의 그룹별 통계
+
+        Returns:
+            DataFrame: keys + Total(응답 수), Mean(평균 점수), AtLeast(threshold 이상 수)
+        """
+        keys = list(keys)
+        group_keys = [self.cells[k] for k in keys]
+        scores = np.asarray(self.values[measure], dtype=float)
+        matrix = self.counts[measure][:, :-1]
+
+        stats = pd.DataFrame({
+            'Total': self.cells['Count'].to_numpy(),
+            'Answered': matrix.sum(axis=1),
+            'ScoreSum': matrix @ scores if len(scores) else np.zeros(len(matrix)),
+            'AtLeast': matrix[:, scores >= threshold].sum(axis=1),
+        })
+        grouped = stats.groupby(group_keys, observed=True).sum()
+        grouped = grouped[grouped['Total'] > 0]
+        answered = grouped['Answered'].where(grouped['Answered'] > 0)
+        grouped['Mean'] = grouped['ScoreSum'] / answered
+        return grouped[['Total', 'Mean', 'AtLeast']].reset_index()
+
+
+def build_count_cube(df, dimensions=None, measures=None):
+    """
+    DataFrame을 한 번 훑어 건수 큐브 생성
+
+    셀 차원을 정수 코드로 결합해 셀 번호를 만들고,
+    문항별로 np.bincount 한 번씩만 수행합니다.
+
+    Args:
+        df: 필터가 적용된 분석용 데이터셋
+        dimensions: 셀 차원 (기본값: CUBE_DIMENSIONS 중 존재하는 컬럼)
+        measures: 문항 컬럼 (기본값: CUBE_MEASURES 중 존재하는 컬럼)
+
+    Returns:
+        CountCube
+    """
+    dimensions = [d for d in (dimensions or CUBE_DIMENSIONS) if d in df.columns]
+    measures = [m for m in (measures or CUBE_MEASURES) if m in df.columns]
+    n_rows = len(df)
+
+    # 1. 셀 번호 (차원 코드 결합 → 재인코딩)
+    dim_codes = {}
+    key = np.zeros(n_rows, dtype=np.int64)
+    key_size = 1
+    for dim in dimensions:
+        series = df[dim]
+        if dim == 'Date':
+            series = pd.to_datetime(series, errors='coerce').dt.normalize()
+        codes, uniques = _factorize(series)
+        dim_codes[dim] = (codes, uniques, isinstance(series.dtype, pd.CategoricalDtype))
+        size = len(uniques) + 1
+        key = key * size + (codes + 1)
+        key_size *= size
+        if key_size > _KEY_LIMIT:
+            key, key_uniques = pd.factorize(key)
+            key_size = len(key_uniques)
+
+    cell_ids, cell_keys = pd.factorize(key)
+    n_cells = len(cell_keys)
+    _, first_rows = np.unique(cell_ids, return_index=True)
+
+    cells = pd.DataFrame({
+        dim: _decode(codes[first_rows], uniques, categorical)
+        for dim, (codes, uniques, categorical) in dim_codes.items()
+    })
+    cells['Count'] = np.bincount(cell_ids, minlength=n_cells)
+
+    # 2. 문항별 셀 × 응답 건수 (마지막 열 = 무응답)
+    counts = {}
+    values = {}
+    for measure in measures:
+        codes, uniques = _factorize(df[measure])
+        width = len(uniques) + 1
+        codes = np.where(codes < 0, width - 1, codes)
+        flat = np.bincount(cell_ids * width + codes, minlength=n_cells * width)
+        counts[measure] = flat.reshape(n_cells, width)
+        values[measure] = pd.Index(uniques)
+
+    return CountCube(cells, counts, values)
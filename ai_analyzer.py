@@ -1,8 +1,8 @@
 import streamlit as st
 import pandas as pd
-from google import genai
 import json
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 # 커스텀 JSON 인코더 (numpy 타입 처리)
 def convert_to_serializable(obj):
@@ -31,97 +31,44 @@ from advanced_analytics import (
     get_segment_summary,
     generate_alerts
 )
+from analysis_context import AnalysisContext
+from report_model import ReportModel
+from insight_cache import insight_cache, insight_cache_key
+from llm_client import ResilientLLMClient, get_llm_client
+from prompt_budget import DEFAULT_PROMPT_TOKEN_BUDGET, compact_json, summarize_weeks, fit_to_budget
 
-def get_weekly_period(date_series):
-    """날짜를 주차별로 그룹화"""
-    if date_series.empty:
-        return date_series.astype(str)
-    
-    min_date = date_series.min()
-    start_anchor = min_date - pd.Timedelta(days=min_date.weekday())
-    
-    dates = pd.to_datetime(date_series)
-    days_diff = (dates - start_anchor).dt.days
-    week_nums = (days_diff // 7) + 1
-    
-    results = []
-    for d, w in zip(dates, week_nums):
-        if pd.isna(d):
-            results.append("미확인")
-            continue
-        w_start = start_anchor + pd.Timedelta(days=(w-1)*7)
-        w_end = w_start + pd.Timedelta(days=6)
-        period_str = f"{w_start.strftime('%m/%d')}~{w_end.strftime('%m/%d')}"
-        results.append(f"{w}주차 ({period_str})")
-        
-    return pd.Series(results, index=date_series.index)
+# 인사이트 생성 모델
+GEMINI_MODEL = "gemini-2.5-flash"
+
+def collect_data_summary(df, model=None):
+    """
+    데이터프레임에서 핵심 통계 추출 (JSON 직렬화 가능한 dict)
+
+    model(ReportModel)이 주어지면 엑셀/PDF 보고서와 같은 계산 결과를 그대로 사용합니다.
+    """
+    if model is None:
+        model = ReportModel(df)
+    return convert_to_serializable(model.prompt_summary())
 
 def get_data_summary(df):
     """데이터프레임에서 핵심 통계를 추출하여 텍스트로 변환"""
-    summary = {
-        "총_응답_수": len(df),
-        "평균_계약_의향_점수": round(df['Q6_Intent'].mean(), 2) if 'Q6_Intent' in df.columns else "N/A",
-        "S급_고객_수": len(df[df['Q6_Intent'] >= 6]) if 'Q6_Intent' in df.columns else 0,
-    }
-    
-    # 주요 문항 최빈값 추출
-    for col, label in [('Q1_Label', '인지도'), ('Q2_Label', '정보습득경로'), ('Q4_Label', '구매목적'), ('Q5_Label', '선호평형')]:
-        if col in df.columns:
-            top_answer = df[col].value_counts().head(1)
-            if not top_answer.empty:
-                summary[f"최다_{label}"] = f"{top_answer.index[0]} ({top_answer.values[0]}명)"
-
-    return json.dumps(convert_to_serializable(summary), ensure_ascii=False, indent=2)
-
-def get_weekly_trend_summary(df):
-    """주차별 트렌드 데이터 생성"""
-    if 'Date' not in df.columns:
-        return "주차별 데이터 없음 (날짜 컬럼 미존재)"
-    
-    df_copy = df.copy()
-    df_copy['Date'] = pd.to_datetime(df_copy['Date'], errors='coerce')
-    df_copy = df_copy.dropna(subset=['Date'])
-    
-    if df_copy.empty:
-        return "주차별 데이터 없음 (유효한 날짜 없음)"
-    
-    df_copy['Week_Label'] = get_weekly_period(df_copy['Date'])
-    
-    weekly_stats = []
-    for week_label in df_copy['Week_Label'].unique():
-        week_df = df_copy[df_copy['Week_Label'] == week_label]
-        
-        week_stat = {
-            "주차": week_label,
-            "응답수": len(week_df),
+    return json.dumps(collect_data_summary(df), ensure_ascii=False, indent=2)
+
+def collect_advanced_analytics(df, context=None):
+    """
+    고급 분석 결과 (리드 스코어링 + RFIE + 경고, JSON 직렬화 가능한 dict)
+
+    context(AnalysisContext)가 주어지면 이미 계산된 결과를 그대로 사용합니다.
+    """
+    if context is not None:
+        result = {
+            'lead_scoring': context.lead_summary,
+            'segment_details': context.segment_details,
+            'rfie': context.rfie_summary,
+            'alerts': context.alerts,
         }
-        
-        if 'Q6_Intent' in week_df.columns:
-            week_stat["평균_의향점수"] = round(week_df['Q6_Intent'].mean(), 2)
-            week_stat["S급_비율"] = f"{round(len(week_df[week_df['Q6_Intent'] >= 6]) / len(week_df) * 100, 1)}%"
-        
-        if 'Q5_Label' in week_df.columns:
-            top_type = week_df['Q5_Label'].value_counts().head(1)
-            if not top_type.empty:
-                week_stat["최다_선호평형"] = top_type.index[0]
-        
-        if 'Q2_Label' in week_df.columns:
-            top_channel = week_df['Q2_Label'].value_counts().head(1)
-            if not top_channel.empty:
-                week_stat["최다_유입경로"] = top_channel.index[0]
-        
-        weekly_stats.append(week_stat)
-    
-    # 주차 순서대로 정렬
-    try:
-        weekly_stats.sort(key=lambda x: int(x["주차"].split("주차")[0]))
-    except:
-        pass
-    
-    return json.dumps(convert_to_serializable(weekly_stats), ensure_ascii=False, indent=2)
+        return convert_to_serializable(result)
 
-def get_advanced_analytics_summary(df):
-    """고급 분석 요약 (리드 스코어링 + RFIE + 경고)"""
     result = {}
     
     # 1. 리드 스코어링
@@ -145,22 +92,13 @@ def get_advanced_analytics_summary(df):
     except Exception as e:
         result['alerts'] = [f"알림 생성 실패: {str(e)}"]
     
-    return json.dumps(convert_to_serializable(result), ensure_ascii=False, indent=2)
+    return convert_to_serializable(result)
 
-def generate_ai_insight(df):
-    """
-    Google Gemini API를 사용하여 데이터 인사이트 생성 (고급 분석 포함)
-    """
-    # 1. API Key 확인
-    api_key = None
-    try:
-        if "gemini" in st.secrets and "api_key" in st.secrets["gemini"]:
-            api_key = st.secrets["gemini"]["api_key"].strip()
-    except Exception:
-        pass
+def get_advanced_analytics_summary(df, context=None):
+    """고급 분석 요약 (리드 스코어링 + RFIE + 경고) 텍스트"""
+    return json.dumps(collect_advanced_analytics(df, context), ensure_ascii=False, indent=2)
 
-    if not api_key:
-        return """⚠️ **API Key 설정이 필요합니다.**
+API_KEY_MISSING_MESSAGE = """⚠️ **API Key 설정이 필요합니다.**
         
         `.streamlit/secrets.toml` 파일에 Google Gemini API Key를 설정해주세요.
         
@@ -172,13 +110,72 @@ def generate_ai_insight(df):
         ```
         """
 
-    # 2. 데이터 요약
-    data_summary = get_data_summary(df)
-    weekly_trend = get_weekly_trend_summary(df)
-    advanced_analytics = get_advanced_analytics_summary(df)
-    
-    # 3. 프롬프트 구성 (전문가 수준)
-    prompt = f"""당신은 10년 경력의 아파트 분양 마케팅 전문 컨설턴트이자 데이터 분석 전문가입니다.
+def get_gemini_api_key():
+    """st.secrets에서 Gemini API Key 조회 (없으면 None)"""
+    try:
+        if "gemini" in st.secrets and "api_key" in st.secrets["gemini"]:
+            return st.secrets["gemini"]["api_key"].strip() or None
+    except Exception:
+        pass
+    return None
+
+def get_insight_client(client=None, api_key=None):
+    """
+    인사이트 생성에 쓸 ResilientLLMClient 반환
+
+    client가 없으면 API Key별 프로세스 공용 클라이언트(연결/동시성/서킷 공유)를,
+    genai.Client 호환 객체가 주어지면 같은 재시도 정책으로 감싸서 사용합니다.
+    """
+    if isinstance(client, ResilientLLMClient):
+        return client
+    if client is not None:
+        return ResilientLLMClient(client=client, model=GEMINI_MODEL)
+    return get_llm_client(api_key, GEMINI_MODEL)
+
+def build_insight_prompt(df, context=None, scope=None, token_budget=DEFAULT_PROMPT_TOKEN_BUDGET):
+    """
+    데이터 요약(통계/주차별 트렌드/고급 분석)을 담은 인사이트 요청 프롬프트 생성
+
+    요약은 공백 없는 JSON으로 넣고, 토큰 예산을 넘으면 오래된 주차를 더 큰 구간으로 묶고
+    세그먼트 상세를 빼는 식으로 단계별 압축합니다 (prompt_budget.COMPACTION_LEVELS).
+    context(AnalysisContext)가 주어지면 그 안의 계산 결과와
+    이전에 만든 요약을 재사용하므로 데이터를 다시 훑지 않습니다.
+    scope(예: "시/군/구: 마포구")가 주어지면 분석 대상을 프롬프트에 명시합니다.
+
+    Args:
+        token_budget: 프롬프트 토큰 예산 (None이면 압축 단계 없이 첫 단계 사용)
+    """
+    scope_line = f"\n※ 분석 대상: {scope} (해당 응답자만 집계한 결과입니다)\n" if scope else ""
+
+    # 1. 데이터 요약 (압축 단계와 무관한 부분은 한 번만 계산)
+    if context is not None:
+        data_summary = context.section(
+            'data_summary', lambda: compact_json(collect_data_summary(context.df, context.report_model))
+        )
+        advanced = context.section('advanced_analytics', lambda: collect_advanced_analytics(context.df, context))
+        weekly_rows = lambda recent: context.section(
+            f'weekly_trend:{recent}', lambda: summarize_weeks(context.df, recent)
+        )
+    else:
+        data_summary = compact_json(collect_data_summary(df))
+        advanced = collect_advanced_analytics(df)
+        weekly_rows = lambda recent: summarize_weeks(df, recent)
+
+    def render(level):
+        rows = weekly_rows(level['recent_weeks'])
+        weekly_trend = compact_json(convert_to_serializable(rows)) if rows else "주차별 데이터 없음"
+        shown = advanced if level['segment_details'] else {
+            k: v for k, v in advanced.items() if k != 'segment_details'
+        }
+        return _render_insight_prompt(scope_line, data_summary, weekly_trend, compact_json(shown))
+
+    # 2. 예산 안에 들어오는 가장 자세한 단계 선택
+    prompt, _ = fit_to_budget(render, token_budget)
+    return prompt
+
+def _render_insight_prompt(scope_line, data_summary, weekly_trend, advanced_analytics):
+    """프롬프트 구성 (전문가 수준)"""
+    return f"""당신은 10년 경력의 아파트 분양 마케팅 전문 컨설턴트이자 데이터 분석 전문가입니다.
 
 아래는 사전영업 설문 데이터의 핵심 통계, 주차별 트렌드, 그리고 고급 분석 결과입니다.
 전문가 관점에서 다음 내용을 분석해 주세요:
@@ -209,11 +206,11 @@ def generate_ai_insight(df):
 ---
 
 ## 데이터
-
+{scope_line}
 ### [전체 데이터 통계]
 {data_summary}
 
-### [주차별 트렌드]
+### [주차별 트렌드] (최근 주차는 주 단위, 이전 주차는 구간 합산)
 {weekly_trend}
 
 ### [고급 분석 결과 - 리드 스코어링/RFIE/경고]
@@ -224,14 +221,167 @@ def generate_ai_insight(df):
 답변은 경영진 보고용으로 간결하고 명확하게, 마크다운 형식으로 작성해 주세요.
 수치와 퍼센트를 적극 활용하고, 각 섹션에 적절한 이모지를 사용해 가독성을 높여주세요."""
 
+def generate_ai_insight(df, force_refresh=False, client=None, context=None):
+    """
+    Google Gemini API를 사용하여 데이터 인사이트 생성 (고급 분석 포함)
+
+    같은 프롬프트(= 같은 필터 상태)와 모델로 생성한 결과가 캐시에 있으면
+    API를 호출하지 않고 바로 반환합니다.
+
+    Args:
+        df: 필터가 적용된 분석용 데이터셋
+        force_refresh: True면 캐시를 무시하고 새로 생성
+        client: ResilientLLMClient 또는 genai.Client 호환 객체 (없으면 st.secrets의 API Key로 공용 클라이언트 사용)
+        context: 같은 df로 만든 AnalysisContext (있으면 프롬프트 생성 시 재사용)
+    """
+    # 1. API Key 확인
+    api_key = None
+    if client is None:
+        api_key = get_gemini_api_key()
+        if not api_key:
+            return API_KEY_MISSING_MESSAGE
+
+    # 2. 프롬프트 + 캐시 확인
+    prompt = build_insight_prompt(df, context)
+    cache_key = insight_cache_key(prompt, GEMINI_MODEL)
+    if not force_refresh:
+        cached = insight_cache.get(cache_key)
+        if cached:
+            return cached
+
     try:
-        # 4. Google Gemini API 호출
-        client = genai.Client(api_key=api_key)
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-        )
-        return response.text
+        # 3. Google Gemini API 호출 (타임아웃/재시도/서킷 브레이커 적용)
+        text = get_insight_client(client, api_key).generate(prompt)
+        if text:
+            insight_cache.put(cache_key, text, model=GEMINI_MODEL)
+        return text
         
     except Exception as e:
         return f"❌ AI 분석 중 오류가 발생했습니다: {str(e)}"
+
+def stream_ai_insight(df, force_refresh=False, client=None, context=None):
+    """
+    generate_ai_insight()의 스트리밍 버전 - 응답 조각(마크다운)을 도착 순서대로 yield
+
+    이어 붙인 전체 텍스트가 generate_ai_insight() 결과와 같으며,
+    완료된 응답은 캐시에 저장됩니다. 캐시 적중 시 저장된 텍스트를 한 번에 yield합니다.
+    오류가 나면 오류 메시지를 yield하고 끝납니다 (이미 받은 조각은 캐시하지 않음).
+
+    Args:
+        df: 필터가 적용된 분석용 데이터셋
+        force_refresh: True면 캐시를 무시하고 새로 생성
+        client: ResilientLLMClient 또는 genai.Client 호환 객체 (없으면 st.secrets의 API Key로 공용 클라이언트 사용)
+        context: 같은 df로 만든 AnalysisContext (있으면 프롬프트 생성 시 재사용)
+    """
+    api_key = None
+    if client is None:
+        api_key = get_gemini_api_key()
+        if not api_key:
+            yield API_KEY_MISSING_MESSAGE
+            return
+
+    prompt = build_insight_prompt(df, context)
+    cache_key = insight_cache_key(prompt, GEMINI_MODEL)
+    if not force_refresh:
+        cached = insight_cache.get(cache_key)
+        if cached:
+            yield cached
+            return
+
+    chunks = []
+    try:
+        for text in get_insight_client(client, api_key).stream(prompt):
+            chunks.append(text)
+            yield text
+    except Exception as e:
+        prefix = "\n\n" if chunks else ""
+        yield f"{prefix}❌ AI 분석 중 오류가 발생했습니다: {str(e)}"
+        return
+
+    if chunks:
+        insight_cache.put(cache_key, ''.join(chunks), model=GEMINI_MODEL)
+
+
+# ============================================
+# 파티션별 일괄 분석 (지역/거점별)
+# ============================================
+
+# 일괄 분석 기준 컬럼 → 표시 이름
+BATCH_DIMENSIONS = {
+    'Addr_Gu': '시/군/구',
+    'Spot': '영업 거점',
+    'Manager': '담당자',
+}
+
+# 일괄 분석 기본 동시 호출 수
+DEFAULT_BATCH_CONCURRENCY = 4
+
+def _generate_partition_insight(value, part_context, label, force_refresh, client):
+    """파티션 하나의 인사이트 생성 (generate_ai_insight와 같은 캐시/재시도 정책)"""
+    prompt = build_insight_prompt(part_context.df, part_context, scope=f"{label}: {value}")
+    cache_key = insight_cache_key(prompt, GEMINI_MODEL)
+    if not force_refresh:
+        cached = insight_cache.get(cache_key)
+        if cached:
+            return cached
+    try:
+        text = client.generate(prompt)
+        if text:
+            insight_cache.put(cache_key, text, model=GEMINI_MODEL)
+        return text
+    except Exception as e:
+        return f"❌ AI 분석 중 오류가 발생했습니다: {str(e)}"
+
+def stream_batch_insights(df, dimension='Addr_Gu', values=None, max_concurrency=DEFAULT_BATCH_CONCURRENCY,
+                          force_refresh=False, client=None, context=None):
+    """
+    기준 컬럼 값(지역/거점 등)별로 인사이트를 동시에 생성해 하나의 보고서로 yield
+
+    스코어링은 전체 데이터에서 한 번만 하고 groupby 한 번으로 파티션을 나눈 뒤,
+    파티션별 API 호출을 최대 max_concurrency개까지 동시에 보냅니다.
+    보고서 조각(제목, 파티션별 섹션)은 values 순서대로, 앞선 파티션이 끝나는 대로 yield합니다.
+
+    Args:
+        df: 필터가 적용된 분석용 데이터셋
+        dimension: 나눌 기준 컬럼 (BATCH_DIMENSIONS 참고)
+        values: 분석할 값 목록과 순서 (없으면 데이터에 있는 전체 값)
+        max_concurrency: 동시에 보낼 API 호출 수 (공용 클라이언트의 동시 호출 한도도 함께 적용)
+        force_refresh: True면 캐시를 무시하고 새로 생성
+        client: ResilientLLMClient 또는 genai.Client 호환 객체
+        context: 같은 df로 만든 AnalysisContext (있으면 스코어링 재사용)
+    """
+    label = BATCH_DIMENSIONS.get(dimension, dimension)
+    if dimension not in df.columns:
+        yield f"⚠️ '{label}' 컬럼이 없어 일괄 분석을 할 수 없습니다."
+        return
+
+    api_key = None
+    if client is None:
+        api_key = get_gemini_api_key()
+        if not api_key:
+            yield API_KEY_MISSING_MESSAGE
+            return
+    llm = get_insight_client(client, api_key)
+
+    context = context if context is not None else AnalysisContext(df)
+    parts = context.partition(dimension, values)
+    if not parts:
+        yield f"⚠️ 선택한 {label}에 해당하는 데이터가 없습니다."
+        return
+
+    yield f"# 📍 {label}별 AI 인사이트 ({len(parts)}개)\n\n"
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(parts)))) as pool:
+        futures = [
+            (value, part, pool.submit(_generate_partition_insight, value, part, label, force_refresh, llm))
+            for value, part in parts.items()
+        ]
+        for value, part, future in futures:
+            yield f"---\n\n## 📍 {value} ({len(part.df):,}명)\n\n{future.result()}\n\n"
+
+def generate_batch_insights(df, dimension='Addr_Gu', values=None, max_concurrency=DEFAULT_BATCH_CONCURRENCY,
+                            force_refresh=False, client=None, context=None):
+    """stream_batch_insights()의 전체 보고서를 한 번에 반환 (마크다운)"""
+    return ''.join(stream_batch_insights(
+        df, dimension, values, max_concurrency,
+        force_refresh=force_refresh, client=client, context=context
+    ))
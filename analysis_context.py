@@ -0,0 +1,93 @@
+"""
+분석 컨텍스트 모듈 (Analysis Context)
+- 필터 상태별로 한 번 계산한 고급 분석 결과(리드 스코어링, RFIE, 경고)를 묶어 보관
+- 대시보드 화면과 AI 프롬프트 생성이 같은 계산 결과를 공유
+- 보고서 공통 통계(ReportModel)는 처음 요청할 때 한 번 계산
+"""
+
+from advanced_analytics import (
+    apply_lead_scoring,
+    get_lead_score_summary,
+    calculate_rfie_scores,
+    get_rfie_summary,
+    get_segment_summary,
+    generate_alerts
+)
+from report_model import ReportModel
+
+
+class AnalysisContext:
+    """필터가 적용된 데이터셋 하나에 대한 분석 결과 묶음 (읽기 전용으로 공유)"""
+
+    def __init__(self, df, price_range=(13, 16), df_scored=None, report_model=None):
+        """
+        초기화 (리드 스코어링/RFIE/경고를 한 번에 계산)
+
+        Args:
+            df: 필터가 적용된 분석용 데이터셋
+            price_range: 리드 스코어링의 실제 분양가 범위 (억 단위)
+            df_scored: 이미 스코어링한 df (있으면 다시 계산하지 않음)
+            report_model: 같은 df로 이미 계산한 ReportModel (있으면 다시 계산하지 않음)
+        """
+        self.df = df
+        self.price_range = price_range
+
+        # 리드 스코어링
+        self.df_scored = df_scored if df_scored is not None else apply_lead_scoring(df, price_range)
+        self.lead_summary = get_lead_score_summary(self.df_scored)
+        self.segment_details = get_segment_summary(self.df_scored)
+
+        # RFIE
+        self.df_rfie = calculate_rfie_scores(df)
+        self.rfie_summary = get_rfie_summary(self.df_rfie)
+
+        # 경고/알림
+        self.alerts = generate_alerts(df)
+
+        self._sections = {}
+        if report_model is not None:
+            self._sections['report_model'] = report_model
+
+    @property
+    def report_model(self):
+        """보고서 공통 통계 (엑셀/PDF/프롬프트 공용, 처음 요청할 때 계산)"""
+        return self.section('report_model', lambda: ReportModel(self.df))
+
+    def partition(self, dimension, values=None):
+        """
+        컬럼 값별 하위 컨텍스트 생성 (groupby 한 번으로 행 위치를 나눔)
+
+        리드 스코어는 행 단위 점수이므로 이미 계산한 결과를 잘라 쓰고,
+        RFIE는 최근성 기준일(최신 접수일)이 파티션마다 다르므로 파티션별로 계산합니다.
+
+        Args:
+            dimension: 나눌 기준 컬럼 (예: 'Addr_Gu', 'Spot')
+            values: 포함할 값 목록과 순서 (없으면 등장 순서의 전체 값)
+
+        Returns:
+            dict: 값 → AnalysisContext (행이 없는 값은 제외)
+        """
+        positions = self.df.groupby(dimension, observed=True, sort=False).indices
+        if values is None:
+            values = list(positions)
+        return {
+            value: AnalysisContext(
+                self.df.take(positions[value]),
+                self.price_range,
+                df_scored=self.df_scored.take(positions[value]),
+            )
+            for value in values
+            if value in positions
+        }
+
+    def section(self, name, builder):
+        """
+        파생 결과(프롬프트용 요약 텍스트 등)를 처음 요청할 때만 만들고 보관
+
+        Args:
+            name: 보관 키
+            builder: 인자 없이 호출해 결과를 만드는 함수
+        """
+        if name not in self._sections:
+            self._sections[name] = builder()
+        return self._sections[name]
@@ -2,9 +2,11 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import hashlib
+import uuid
 from datetime import datetime
 try:
-    from excel_report_generator import generate_excel_report
+    from excel_report_generator import ExcelReportGenerator, generate_excel_report
 except ImportError as e:
     # 디버깅을 위한 상세 에러 출력
     st.error(f"라이브러리 로딩 오류 (Excel Report): {e}")
@@ -16,39 +18,87 @@ except ImportError as e:
 except Exception as e:
     st.error(f"알 수 없는 오류 (Excel Report): {e}")
     generate_excel_report = None
-from ai_analyzer import generate_ai_insight
+from ai_analyzer import stream_ai_insight, stream_batch_insights, BATCH_DIMENSIONS
+from aggregate_cube import build_count_cube
+from export_bundle import build_export_bundle
+from analysis_context import AnalysisContext
+from filter_index import FilterIndex
+from job_runner import get_job_runner
+import perf_trace
+from report_cache import report_cache, report_cache_key
+from report_model import ReportModel
+from week_buckets import get_weekly_period
+from survey_data import load_survey_sheet, source_fingerprint, build_prepared_dataset, Q8_MAP
 
 # Page Config
 st.set_page_config(page_title="사전영업 대시보드", page_icon="📊", layout="wide")
 
+# Per-rerun stage timings: shown in the opt-in sidebar perf panel and appended to the perf log.
+# A run cut short by a rerun or st.stop() never reaches finish_trace(); the next run logs it as interrupted.
+if 'perf_session' not in st.session_state:
+    st.session_state['perf_session'] = uuid.uuid4().hex[:8]
+perf = perf_trace.start_trace(previous=st.session_state.get('perf_trace'), session=st.session_state['perf_session'])
+st.session_state['perf_trace'] = perf
+
 st.title("📊 사전영업 데이터 분석 대시보드")
 st.markdown("---")
 
-@st.cache_data
-def load_data(file_source, _file_mtime=None):
+def load_data(file_source, file_version=None):
     """
-    Load data from Excel file with cache busting based on file modification time.
-    _file_mtime parameter ensures cache is invalidated when file is updated.
+    Load data from Excel file, keyed by the source content hash.
+    The parsed sheet is served from a Parquet snapshot when the file is unchanged,
+    so a cache miss (restart, new worker) does not re-parse the workbook.
     """
     try:
-        # Load '고객설문지DB' sheet
-        df = pd.read_excel(file_source, sheet_name='고객설문지DB', header=0)
-        
-        # Filter valid rows (Q1 existence)
-        q1_col_name = df.columns[4] 
-        df = df[df[q1_col_name].notna()]
-        
-        return df
+        with perf_trace.span('load.data'):
+            return load_survey_sheet(file_source, version=file_version)
     except Exception as e:
         # st.error(f"데이터 로드 중 오류 발생: {e}") 
         return None
 
+@st.cache_resource(max_entries=4)
+def load_filter_index(file_version, _df):
+    """Bitmap/date index over the prepared frame, built once per source version."""
+    return FilterIndex(_df)
+
+@st.cache_resource(max_entries=16)
+def load_count_cube(file_version, selection_key, _filter_index, _df, _bits):
+    """
+    Aggregate cube for one filter state (dataset version + selected rows).
+    The rows are taken from the full frame only on a cache miss, so a hit costs no row copy.
+    """
+    return build_count_cube(_filter_index.take(_df, _bits))
+
+@st.cache_resource(max_entries=4)
+def load_report_model(file_version, selection_key, _df):
+    """Headline statistics shared by the metrics, Excel, PDF and AI prompt for one filter state."""
+    return ReportModel(_df)
+
+@st.cache_resource(max_entries=4)
+def load_analysis_context(file_version, selection_key, _df, _report_model=None):
+    """Lead scoring / RFIE / alerts for one filter state (dataset version + selected rows)."""
+    return AnalysisContext(_df, report_model=_report_model)
+
+@st.cache_resource(max_entries=4)
+def load_dataset(file_version, _file_source):
+    """
+    Mapped and typed survey frame, built once per source version.
+    The same object is shared across reruns and sessions - treat it as read-only.
+    """
+    raw_df = load_data(_file_source, file_version)
+    if raw_df is None:
+        return None
+    with perf_trace.span('load.mapping'):
+        return build_prepared_dataset(raw_df)
+
 # Sidebar File Uploader
 st.sidebar.header("📂 데이터 파일 (Data Source)")
 uploaded_file = st.sidebar.file_uploader("엑셀 파일 업로드", type=['xlsx'])
 
 if uploaded_file:
-    df = load_data(uploaded_file)
+    with perf_trace.span('load.dataset', source='upload'):
+        file_version = source_fingerprint(uploaded_file)
+        df = load_dataset(file_version, uploaded_file)
     st.sidebar.success("업로드된 파일을 사용합니다.")
 else:
     # Use relative path for Cross-platform / Cloud compatibility
@@ -61,114 +111,81 @@ else:
     if not os.path.exists(default_path):
         default_path = os.path.join(base_dir, '설문조사 DB', 'DEFINE_DB.xlsx')
     
-    # Get file modification time for cache busting
+    # Content hash (path + mtime shortcut) for cache busting
     if os.path.exists(default_path):
-        file_mtime = os.path.getmtime(default_path)
-        df = load_data(default_path, _file_mtime=file_mtime)
+        with perf_trace.span('load.dataset', source='default'):
+            file_version = source_fingerprint(default_path)
+            df = load_dataset(file_version, default_path)
     else:
         df = None
         st.error("데이터 파일을 찾을 수 없습니다.")
 
 if df is not None:
-    # --- Columns Mapping ---
-    cols = df.columns.tolist()
-    
-    col_map = {
-        cols[1]: 'Date',
-        cols[2]: 'Manager',
-        cols[3]: 'Spot',
-        cols[4]: 'Q1_Awareness',
-        cols[5]: 'Q2_Channel',
-        cols[6]: 'Q3_Pros',
-        cols[7]: 'Q4_Purpose',
-        cols[8]: 'Q5_Type',
-        cols[9]: 'Q6_Intent',
-        cols[10]: 'Q7_Subscription',
-        cols[11]: 'Q8_Price',
-        cols[12]: 'Addr_City',
-        cols[13]: 'Addr_Gu',
-        cols[14]: 'Addr_Dong',
-        cols[16]: 'Gender',
-        cols[17]: 'Grade'
-    }
-    
-    df.rename(columns=col_map, inplace=True)
-
-    # --- Data Cleaning & Mapping ---
-    # Ensure Numeric
-    for c in ['Q6_Intent', 'Q4_Purpose', 'Q5_Type', 'Q1_Awareness', 'Q2_Channel', 'Q7_Subscription', 'Q8_Price', 'Gender']:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors='coerce')
-
-    # Date
-    if 'Date' in df.columns:
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-
-    # Mapping Dictionaries
-    q1_map = {1: '잘 알고있다', 2: '들어본 적 있다', 3: '처음 알았다'}
-    q2_map = {1: '외부홍보', 2: '부동산', 3: '가족/지인', 4: '옥외광고', 5: '홈페이지', 6: '온라인광고', 7: '기사'}
-    q3_map = {1:'브랜드', 2:'주거쾌적성', 3:'교통환경', 4:'교육환경', 5:'투자가치'}
-    q4_map = {1: '실거주', 2: '투자', 3: '실거주+투자'}
-    q5_map = {1: '59㎡', 2: '74㎡', 3: '75㎡', 4: '84㎡'}
-    q7_map = {1: '특별공급', 2: '1순위', 3: '2순위', 4: '무응답'}
-    q8_map = {
-        1: '11.5~12억', 2: '12~12.5억', 3: '12.5~13억', 4: '13~13.5억',
-        5: '14~14.5억', 6: '14.5~15억', 7: '15~15.5억', 8: '15.5~16억'
-    }
-    gender_map = {1: '남성', 2: '여성'}
-
-    # Apply Mappings
-    if 'Q1_Awareness' in df.columns: df['Q1_Label'] = df['Q1_Awareness'].map(q1_map).fillna('기타')
-    if 'Q2_Channel' in df.columns: df['Q2_Label'] = df['Q2_Channel'].map(q2_map).fillna('기타')
-    if 'Q3_Pros' in df.columns: df['Q3_Label'] = df['Q3_Pros'].map(q3_map).fillna('기타')
-    if 'Q4_Purpose' in df.columns: df['Q4_Label'] = df['Q4_Purpose'].map(q4_map).fillna('기타')
-    if 'Q5_Type' in df.columns: df['Q5_Label'] = df['Q5_Type'].map(q5_map).fillna('기타')
-    if 'Q7_Subscription' in df.columns: df['Q7_Label'] = df['Q7_Subscription'].map(q7_map).fillna('기타')
-    if 'Q8_Price' in df.columns: df['Q8_Label'] = df['Q8_Price'].map(q8_map).fillna('기타')
-    if 'Gender' in df.columns: df['Gender_Label'] = df['Gender'].map(gender_map).fillna('미기재')
-
     # --- Sidebar Filters ---
     st.sidebar.header("🔍 상세 필터 (Filters)")
     
+    # Filters resolve to row bitmaps on the per-version index;
+    # rows are materialised once per view instead of once per filter step.
+    with perf_trace.span('filter.index'):
+        filter_index = load_filter_index(file_version, df)
+    dataset_df = df
+    base_bits = None
+    sel_city, sel_gu = [], []
+    
     # Date Filter
-    if 'Date' in df.columns:
-        valid_dates = df['Date'].dropna()
-        if not valid_dates.empty:
-            min_d, max_d = valid_dates.min(), valid_dates.max()
+    if filter_index.has_dates():
+        with perf_trace.span('filter.date'):
+            min_d, max_d = filter_index.date_bounds()
             date_range = st.sidebar.date_input("📅 접수 기간", [min_d, max_d])
             if len(date_range) == 2:
-                df = df[(df['Date'] >= pd.Timestamp(date_range[0])) & (df['Date'] <= pd.Timestamp(date_range[1]))]
+                base_bits = filter_index.select_dates(date_range[0], date_range[1])
 
     # Spot Filter
-    if 'Spot' in df.columns:
-        spots = df['Spot'].dropna().unique()
-        sel_spot = st.sidebar.multiselect("🚩 영업 거점", spots)
-        if sel_spot:
-            df = df[df['Spot'].isin(sel_spot)]
+    if filter_index.has('Spot'):
+        with perf_trace.span('filter.spot'):
+            spots = filter_index.options('Spot', base_bits)
+            sel_spot = st.sidebar.multiselect("🚩 영업 거점", spots)
+            if sel_spot:
+                base_bits = filter_index.combine(base_bits, filter_index.select_values('Spot', sel_spot))
             
     # Manager Filter
-    if 'Manager' in df.columns:
-        managers = df['Manager'].dropna().unique()
-        sel_mgr = st.sidebar.multiselect("👤 담당자/조", managers)
-        if sel_mgr:
-            df = df[df['Manager'].isin(sel_mgr)]
+    if filter_index.has('Manager'):
+        with perf_trace.span('filter.manager'):
+            managers = filter_index.options('Manager', base_bits)
+            sel_mgr = st.sidebar.multiselect("👤 담당자/조", managers)
+            if sel_mgr:
+                base_bits = filter_index.combine(base_bits, filter_index.select_values('Manager', sel_mgr))
 
-    # Preserve a copy of df before Sidebar Region Filters
-    filtered_base_df = df.copy()
+    # Selection before Sidebar Region Filters (region tabs start from here)
+    view_bits = base_bits
 
     # Region Filter (Residense) for Sidebar (Visual only for Main Tab usually)
-    if 'Addr_City' in df.columns:
-        cities = df['Addr_City'].dropna().unique()
-        sel_city = st.sidebar.multiselect("🏠 거주지 (시/도)", cities)
-        if sel_city:
-            df = df[df['Addr_City'].isin(sel_city)]
+    if filter_index.has('Addr_City'):
+        with perf_trace.span('filter.city'):
+            cities = filter_index.options('Addr_City', view_bits)
+            sel_city = st.sidebar.multiselect("🏠 거주지 (시/도)", cities)
+            if sel_city:
+                view_bits = filter_index.combine(view_bits, filter_index.select_values('Addr_City', sel_city))
             
-    if 'Addr_Gu' in df.columns:
-        # Show Gu only available in current df details (dynamic)
-        gus = df['Addr_Gu'].dropna().unique()
-        sel_gu = st.sidebar.multiselect("🏠 거주지 (시/군/구)", gus)
-        if sel_gu:
-            df = df[df['Addr_Gu'].isin(sel_gu)]
+    if filter_index.has('Addr_Gu'):
+        with perf_trace.span('filter.gu'):
+            # Show Gu only available in current df details (dynamic)
+            gus = filter_index.options('Addr_Gu', view_bits)
+            sel_gu = st.sidebar.multiselect("🏠 거주지 (시/군/구)", gus)
+            if sel_gu:
+                view_bits = filter_index.combine(view_bits, filter_index.select_values('Addr_Gu', sel_gu))
+
+    with perf_trace.span('filter.take'):
+        df = filter_index.take(dataset_df, view_bits)
+    # Headline statistics for this filter state, computed once and rendered by every output
+    with perf_trace.span('report_model'):
+        report_model = load_report_model(file_version, FilterIndex.selection_key(view_bits), df)
+
+    # One count cube per filter state (before region filters); every view slices it
+    with perf_trace.span('count_cube'):
+        filter_cube = load_count_cube(
+            file_version, FilterIndex.selection_key(base_bits), filter_index, dataset_df, base_bits
+        )
     
     # --- Excel Report Download Section ---
     st.sidebar.markdown("---")
@@ -186,7 +203,7 @@ if df is not None:
     
     if st.sidebar.button("📥 엑셀 보고서 생성", type="primary", use_container_width=True):
         with st.sidebar:
-            with st.spinner('보고서 생성 중...'):
+            with st.spinner('보고서 생성 중...'), perf_trace.span('report.excel'):
                 try:
                     # 현재 필터링된 데이터로 보고서 생성
                     report_type = report_type_options[selected_report]
@@ -195,12 +212,18 @@ if df is not None:
                         st.error("엑셀 생성 모듈이 로드되지 않았습니다. 상단 에러 메시지를 확인해주세요.")
                         st.stop()
                         
-                    excel_file = generate_excel_report(df, report_type)
+                    # 같은 필터 상태/데이터/유형으로 만든 보고서가 있으면 그대로 사용
+                    report_key = report_cache_key(FilterIndex.selection_key(view_bits), file_version, report_type)
+                    excel_bytes = report_cache.get(report_key)
+                    if excel_bytes is None:
+                        generator = ExcelReportGenerator(df, model=report_model)
+                        excel_bytes = generator.create_report(report_type).getvalue()
+                        if not generator.errors:  # 오류 시트가 들어간 보고서는 보관하지 않음
+                            report_cache.put(report_key, excel_bytes)
                     
                     # 세션 상태에 저장 (BytesIO 대신 bytes 바이트 문자열로 저장)
-                    st.session_state['generated_excel'] = excel_file.getvalue()
+                    st.session_state['generated_excel'] = excel_bytes
                     st.session_state['generated_filename'] = f"PreSales_Report_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
-                    st.session_state['last_filter_hash'] = hash(str(df.index.tolist())) # 데이터 변경 감지용 (단순화)
                     
                     st.success("✅ 생성 완료! 아래 버튼을 눌러 다운로드하세요.")
                 except Exception as e:
@@ -218,21 +241,72 @@ if df is not None:
             use_container_width=True
         )
 
+    # --- Export bundle: Excel + PDF + data extract built in parallel, one zip ---
+    bundle_format = st.sidebar.radio("추출 데이터 형식", ["CSV", "Parquet"], horizontal=True, key="bundle_format")
+    if st.sidebar.button("🗜️ 전체 묶음 내보내기 (ZIP)", use_container_width=True, key="bundle_build"):
+        with st.sidebar, perf_trace.span('report.bundle'):
+            report_type = report_type_options[selected_report]
+            ai_text = st.session_state.get('ai_result')
+            if not ai_text or "⚠️" in ai_text or "❌" in ai_text:
+                ai_text = None
+            ai_digest = hashlib.sha256((ai_text or '').encode('utf-8')).hexdigest()
+            bundle_key = report_cache_key(
+                FilterIndex.selection_key(view_bits), file_version,
+                f"bundle:{report_type}:{bundle_format}:{ai_digest}", fmt='zip'
+            )
+            bundle_bytes = report_cache.get(bundle_key)
+            if bundle_bytes is None:
+                progress_bar = st.progress(0.0, text="묶음 파일 생성 중...")
+
+                def show_bundle_progress(done, total, name):
+                    progress_bar.progress(done / total, text=f"{done}/{total} 완료: {name}")
+
+                try:
+                    bundle_context = load_analysis_context(file_version, FilterIndex.selection_key(view_bits), df, report_model)
+                    bundle = build_export_bundle(
+                        df, model=report_model, ai_insight=ai_text,
+                        lead_summary=bundle_context.lead_summary, rfie_summary=bundle_context.rfie_summary,
+                        report_type=report_type, data_format=bundle_format.lower(),
+                        progress=show_bundle_progress,
+                    )
+                    bundle_bytes = bundle.data
+                    if bundle.errors:
+                        st.warning("일부 파일 생성 중 오류가 발생했습니다: " + " / ".join(bundle.errors))
+                    else:
+                        report_cache.put(bundle_key, bundle_bytes)
+                    progress_bar.progress(1.0, text=f"✅ {len(bundle.files)}개 파일 생성 완료 ({bundle.elapsed:.1f}초)")
+                except Exception as e:
+                    progress_bar.empty()
+                    st.error(f"⚠️ 묶음 생성 중 오류 발생: {str(e)}")
+            if bundle_bytes is not None:
+                st.session_state['generated_bundle'] = bundle_bytes
+                st.session_state['generated_bundle_name'] = f"PreSales_Export_{datetime.now().strftime('%Y%m%d_%H%M')}.zip"
+
+    if st.session_state.get('generated_bundle') is not None:
+        st.sidebar.download_button(
+            label="⬇️ 묶음 파일 다운로드 (ZIP)",
+            data=st.session_state['generated_bundle'],
+            file_name=st.session_state['generated_bundle_name'],
+            mime="application/zip",
+            key=f"dl_{st.session_state['generated_bundle_name']}",
+            use_container_width=True
+        )
+
     # --- Metrics ---
     st.header("1. 핵심 현황 (Key Metrics)")
     
-    total = len(df)
-    avg_intent = df['Q6_Intent'].mean() if 'Q6_Intent' in df.columns else 0
-    high_intent = len(df[df['Q6_Intent'] >= 6]) if 'Q6_Intent' in df.columns else 0
+    total = report_model.total
+    avg_intent = report_model.avg_intent or 0
+    high_intent = report_model.s_grade
     
     # Calculate S+A Grade Count if 'Grade' column exists
     sa_count = high_intent
     sa_label = "가망 고객 (S급)"
     sa_delta = "의향 6점 이상"
     
-    if 'Grade' in df.columns:
+    if report_model.sa_count is not None:
         # Grade 1(S), 2(A)
-        sa_count = len(df[df['Grade'].isin([1, 2])])
+        sa_count = report_model.sa_count
         sa_label = "가망 고객 (S/A급)"
         sa_delta = "전체 대비 비율"
         
@@ -246,51 +320,13 @@ if df is not None:
     
     st.markdown("---")
 
-    # --- Helper: Weekly Period Calculator (Mon-Sun) ---
-    def get_weekly_period(date_series):
+    # --- Reusable Analysis Function ---
+    def draw_analysis_tabs(target_df, cube, key_suffix=""):
         """
-        Groups dates into weekly buckets (Monday-Sunday).
-        Returns a Series of strings: "1주차 (12/08~12/14)"
+        Render the analysis sub-tabs for one view.
+        Every chart/table is a slice or roll-up of `cube` (built once per filter state);
+        target_df only backs the row-level Top 500 list.
         """
-        if date_series.empty:
-            return date_series.astype(str)
-
-        # 1. Find the global minimum date to determine Week 1's anchor
-        # Ensure we anchor to the Monday of the week containing the min date
-        min_date = date_series.min()
-        # weekday(): Mon=0, Sun=6. 
-        # Subtract current weekday to get Monday.
-        start_anchor = min_date - pd.Timedelta(days=min_date.weekday())
-        
-        # 2. Calculate offset in weeks
-        # We need to apply the logic row by row or vectorized
-        # Vectorized: (date - anchor).dt.days // 7 + 1
-        # Only works if date_series is datetime64
-        
-        dates = pd.to_datetime(date_series)
-        days_diff = (dates - start_anchor).dt.days
-        week_nums = (days_diff // 7) + 1
-        
-        # 3. Calculate Start/End date for each week num
-        # Week N Start = Anchor + (N-1)*7
-        # Week N End   = Week N Start + 6
-        
-        results = []
-        for d, w in zip(dates, week_nums):
-            if pd.isna(d):
-                results.append("미확인")
-                continue
-                
-            w_start = start_anchor + pd.Timedelta(days=(w-1)*7)
-            w_end = w_start + pd.Timedelta(days=6)
-            
-            period_str = f"{w_start.strftime('%m/%d')}~{w_end.strftime('%m/%d')}"
-            results.append(f"{w}주차 ({period_str})")
-            
-        return pd.Series(results, index=date_series.index)
-    
-    # --- Reusable Analysis Function ---
-    def draw_analysis_tabs(target_df, key_suffix=""):
         if target_df.empty:
             st.warning("분석할 데이터가 없습니다.")
             return
@@ -299,30 +335,30 @@ if df is not None:
         t1, t2, t3, t4, t5 = st.tabs(["📊 설문 문항 통합 분석", "🌍 인구/지역 통계", "🏆 상담 등급 분석", "📈 영업 성과 분석", "📅 주차별 추이"])
         
         # Tab 1: Combined Survey (Q1~Q8)
-        with t1:
+        with t1, perf_trace.span(f'tabs.{key_suffix}.survey'):
             st.markdown("#### 💡 설문 응답 종합 분석 (Q1~Q8)")
             
             # Row 1: Q1, Q2, Q3
             r1_1, r1_2, r1_3 = st.columns(3)
             with r1_1:
                 st.markdown("##### Q1. 사업지 인지도")
-                if 'Q1_Label' in target_df.columns:
-                     counts = target_df['Q1_Label'].value_counts().reset_index()
+                if cube.has('Q1_Label'):
+                     counts = cube.value_counts('Q1_Label').reset_index()
                      counts.columns = ['Answer', 'Count']
                      fig = px.pie(counts, values='Count', names='Answer', hole=0.4)
                      fig.update_traces(textposition='inside', textinfo='percent+label')
                      st.plotly_chart(fig, use_container_width=True, key=f"q1_{key_suffix}")
             with r1_2:
                 st.markdown("##### Q2. 정보 습득 경로")
-                if 'Q2_Label' in target_df.columns:
-                     counts = target_df['Q2_Label'].value_counts().reset_index()
+                if cube.has('Q2_Label'):
+                     counts = cube.value_counts('Q2_Label').reset_index()
                      counts.columns = ['Channel', 'Count']
                      fig = px.bar(counts, x='Channel', y='Count', text='Count')
                      st.plotly_chart(fig, use_container_width=True, key=f"q2_{key_suffix}")
             with r1_3:
                 st.markdown("##### Q3. 만족 장점")
-                if 'Q3_Label' in target_df.columns:
-                    counts = target_df['Q3_Label'].value_counts().reset_index()
+                if cube.has('Q3_Label'):
+                    counts = cube.value_counts('Q3_Label').reset_index()
                     counts.columns = ['Pros', 'Count']
                     fig = px.bar(counts, x='Pros', y='Count', text='Count')
                     st.plotly_chart(fig, use_container_width=True, key=f"q3_{key_suffix}")
@@ -333,23 +369,23 @@ if df is not None:
             r2_1, r2_2, r2_3 = st.columns(3)
             with r2_1:
                 st.markdown("##### Q4. 구매 목적")
-                if 'Q4_Label' in target_df.columns:
-                    counts = target_df['Q4_Label'].value_counts().reset_index()
+                if cube.has('Q4_Label'):
+                    counts = cube.value_counts('Q4_Label').reset_index()
                     counts.columns = ['Purpose', 'Count']
                     fig = px.bar(counts, x='Purpose', y='Count', color='Purpose', text='Count')
                     st.plotly_chart(fig, use_container_width=True, key=f"q4_{key_suffix}")
             with r2_2:
                 st.markdown("##### Q5. 선호 평형")
-                if 'Q5_Label' in target_df.columns:
-                    counts = target_df['Q5_Label'].value_counts().reset_index()
+                if cube.has('Q5_Label'):
+                    counts = cube.value_counts('Q5_Label').reset_index()
                     counts.columns = ['Type', 'Count']
                     fig = px.pie(counts, values='Count', names='Type', hole=0.4)
                     fig.update_traces(textposition='inside', textinfo='percent+label')
                     st.plotly_chart(fig, use_container_width=True, key=f"q5_{key_suffix}")
             with r2_3:
                 st.markdown("##### Q6. 계약 의향 (1~7점)")
-                if 'Q6_Intent' in target_df.columns:
-                    q6_counts = target_df['Q6_Intent'].value_counts().sort_index().reset_index()
+                if cube.has('Q6_Intent'):
+                    q6_counts = cube.value_counts('Q6_Intent').sort_index().reset_index()
                     q6_counts.columns = ['Score', 'Count']
                     fig = px.bar(q6_counts, x='Score', y='Count', text='Count')
                     fig.update_xaxes(dtick=1)
@@ -361,31 +397,31 @@ if df is not None:
             r3_1, r3_2, r3_3 = st.columns(3)
             with r3_1:
                 st.markdown("##### Q7. 청약 예정")
-                if 'Q7_Label' in target_df.columns:
-                    counts = target_df['Q7_Label'].value_counts().reset_index()
+                if cube.has('Q7_Label'):
+                    counts = cube.value_counts('Q7_Label').reset_index()
                     counts.columns = ['Type', 'Count']
                     fig = px.pie(counts, values='Count', names='Type')
                     fig.update_traces(textposition='inside', textinfo='percent+label')
                     st.plotly_chart(fig, use_container_width=True, key=f"q7_{key_suffix}")
             with r3_2:
                 st.markdown("##### Q8. 희망 분양가")
-                if 'Q8_Label' in target_df.columns:
-                    order = list(q8_map.values())
-                    counts = target_df['Q8_Label'].value_counts().reindex(order).fillna(0).reset_index()
+                if cube.has('Q8_Label'):
+                    order = list(Q8_MAP.values())
+                    counts = cube.value_counts('Q8_Label').reindex(order).fillna(0).reset_index()
                     counts.columns = ['PriceRange', 'Count']
                     fig = px.bar(counts, x='PriceRange', y='Count', text='Count')
                     st.plotly_chart(fig, use_container_width=True, key=f"q8_{key_suffix}")
 
         # Tab 2: Demographics
-        with t2:
+        with t2, perf_trace.span(f'tabs.{key_suffix}.demographics'):
             st.markdown("#### 🌍 인구/지역 통계")
             
             st.markdown("##### 일별 및 누계 접수 추이")
-            if 'Date' in target_df.columns:
+            if cube.has('Date'):
                 import plotly.graph_objects as go
                 from plotly.subplots import make_subplots
                 
-                daily = target_df.groupby(target_df['Date'].dt.date).size().reset_index(name='Count')
+                daily = cube.group_counts(['Date'])
                 daily.columns = ['Date', 'Count']
                 daily = daily.sort_values('Date')
                 
@@ -423,23 +459,23 @@ if df is not None:
                 st.plotly_chart(fig, use_container_width=True, key=f"date_{key_suffix}")
             
             st.markdown("#### 거주 지역 (Top 20)")
-            if 'Addr_City' in target_df.columns and 'Addr_Gu' in target_df.columns:
-                 target_df['Full_Addr'] = target_df['Addr_City'].astype(str) + " " + target_df['Addr_Gu'].astype(str)
-                 counts = target_df['Full_Addr'].value_counts().head(20).reset_index()
+            if cube.has('Addr_City') and cube.has('Addr_Gu'):
+                 addr_cube = cube.assign_cells(Full_Addr=cube.cells['Addr_City'].astype(str) + " " + cube.cells['Addr_Gu'].astype(str))
+                 counts = addr_cube.value_counts('Full_Addr').head(20).reset_index()
                  counts.columns = ['Address', 'Count']
                  fig = px.bar(counts, x='Address', y='Count', text='Count')
                  st.plotly_chart(fig, use_container_width=True, key=f"addr_{key_suffix}")
 
         # Tab 3: Grade
-        with t3:
+        with t3, perf_trace.span(f'tabs.{key_suffix}.grade'):
             st.markdown("#### 🏆 상담 등급 (S/A/B/C)")
-            if 'Grade' in target_df.columns:
+            if cube.has('Grade'):
                 g_map = {1:'S (초고관심)', 2:'A (관심)', 3:'B (보통)', 4:'C (관리)'}
-                target_df['Grade_Label'] = target_df['Grade'].map(g_map).fillna('미기재')
+                grade_cube = cube.assign_cells(Grade_Label=cube.cells['Grade'].map(g_map).fillna('미기재'))
                 
                 gc1, gc2 = st.columns([1, 2])
                 with gc1:
-                    counts = target_df['Grade_Label'].value_counts().reset_index()
+                    counts = grade_cube.value_counts('Grade_Label').reset_index()
                     counts.columns = ['Grade', 'Count']
                     try:
                         counts['Sort'] = counts['Grade'].apply(lambda x: 1 if 'S' in x else (2 if 'A' in x else (3 if 'B' in x else (4 if 'C' in x else 5))))
@@ -450,7 +486,7 @@ if df is not None:
                 with gc2:
                     st.markdown("##### 상세 리스트 (Top 500)")
                     cols = ['Date', 'Manager', 'Addr_Gu', 'Q5_Label', 'Q6_Intent', 'Q4_Label', 'Grade_Label']
-                    show_cols = [c for c in cols if c in target_df.columns]
+                    show_cols = [c for c in cols if c in target_df.columns or c == 'Grade_Label']
                     
                     # Mapping for Korean Headers
                     header_map = {
@@ -464,29 +500,30 @@ if df is not None:
                     }
                     
                     sorted_list = target_df.sort_values(['Grade', 'Q6_Intent'], ascending=[True, False]).head(500)
+                    sorted_list = sorted_list.assign(Grade_Label=sorted_list['Grade'].map(g_map).fillna('미기재'))
                     display_df = sorted_list[show_cols].rename(columns=header_map)
                     st.dataframe(display_df, use_container_width=True)
 
         # Tab 4: Sales Performance
-        with t4:
+        with t4, perf_trace.span(f'tabs.{key_suffix}.sales'):
             st.markdown("#### 📈 영업 성과 및 효율 (Performance)")
             sp_col1, sp_col2 = st.columns(2)
             
             with sp_col1:
                 st.markdown("##### 🚩 거점별 수집 실적 (Top 10)")
-                if 'Spot' in target_df.columns:
-                    spot_counts = target_df['Spot'].value_counts().reset_index().head(10)
+                if cube.has('Spot'):
+                    spot_counts = cube.value_counts('Spot').reset_index().head(10)
                     spot_counts.columns = ['Spot', 'Count']
                     fig = px.bar(spot_counts, x='Spot', y='Count', text='Count', title="거점별 DB 수집량")
                     st.plotly_chart(fig, use_container_width=True, key=f"perf_sp1_{key_suffix}")
                     
-                    if 'Grade' in target_df.columns:
+                    if cube.has('Grade'):
                          st.markdown("##### 💎 거점별 우수 등급(S/A) 현황")
-                         high_grade = target_df[target_df['Grade'].isin([1, 2])].copy()
-                         if not high_grade.empty:
+                         high_grade = cube.slice(Grade=[1, 2])
+                         if high_grade.total > 0:
                              g_map_perf = {1:'S (초고관심)', 2:'A (관심)'}
-                             high_grade['Grade_Label'] = high_grade['Grade'].map(g_map_perf)
-                             spot_grade = high_grade.groupby(['Spot', 'Grade_Label']).size().reset_index(name='Count')
+                             high_grade = high_grade.assign_cells(Grade_Label=high_grade.cells['Grade'].map(g_map_perf))
+                             spot_grade = high_grade.group_counts(['Spot', 'Grade_Label'])
                              fig3 = px.bar(spot_grade, x='Spot', y='Count', color='Grade_Label', text='Count', title="거점별 S/A 등급 확보 수", barmode='group')
                              st.plotly_chart(fig3, use_container_width=True, key=f"perf_sp3_{key_suffix}")
                          else:
@@ -494,19 +531,17 @@ if df is not None:
 
             with sp_col2:
                 st.markdown("##### 👤 담당자/조별 실적 (Top 10)")
-                if 'Manager' in target_df.columns:
-                    mgr_counts = target_df['Manager'].value_counts().reset_index().head(10)
+                if cube.has('Manager'):
+                    mgr_counts = cube.value_counts('Manager').reset_index().head(10)
                     mgr_counts.columns = ['Manager', 'Count']
                     fig = px.bar(mgr_counts, x='Manager', y='Count', text='Count', title="담당자별 누적 실적")
                     st.plotly_chart(fig, use_container_width=True, key=f"perf_mp1_{key_suffix}")
                 
                 st.markdown("##### 상세 성과표")
-                if 'Manager' in target_df.columns and 'Q6_Intent' in target_df.columns:
-                    mgr_stats = target_df.groupby('Manager').agg(
-                        Total_DB=('Manager', 'count'),
-                        Avg_Score=('Q6_Intent', 'mean'),
-                        S_Count=('Q6_Intent', lambda x: (x>=6).sum())
-                    ).reset_index()
+                if cube.has('Manager') and cube.has('Q6_Intent'):
+                    mgr_stats = cube.score_stats(['Manager'], 'Q6_Intent', threshold=6).rename(
+                        columns={'Total': 'Total_DB', 'Mean': 'Avg_Score', 'AtLeast': 'S_Count'}
+                    )[['Manager', 'Total_DB', 'Avg_Score', 'S_Count']]
                     mgr_stats['S_Ratio'] = (mgr_stats['S_Count'] / mgr_stats['Total_DB'] * 100).round(1)
                     mgr_stats['Avg_Score'] = mgr_stats['Avg_Score'].round(2)
                     mgr_stats = mgr_stats.sort_values('Total_DB', ascending=False)
@@ -522,15 +557,13 @@ if df is not None:
                     st.dataframe(mgr_stats.rename(columns=mgr_header_map), use_container_width=True)
 
         # Tab 5: Weekly Trend Analysis
-        with t5:
+        with t5, perf_trace.span(f'tabs.{key_suffix}.weekly'):
             st.markdown("#### 📅 주차별 설문 응답 추이 (Weekly Trend)")
-            if 'Date' not in target_df.columns:
+            if not cube.has('Date'):
                 st.warning("날짜(Date) 데이터가 없어 주차별 분석을 할 수 없습니다.")
             else:
-                # 1. Calculate Weeks
-                # Make a copy to avoid SettingWithCopy warnings on the original df slice
-                analysis_df = target_df.copy()
-                analysis_df['Week_Label'] = get_weekly_period(pd.to_datetime(analysis_df['Date']))
+                # 1. Calculate Weeks (per cube cell, not per row)
+                week_cube = cube.assign_cells(Week_Label=get_weekly_period(cube.cells['Date']))
                 
                 # 2. Select Question
                 q_options = {
@@ -545,7 +578,7 @@ if df is not None:
                 }
                 
                 # Filter out columns that don't exist
-                valid_q_options = {k: v for k, v in q_options.items() if k in analysis_df.columns}
+                valid_q_options = {k: v for k, v in q_options.items() if week_cube.has(k)}
                 
                 if not valid_q_options:
                      st.error("분석할 설문 문항 데이터가 없습니다.")
@@ -567,14 +600,10 @@ if df is not None:
                             # Special handling for Q6 (Score)
                             if q_key == 'Q6_Intent':
                                 # For Q6, we show the Average Score Trend Line
-                                weekly_avg = analysis_df.groupby('Week_Label')['Q6_Intent'].mean().reset_index()
+                                weekly_avg = week_cube.score_stats(['Week_Label'], 'Q6_Intent')[['Week_Label', 'Mean']]
                                 weekly_avg.columns = ['Week', 'Avg_Score']
-                                # Sort naturally if possible, else by Week Label
-                                try:
-                                    weekly_avg['Week_Num'] = weekly_avg['Week'].apply(lambda x: int(x.split('주차')[0]))
-                                    weekly_avg = weekly_avg.sort_values('Week_Num')
-                                except:
-                                    weekly_avg = weekly_avg.sort_values('Week')
+                                # Week labels are an ordered Categorical -> chronological sort
+                                weekly_avg = weekly_avg.sort_values('Week')
 
                                 fig = px.line(weekly_avg, x='Week', y='Avg_Score', markers=True, title="주차별 평균 계약 의향 점수", text='Avg_Score')
                                 fig.update_traces(textposition="bottom center", texttemplate='%{text:.2f}')
@@ -585,13 +614,8 @@ if df is not None:
                                 # Might be too crowded. Let's stick to Average Line for Q6 in this grid view
                                 # OR show distribution instead if user prefers. 
                                 # Let's show the Score Distribution Bar Chart as well.
-                                counts = analysis_df.groupby(['Week_Label', 'Q6_Intent']).size().reset_index(name='Count')
-                                # Sort logic same as below...
-                                try:
-                                    counts['Week_Num'] = counts['Week_Label'].apply(lambda x: int(x.split('주차')[0]))
-                                    counts = counts.sort_values(['Week_Num', 'Q6_Intent'])
-                                except:
-                                    counts = counts.sort_values(['Week_Label', 'Q6_Intent'])
+                                counts = week_cube.group_counts(['Week_Label'], 'Q6_Intent')
+                                counts = counts.sort_values(['Week_Label', 'Q6_Intent'])
                                     
                                 if "비율" in view_type:
                                      week_totals = counts.groupby('Week_Label')['Count'].transform('sum')
@@ -605,14 +629,10 @@ if df is not None:
 
                             else:
                                 # Categorical Questions
-                                counts = analysis_df.groupby(['Week_Label', q_key]).size().reset_index(name='Count')
+                                counts = week_cube.group_counts(['Week_Label'], q_key)
                                 
                                 # Sort Lines
-                                try:
-                                    counts['Week_Num'] = counts['Week_Label'].apply(lambda x: int(x.split('주차')[0]))
-                                    counts = counts.sort_values(['Week_Num', 'Count'], ascending=[True, False])
-                                except:
-                                    counts = counts.sort_values('Week_Label')
+                                counts = counts.sort_values(['Week_Label', 'Count'], ascending=[True, False])
 
                                 if "비율" in view_type:
                                     week_totals = counts.groupby('Week_Label')['Count'].transform('sum')
@@ -632,67 +652,54 @@ if df is not None:
     main_tabs = st.tabs(["📊 전체 분석", "🟢 서대문구", "🔵 마포구", "🟣 은평구", "📈 고급 분석", "🤖 AI 분석"])
     
     # 1. Main Analysis
-    with main_tabs[0]:
+    with main_tabs[0], perf_trace.span('tabs.main'):
         st.subheader("📊 전체 데이터 분석")
-        # Apply Sidebar Region Filter ONLY here
-        view_df = filtered_base_df.copy()
-        if sel_city:
-            view_df = view_df[view_df['Addr_City'].isin(sel_city)]
-        if sel_gu:
-            view_df = view_df[view_df['Addr_Gu'].isin(sel_gu)]
-            
-        draw_analysis_tabs(view_df, "main")
-
-    # 2. Seodaemun
-    with main_tabs[1]:
-        st.header("🟢 서대문구 거주 고객 분석")
-        target = filtered_base_df[filtered_base_df['Addr_Gu'] == '서대문구']
-        st.info(f"선택 기간 내 서대문구 거주 응답 수: {len(target):,} 명")
-        draw_analysis_tabs(target, "seo")
-
-    # 3. Mapo
-    with main_tabs[2]:
-        st.header("🔵 마포구 거주 고객 분석")
-        target = filtered_base_df[filtered_base_df['Addr_Gu'] == '마포구']
-        st.info(f"선택 기간 내 마포구 거주 응답 수: {len(target):,} 명")
-        draw_analysis_tabs(target, "mapo")
-
-    # 4. Eunpyeong
-    with main_tabs[3]:
-        st.header("🟣 은평구 거주 고객 분석")
-        target = filtered_base_df[filtered_base_df['Addr_Gu'] == '은평구']
-        st.info(f"선택 기간 내 은평구 거주 응답 수: {len(target):,} 명")
-        draw_analysis_tabs(target, "eun")
+        # Sidebar Region Filter applies ONLY here (df already carries it)
+        draw_analysis_tabs(df, filter_cube.slice(Addr_City=sel_city, Addr_Gu=sel_gu), "main")
+
+    # 2~4. Residence tabs: base selection AND one Gu bitmap
+    region_tabs = [
+        (main_tabs[1], "🟢", "서대문구", "seo"),
+        (main_tabs[2], "🔵", "마포구", "mapo"),
+        (main_tabs[3], "🟣", "은평구", "eun"),
+    ]
+    for region_tab, icon, gu_name, region_key in region_tabs:
+        with region_tab, perf_trace.span(f'tabs.{region_key}'):
+            st.header(f"{icon} {gu_name} 거주 고객 분석")
+            if filter_index.has('Addr_Gu'):
+                region_bits = filter_index.combine(base_bits, filter_index.select_values('Addr_Gu', [gu_name]))
+                target = filter_index.take(dataset_df, region_bits)
+            else:
+                target = dataset_df.iloc[0:0]
+            st.info(f"선택 기간 내 {gu_name} 거주 응답 수: {len(target):,} 명")
+            draw_analysis_tabs(target, filter_cube.slice(Addr_Gu=[gu_name]), region_key)
 
     # 5. Advanced Analytics Dashboard (Moved to Tab)
     with main_tabs[4]:
         st.header("📈 고급 분석 대시보드")
         st.caption("리드 스코어링, RFIE 세그먼트, 경고 시스템을 통한 심층 분석")
     
-    # Import advanced analytics
+    # Advanced analytics: computed once per filter state, shared with the AI prompt
+    analysis_context = None
     try:
-        from advanced_analytics import (
-            apply_lead_scoring,
-            get_lead_score_summary,
-            calculate_rfie_scores,
-            get_rfie_summary,
-            get_segment_summary,
-            generate_alerts
-        )
+        with perf_trace.span('advanced.context'):
+            analysis_context = load_analysis_context(file_version, FilterIndex.selection_key(view_bits), df, report_model)
         
-        # Apply lead scoring
-        df_scored = apply_lead_scoring(df)
-        lead_summary = get_lead_score_summary(df_scored)
+        # Lead scoring
+        with perf_trace.span('advanced.lead_scoring'):
+            df_scored = analysis_context.df_scored
+            lead_summary = analysis_context.lead_summary
         
-        # Apply RFIE
-        df_rfie = calculate_rfie_scores(df)
-        rfie_summary = get_rfie_summary(df_rfie)
+        # RFIE
+        with perf_trace.span('advanced.rfie'):
+            df_rfie = analysis_context.df_rfie
+            rfie_summary = analysis_context.rfie_summary
         
         # Create tabs for advanced analytics
         adv_tabs = st.tabs(["🎯 리드 스코어링", "📊 RFIE 세그먼트", "⚠️ 경고/알림"])
         
         # Tab 1: Lead Scoring
-        with adv_tabs[0]:
+        with adv_tabs[0], perf_trace.span('advanced.tab.lead'):
             # 설명 박스 추가
             with st.expander("ℹ️ 리드 스코어링이란?", expanded=False):
                 st.markdown("""
@@ -740,7 +747,7 @@ if df is not None:
             # Segment details
             st.subheader("세그먼트별 특성")
             st.caption("각 등급 고객들의 주요 특성 - 클릭하면 상세 정보 확인")
-            segment_details = get_segment_summary(df_scored)
+            segment_details = analysis_context.segment_details
             for grade, info in segment_details.items():
                 with st.expander(f"{grade} - {info['고객_수']}명 ({info['비율']})"):
                     cols = st.columns(3)
@@ -749,7 +756,7 @@ if df is not None:
                     cols[2].write(f"**주요 목적:** {info.get('주요_목적', 'N/A')}")
         
         # Tab 2: RFIE Segment
-        with adv_tabs[1]:
+        with adv_tabs[1], perf_trace.span('advanced.tab.rfie'):
             # 설명 박스 추가
             with st.expander("ℹ️ RFIE 분석이란?", expanded=False):
                 st.markdown("""
@@ -805,7 +812,7 @@ if df is not None:
             rfie_cols[4].metric("❌ Lost", f"{rfie_summary['Lost_수']}명", help="이탈 위험 고객")
         
         # Tab 3: Alerts
-        with adv_tabs[2]:
+        with adv_tabs[2], perf_trace.span('advanced.tab.alerts'):
             # 설명 박스 추가
             with st.expander("ℹ️ 경고 시스템이란?", expanded=False):
                 st.markdown("""
@@ -823,7 +830,7 @@ if df is not None:
             
             st.subheader("⚠️ 주의 사항 및 경고")
             st.caption("데이터에서 자동으로 감지된 주의 사항")
-            alerts = generate_alerts(df)
+            alerts = analysis_context.alerts
             
             if alerts:
                 for alert in alerts:
@@ -850,27 +857,105 @@ if df is not None:
     # Initialize session state for AI result
     if 'ai_result' not in st.session_state:
         st.session_state['ai_result'] = None
+    if 'ai_job_id' not in st.session_state:
+        # Pick up an analysis started before a page reload
+        st.session_state['ai_job_id'] = st.query_params.get('ai_job')
+
+    job_runner = get_job_runner()
 
     col_ai1, col_ai2 = st.columns([1, 4])
     
     with col_ai1:
-        if st.button("🚀 AI 분석 시작", type="primary", use_container_width=True):
-            with st.spinner("AI가 데이터를 분석하고 있습니다... (약 10~20초 소요)"):
-                st.session_state['ai_result'] = generate_ai_insight(df)
+        run_ai = st.button("🚀 AI 분석 시작", type="primary", use_container_width=True,
+                           disabled=bool(st.session_state['ai_job_id']))
+        force_refresh = st.checkbox("🔄 새로 분석 (저장된 결과 무시)", key="ai_force_refresh")
+
+    # Batch mode: one insight per region/spot, generated concurrently into one report
+    run_batch = False
+    with st.expander("📍 지역/거점별 일괄 분석", expanded=False):
+        batch_dims = [d for d in BATCH_DIMENSIONS if filter_index.has(d)]
+        if batch_dims:
+            batch_dim = st.selectbox("분석 기준", batch_dims, format_func=BATCH_DIMENSIONS.get, key="ai_batch_dim")
+            batch_options = filter_index.options(batch_dim, view_bits)
+            batch_default = [g for g in ["서대문구", "마포구", "은평구"] if g in batch_options] if batch_dim == 'Addr_Gu' else batch_options
+            batch_values = st.multiselect("분석 대상", batch_options, default=batch_default, key=f"ai_batch_values_{batch_dim}")
+            run_batch = st.button("🚀 일괄 분석 시작", disabled=bool(st.session_state['ai_job_id']) or not batch_values,
+                                  key="ai_batch_run")
+
+    # The analysis runs as a background job, so filters and other tabs stay usable meanwhile
+    if run_ai or run_batch:
+        with perf_trace.span('ai.submit', mode='batch' if run_batch else 'single'):
+            st.session_state['ai_result'] = None
+            if run_batch:
+                st.session_state['ai_job_id'] = job_runner.submit_stream(
+                    stream_batch_insights, df, batch_dim, batch_values, name="ai_batch_insight",
+                    force_refresh=force_refresh, context=analysis_context
+                )
+            else:
+                st.session_state['ai_job_id'] = job_runner.submit_stream(
+                    stream_ai_insight, df, name="ai_insight",
+                    force_refresh=force_refresh, context=analysis_context
+                )
+            st.query_params['ai_job'] = st.session_state['ai_job_id']
+
+    ai_job = job_runner.get(st.session_state['ai_job_id']) if st.session_state['ai_job_id'] else None
+    if st.session_state['ai_job_id'] and (ai_job is None or ai_job.finished):
+        if ai_job is not None:
+            # The job ran in the background; log how long it queued and ran, once, on pick-up
+            if ai_job.started_at and ai_job.finished_at:
+                perf.record('ai.job', ai_job.finished_at - ai_job.started_at, job=ai_job.name,
+                            queued=round(ai_job.started_at - ai_job.created_at, 3), failed=ai_job.error is not None)
+            st.session_state['ai_result'] = (
+                ai_job.result if ai_job.error is None
+                else f"❌ AI 분석 중 오류가 발생했습니다: {ai_job.error}"
+            )
+        st.session_state['ai_job_id'] = None
+        if 'ai_job' in st.query_params:
+            del st.query_params['ai_job']
+
+    def show_ai_job_progress():
+        """Poll the running job; rerun the whole page once it has finished."""
+        job = job_runner.get(st.session_state['ai_job_id'])
+        if job is None or job.finished:
+            st.rerun()
+        st.info("AI가 데이터를 분석하고 있습니다... 분석 중에도 필터와 다른 탭을 계속 사용할 수 있습니다.")
+        if job.partial:
+            st.markdown(job.partial + " ▌")
+
+    if st.session_state['ai_job_id']:
+        st.fragment(run_every=1.0)(show_ai_job_progress)()
     
     with col_ai2:
         if st.session_state['ai_result'] and "⚠️" not in st.session_state['ai_result'] and "❌" not in st.session_state['ai_result']:
-            try:
-                from pdf_report_generator import generate_pdf_report
-                
-                # PDF 생성에 필요한 데이터 준비
-                pdf_data = generate_pdf_report(
-                    df, 
-                    ai_insight=st.session_state['ai_result'],
-                    lead_summary=lead_summary,
-                    rfie_summary=rfie_summary
-                )
-                
+            # The PDF is only rendered on request, once per (AI text, filtered rows, dataset version, day);
+            # the cover shows the generation date, so a PDF cached yesterday is not served today
+            ai_digest = hashlib.sha256(st.session_state['ai_result'].encode('utf-8')).hexdigest()
+            generated_on = datetime.now().date()
+            pdf_key = report_cache_key(
+                FilterIndex.selection_key(view_bits), file_version,
+                f"ai:{ai_digest}:{generated_on.isoformat()}", fmt='pdf'
+            )
+            pdf_data = report_cache.get(pdf_key)
+
+            if pdf_data is None and st.button("📄 PDF 보고서 만들기", use_container_width=True, key="ai_pdf_build"):
+                try:
+                    from pdf_report_generator import generate_pdf_report
+                    
+                    with st.spinner("PDF 보고서 생성 중..."), perf_trace.span('report.pdf'):
+                        pdf_data = generate_pdf_report(
+                            df, 
+                            ai_insight=st.session_state['ai_result'],
+                            lead_summary=lead_summary,
+                            rfie_summary=rfie_summary,
+                            raise_errors=True,
+                            model=report_model,
+                            generated_on=generated_on
+                        ).getvalue()
+                    report_cache.put(pdf_key, pdf_data)
+                except Exception as e:
+                    st.error(f"PDF 생성 중 오류 발생: {e}")
+
+            if pdf_data is not None:
                 st.download_button(
                     label="📥 종합 분석 보고서 다운로드 (PDF)",
                     data=pdf_data,
@@ -878,8 +963,6 @@ if df is not None:
                     mime="application/pdf",
                     use_container_width=True
                 )
-            except Exception as e:
-                st.error(f"PDF 생성 중 오류 발생: {e}")
 
     if st.session_state['ai_result']:
         if "⚠️" in st.session_state['ai_result'] or "❌" in st.session_state['ai_result']:
@@ -893,3 +976,16 @@ if df is not None:
 
 else:
     st.error("데이터를 찾을 수 없습니다.")
+
+# --- Performance panel (opt-in): this rerun's stage timings + hot paths from the perf log ---
+perf_trace.finish_trace()
+if st.sidebar.checkbox("⏱️ 성능 패널 보기", key="perf_panel"):
+    with st.sidebar.expander("⏱️ 단계별 소요 시간", expanded=True):
+        st.caption(f"이번 실행: {perf.total * 1000:,.0f} ms · 실행 ID {perf.run_id}")
+        st.dataframe(pd.DataFrame(perf.rows()), hide_index=True, use_container_width=True)
+        recent_runs = perf_trace.perf_log.read(limit=perf_trace.DEFAULT_SUMMARY_RUNS)
+        if recent_runs:
+            st.caption(f"최근 {len(recent_runs)}회 실행 기준 느린 단계")
+            st.dataframe(pd.DataFrame(perf_trace.summarize_runs(recent_runs)), hide_index=True,
+                         use_container_width=True)
+        st.caption(f"로그: {perf_trace.perf_log.path}")
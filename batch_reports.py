@@ -0,0 +1,269 @@
+"""
+일괄 보고서 생성 모듈 (Batch Reports)
+- 대시보드 없이 명령줄에서 거점/담당자/시군구별 보고서를 한 번에 생성
+- 데이터는 한 번만 불러오고, 기준 컬럼 값별로 나눈 뒤 프로세스 풀에서 병렬로 엑셀(선택: PDF) 작성
+- 결과는 날짜가 붙은 폴더에 저장 (예: 엑셀 다운로드/20260105_영업거점/)
+
+    python batch_reports.py --by spot
+    python batch_reports.py --by gu --pdf --workers 4
+    python batch_reports.py --by manager --values 김철수 이영희 --report-type 데이터만
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from survey_data import load_survey_sheet, source_fingerprint, build_prepared_dataset
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 기본 원본 파일 (대시보드와 같은 순서로 확인)
+DEFAULT_SOURCES = [
+    os.path.join(BASE_DIR, '설문조사 DB', 'DB.xlsx'),
+    os.path.join(BASE_DIR, '설문조사 DB', 'DEFINE_DB.xlsx'),
+]
+
+# 기본 출력 폴더 (날짜별 하위 폴더를 만듦)
+DEFAULT_OUTPUT_ROOT = os.path.join(BASE_DIR, '엑셀 다운로드')
+
+# 명령줄 이름 → (기준 컬럼, 폴더/파일 이름에 쓰는 라벨)
+BATCH_REPORT_DIMENSIONS = {
+    'spot': ('Spot', '영업거점'),
+    'manager': ('Manager', '담당자'),
+    'gu': ('Addr_Gu', '시군구'),
+}
+
+# 엑셀 보고서 유형
+REPORT_TYPES = ("전체", "데이터만")
+
+# 파일 이름에 쓸 수 없는 문자
+_UNSAFE_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|\s]+')
+
+# 파티션 하나의 생성 결과 (warnings: 파일 이름 변경 등 실패는 아닌 안내)
+BatchResult = namedtuple('BatchResult', ['value', 'rows', 'files', 'errors', 'seconds', 'warnings'])
+
+
+def default_source():
+    """기본 원본 파일 경로 (없으면 None)"""
+    for path in DEFAULT_SOURCES:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_prepared(source):
+    """원본 파일을 한 번 읽어 분석용 데이터셋으로 변환 (스냅샷이 있으면 재사용)"""
+    version = source_fingerprint(source)
+    return build_prepared_dataset(load_survey_sheet(source, version=version))
+
+
+def safe_filename(value):
+    """파일 이름에 쓸 수 있게 값 정리"""
+    return _UNSAFE_FILENAME_CHARS.sub('_', str(value)).strip('_') or '값없음'
+
+
+def report_file_stem(label, value):
+    """값 하나의 기본 보고서 파일 이름 (확장자 제외)"""
+    return f"PreSales_Report_{label}_{safe_filename(value)}"
+
+
+def report_file_stems(values, label):
+    """
+    값별 보고서 파일 이름 (확장자 제외)
+
+    정리한 이름이 겹치면 ('A B'와 'A_B', 빈 값 여러 개 등) 뒤에 _2, _3…을 붙여 서로 덮어쓰지 않게 합니다.
+    대소문자만 다른 이름도 같은 이름으로 봅니다 (Windows 파일 시스템).
+
+    Returns:
+        dict: 값 → 파일 이름
+    """
+    stems, used = {}, set()
+    for value in values:
+        base = report_file_stem(label, value)
+        stem, n = base, 1
+        while stem.casefold() in used:
+            n += 1
+            stem = f"{base}_{n}"
+        used.add(stem.casefold())
+        stems[value] = stem
+    return stems
+
+
+def output_directory(output_root, label, today=None):
+    """날짜가 붙은 출력 폴더 경로 (예: 엑셀 다운로드/20260105_영업거점)"""
+    today = today or datetime.now()
+    return os.path.join(output_root, f"{today.strftime('%Y%m%d')}_{label}")
+
+
+def partition_frame(df, column, values=None):
+    """
+    기준 컬럼 값별로 행 나누기 (groupby 한 번으로 행 위치 계산)
+
+    Args:
+        df: 분석용 데이터셋
+        column: 기준 컬럼
+        values: 포함할 값 목록과 순서 (없으면 값 이름 순서의 전체 값)
+
+    Returns:
+        dict: 값 → 해당 행 DataFrame (행이 없는 값은 제외)
+    """
+    positions = df.groupby(column, observed=True, sort=True).indices
+    if values is None:
+        values = list(positions)
+    return {value: df.take(positions[value]) for value in values if value in positions}
+
+
+def render_partition(value, part, stem, out_dir, report_type="전체", with_pdf=False):
+    """
+    파티션 하나의 보고서를 out_dir/stem.xlsx (.pdf)로 저장 (프로세스 풀에서 실행)
+
+    Returns:
+        BatchResult
+    """
+    from report_model import ReportModel
+    from excel_report_generator import ExcelReportGenerator
+
+    start = time.perf_counter()
+    model = ReportModel(part)
+    files, errors = [], []
+
+    try:
+        generator = ExcelReportGenerator(part, model=model)
+        excel_path = os.path.join(out_dir, f"{stem}.xlsx")
+        with open(excel_path, 'wb') as f:
+            f.write(generator.create_report(report_type).getvalue())
+        files.append(excel_path)
+        errors.extend(generator.errors)
+    except Exception as e:
+        errors.append(f"Excel: {e}")
+
+    if with_pdf:
+        from analysis_context import AnalysisContext
+        from pdf_report_generator import generate_pdf_report
+
+        try:
+            context = AnalysisContext(part, report_model=model)
+            pdf_data = generate_pdf_report(
+                part, lead_summary=context.lead_summary, rfie_summary=context.rfie_summary,
+                raise_errors=True, model=model,
+            ).getvalue()
+            pdf_path = os.path.join(out_dir, f"{stem}.pdf")
+            with open(pdf_path, 'wb') as f:
+                f.write(pdf_data)
+            files.append(pdf_path)
+        except Exception as e:
+            errors.append(f"PDF: {e}")
+
+    return BatchResult(value, len(part), files, errors, time.perf_counter() - start, [])
+
+
+def run_batch(df, dimension, output_root=DEFAULT_OUTPUT_ROOT, report_type="전체", with_pdf=False,
+              values=None, workers=None, today=None, progress=None):
+    """
+    기준별 보고서 일괄 생성
+
+    Args:
+        df: 분석용 데이터셋 (한 번만 불러온 것)
+        dimension: BATCH_REPORT_DIMENSIONS의 키 ('spot', 'manager', 'gu')
+        output_root: 날짜별 폴더를 만들 상위 폴더
+        report_type: 엑셀 보고서 유형 ("전체", "데이터만")
+        with_pdf: PDF 보고서도 생성할지 여부
+        values: 생성할 값 목록 (없으면 전체 값)
+        workers: 동시에 실행할 프로세스 수 (1이면 현재 프로세스에서 순서대로 실행)
+        today: 폴더 이름에 쓸 날짜 (없으면 오늘)
+        progress: 파티션 하나가 끝날 때마다 progress(완료 수, 전체 수, BatchResult) 호출
+
+    Returns:
+        tuple: (출력 폴더, BatchResult 목록 - 값 순서)
+               정리한 파일 이름이 다른 값과 겹쳐 번호를 붙인 경우 해당 결과의 warnings에 기록
+    """
+    column, label = BATCH_REPORT_DIMENSIONS[dimension]
+    if column not in df.columns:
+        raise ValueError(f"'{column}' 컬럼이 없어 {label}별 보고서를 만들 수 없습니다.")
+    if report_type not in REPORT_TYPES:
+        raise ValueError(f"지원하지 않는 보고서 유형입니다: {report_type}")
+
+    parts = partition_frame(df, column, values)
+    out_dir = output_directory(output_root, label, today)
+    os.makedirs(out_dir, exist_ok=True)
+
+    stems = report_file_stems(parts, label)
+    renamed = {
+        value: [f"파일 이름 중복 → {stem}"]
+        for value, stem in stems.items() if stem != report_file_stem(label, value)
+    }
+
+    workers = workers or min(len(parts), os.cpu_count() or 1) or 1
+    jobs = [(value, part, stems[value], out_dir, report_type, with_pdf) for value, part in parts.items()]
+    results = []
+
+    def collect(result):
+        result = result._replace(warnings=renamed.get(result.value, []))
+        results.append(result)
+        if progress is not None:
+            progress(len(results), len(jobs), result)
+
+    if workers <= 1:
+        for job in jobs:
+            collect(render_partition(*job))
+    else:
+        # 대시보드와 같은 spawn 방식 (스레드가 있는 프로세스에서도 안전)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            for future in as_completed([pool.submit(render_partition, *job) for job in jobs]):
+                collect(future.result())
+
+    order = {value: i for i, value in enumerate(parts)}
+    return out_dir, sorted(results, key=lambda r: order[r.value])
+
+
+def main(argv=None):
+    """명령줄 실행"""
+    parser = argparse.ArgumentParser(description="거점/담당자/시군구별 사전영업 보고서 일괄 생성")
+    parser.add_argument('--by', choices=sorted(BATCH_REPORT_DIMENSIONS), required=True,
+                        help="나눌 기준 (spot=영업 거점, manager=담당자, gu=시/군/구)")
+    parser.add_argument('--source', default=None, help="원본 엑셀 파일 (기본: 설문조사 DB/DB.xlsx)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_ROOT, help="날짜별 폴더를 만들 상위 폴더")
+    parser.add_argument('--report-type', choices=REPORT_TYPES, default="전체", help="엑셀 보고서 유형")
+    parser.add_argument('--pdf', action='store_true', help="PDF 보고서도 생성")
+    parser.add_argument('--values', nargs='+', default=None, help="생성할 값만 지정 (기본: 전체)")
+    parser.add_argument('--workers', type=int, default=None, help="동시 프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args(argv)
+
+    source = args.source or default_source()
+    if source is None or not os.path.exists(source):
+        print("❌ 원본 데이터 파일을 찾을 수 없습니다. --source로 지정해주세요.")
+        return 1
+
+    start = time.perf_counter()
+    print(f"📂 데이터 로딩: {source}")
+    df = load_prepared(source)
+    print(f"   {len(df):,}행 ({time.perf_counter() - start:.1f}초)")
+
+    def report(done, total, result):
+        status = "⚠️" if result.errors else "✅"
+        print(f"{status} [{done}/{total}] {result.value} ({result.rows:,}행, {result.seconds:.1f}초)")
+        for error in result.errors:
+            print(f"     오류: {error}")
+        for warning in result.warnings:
+            print(f"     주의: {warning}")
+
+    out_dir, results = run_batch(
+        df, args.by, args.output, report_type=args.report_type, with_pdf=args.pdf,
+        values=args.values, workers=args.workers, progress=report,
+    )
+
+    failed = [r for r in results if r.errors]
+    n_files = sum(len(r.files) for r in results)
+    print(f"\n📁 {out_dir}")
+    print(f"   보고서 {n_files}개 생성, 오류 {len(failed)}건 (전체 {time.perf_counter() - start:.1f}초)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
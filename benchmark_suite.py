@@ -0,0 +1,423 @@
+"""
+성능 측정 모듈 (Benchmark Suite)
+- 합성 데이터(synthetic_data.py)로 대시보드 처리 단계별 시간 측정
+  (로딩 → 컬럼 매핑 → 필터 → 분석 탭 집계 → 리드 스코어링/RFIE → 엑셀/PDF 보고서)
+- 결과는 커밋 해시와 함께 JSON으로 저장 → 커밋 사이의 성능 변화를 비교
+
+    python benchmark_suite.py                          # 1만/10만 행 측정 → .cache/benchmarks/
+    python benchmark_suite.py --rows 1000000 --skip load_xlsx excel pdf
+    python benchmark_suite.py --compare .cache/benchmarks/이전결과.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import survey_data
+from survey_data import CACHE_DIR, build_prepared_dataset, filter_valid_rows
+from synthetic_data import generate_survey_frame, write_survey_workbook, MAX_WORKBOOK_ROWS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 결과 JSON 기본 저장 폴더
+BENCHMARK_DIR = os.path.join(CACHE_DIR, 'benchmarks')
+
+# 결과 JSON 형식이 바뀌면 올림
+BENCHMARK_SCHEMA_VERSION = 1
+
+DEFAULT_ROWS = [10000, 100000]
+DEFAULT_REPEAT = 3
+
+# 비교 시 이 비율 이상 느려지면 성능 저하로 표시
+DEFAULT_REGRESSION_THRESHOLD = 1.2
+
+# 측정 단계 (실행 순서)
+STAGES = [
+    'load_xlsx',        # xlsx 파싱 (스냅샷 없음)
+    'load_snapshot',    # Parquet 스냅샷에서 로딩
+    'mapping',          # build_prepared_dataset()
+    'filter_index',     # FilterIndex 생성
+    'filtering',        # 사이드바 필터 조합 + 행 선택
+    'aggregations',     # 건수 큐브 생성 + 분석 탭 집계
+    'report_model',     # ReportModel
+    'lead_scoring',     # apply_lead_scoring()
+    'rfie',             # calculate_rfie_scores()
+    'excel',            # 엑셀 보고서 (전체)
+    'pdf',              # PDF 보고서
+]
+
+
+# ------------------------------------------
+# 단계별 측정 대상
+# ------------------------------------------
+
+def _sidebar_selection(index):
+    """대시보드 사이드바와 같은 순서로 필터 조합 (기간 가운데 80%, 거점 절반, 담당자 하나 제외, 시군구 3곳)"""
+    bits = None
+    if index.has_dates():
+        min_d, max_d = index.date_bounds()
+        margin = (max_d - min_d) / 10
+        bits = index.select_dates(min_d + margin, max_d - margin)
+    if index.has('Spot'):
+        spots = index.options('Spot', bits)
+        bits = index.combine(bits, index.select_values('Spot', spots[:max(1, len(spots) // 2)]))
+    if index.has('Manager'):
+        managers = index.options('Manager', bits)
+        bits = index.combine(bits, index.select_values('Manager', managers[:max(1, len(managers) - 1)]))
+    base_bits = bits
+    if index.has('Addr_Gu'):
+        gus = index.options('Addr_Gu', bits)
+        bits = index.combine(bits, index.select_values('Addr_Gu', gus[:3]))
+    return base_bits, bits
+
+
+def _analysis_tab_aggregations(cube):
+    """draw_analysis_tabs()가 탭을 그릴 때 큐브에서 계산하는 집계"""
+    from week_buckets import get_weekly_period
+
+    labels = ['Q1_Label', 'Q2_Label', 'Q3_Label', 'Q4_Label', 'Q5_Label', 'Q7_Label', 'Q8_Label']
+    for name in labels + ['Q6_Intent', 'Gender_Label', 'Spot', 'Manager']:
+        if cube.has(name):
+            cube.value_counts(name)
+    if cube.has('Date'):
+        cube.group_counts(['Date'])
+    if cube.has('Addr_City') and cube.has('Addr_Gu'):
+        addr_cube = cube.assign_cells(
+            Full_Addr=cube.cells['Addr_City'].astype(str) + " " + cube.cells['Addr_Gu'].astype(str)
+        )
+        addr_cube.value_counts('Full_Addr').head(20)
+    if cube.has('Grade'):
+        cube.slice(Grade=[1, 2]).value_counts('Spot')
+    if cube.has('Manager') and cube.has('Q6_Intent'):
+        cube.score_stats(['Manager'], 'Q6_Intent', threshold=6)
+    if cube.has('Date'):
+        week_cube = cube.assign_cells(Week_Label=get_weekly_period(cube.cells['Date']))
+        week_cube.score_stats(['Week_Label'], 'Q6_Intent')
+        for name in labels:
+            if week_cube.has(name):
+                week_cube.group_counts(['Week_Label'], name)
+
+
+class _TemporarySnapshotDir:
+    """스냅샷 캐시를 임시 폴더로 바꿔 측정 (실제 .cache/snapshots를 건드리지 않음)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        self._saved = (survey_data.SNAPSHOT_DIR, survey_data.MANIFEST_PATH)
+        survey_data.SNAPSHOT_DIR = self.path
+        survey_data.MANIFEST_PATH = os.path.join(self.path, 'manifest.json')
+        return self
+
+    def __exit__(self, *exc):
+        survey_data.SNAPSHOT_DIR, survey_data.MANIFEST_PATH = self._saved
+        return False
+
+
+def _time_call(func, repeat):
+    """func()를 repeat번 실행한 시간 목록과 마지막 결과"""
+    runs, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - start)
+    return runs, result
+
+
+def run_size(n_rows, repeat=DEFAULT_REPEAT, skip=(), seed=0, progress=None):
+    """
+    한 규모의 합성 데이터로 모든 단계 측정
+
+    단계별 입력은 앞 단계의 결과를 그대로 사용합니다 (측정 시간에는 포함하지 않음).
+    실패한 단계는 오류 메시지를 기록하고 다음 단계로 넘어갑니다.
+
+    Args:
+        n_rows: 합성 원본 행 수
+        repeat: 단계별 반복 횟수 (최소값을 대표값으로 사용)
+        skip: 건너뛸 단계 이름
+        seed: 합성 데이터 시드
+        progress: 단계 하나가 끝날 때마다 progress(단계 이름, 결과 dict) 호출
+
+    Returns:
+        dict: 단계 이름 → {'seconds', 'runs', 'rows'} 또는 {'error'}
+    """
+    from filter_index import FilterIndex
+    from aggregate_cube import build_count_cube
+    from report_model import ReportModel
+    from advanced_analytics import apply_lead_scoring, calculate_rfie_scores
+    from excel_report_generator import ExcelReportGenerator
+    from pdf_report_generator import generate_pdf_report
+
+    raw = filter_valid_rows(generate_survey_frame(n_rows, seed=seed))
+    state = {'raw': raw}
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix='presales_bench_')
+
+    def load_xlsx():
+        path = os.path.join(work_dir, 'survey.xlsx')
+        write_survey_workbook(path, df=raw)
+        runs, _ = _time_call(lambda: survey_data.read_survey_sheet(path), repeat)
+        return runs, len(raw)
+
+    def load_snapshot():
+        path = os.path.join(work_dir, 'survey.xlsx')
+        if not os.path.exists(path):
+            write_survey_workbook(path, df=raw)
+        with _TemporarySnapshotDir(os.path.join(work_dir, 'snapshots')):
+            survey_data.load_survey_sheet(path, version='benchmark')  # 스냅샷 생성
+            runs, _ = _time_call(lambda: survey_data.load_survey_sheet(path, version='benchmark'), repeat)
+        return runs, len(raw)
+
+    def mapping():
+        runs, df = _time_call(lambda: build_prepared_dataset(state['raw']), repeat)
+        state['df'] = df
+        return runs, len(raw)
+
+    def filter_index():
+        runs, index = _time_call(lambda: FilterIndex(state['df']), repeat)
+        state['index'] = index
+        return runs, len(state['df'])
+
+    def filtering():
+        index, df = state['index'], state['df']
+
+        def select():
+            base_bits, view_bits = _sidebar_selection(index)
+            return index.take(df, base_bits), index.take(df, view_bits)
+
+        runs, (base_df, view_df) = _time_call(select, repeat)
+        state['base_df'], state['view_df'] = base_df, view_df
+        return runs, len(df)
+
+    def aggregations():
+        def aggregate():
+            cube = build_count_cube(state['base_df'])
+            _analysis_tab_aggregations(cube)
+        runs, _ = _time_call(aggregate, repeat)
+        return runs, len(state['base_df'])
+
+    def report_model():
+        runs, model = _time_call(lambda: ReportModel(state['view_df']), repeat)
+        state['model'] = model
+        return runs, len(state['view_df'])
+
+    def lead_scoring():
+        runs, _ = _time_call(lambda: apply_lead_scoring(state['view_df']), repeat)
+        return runs, len(state['view_df'])
+
+    def rfie():
+        runs, _ = _time_call(lambda: calculate_rfie_scores(state['view_df']), repeat)
+        return runs, len(state['view_df'])
+
+    def excel():
+        def render():
+            generator = ExcelReportGenerator(state['view_df'], model=state.get('model'))
+            data = generator.create_report("전체").getvalue()
+            if generator.errors:
+                raise RuntimeError("; ".join(generator.errors))
+            return data
+        runs, _ = _time_call(render, repeat)
+        return runs, len(state['view_df'])
+
+    def pdf():
+        def render():
+            return generate_pdf_report(state['view_df'], raise_errors=True, model=state.get('model')).getvalue()
+        runs, _ = _time_call(render, repeat)
+        return runs, len(state['view_df'])
+
+    steps = {
+        'load_xlsx': load_xlsx, 'load_snapshot': load_snapshot, 'mapping': mapping,
+        'filter_index': filter_index, 'filtering': filtering, 'aggregations': aggregations,
+        'report_model': report_model, 'lead_scoring': lead_scoring, 'rfie': rfie,
+        'excel': excel, 'pdf': pdf,
+    }
+    # 뒤 단계가 쓰는 입력은 건너뛰더라도 만들어 둠
+    required = {'mapping', 'filter_index', 'filtering'}
+
+    try:
+        for stage in STAGES:
+            if stage in skip and stage not in required:
+                continue
+            if stage.startswith('load_') and len(raw) > MAX_WORKBOOK_ROWS:
+                result = {'error': "엑셀 시트 한 장의 최대 행 수를 넘습니다."}
+            else:
+                try:
+                    runs, rows = steps[stage]()
+                    result = {'seconds': min(runs), 'runs': runs, 'rows': rows}
+                except Exception as e:
+                    result = {'error': f"{type(e).__name__}: {e}"}
+            if stage in skip:
+                continue
+            results[stage] = result
+            if progress is not None:
+                progress(stage, result)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+# ------------------------------------------
+# 결과 저장 / 비교
+# ------------------------------------------
+
+def git_commit():
+    """현재 커밋 해시 (git 저장소가 아니면 None)"""
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+            capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if output.returncode != 0:
+        return None
+    return output.stdout.strip() or None
+
+
+def environment_info():
+    """결과 비교에 필요한 실행 환경 정보"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def run_benchmarks(rows=None, repeat=DEFAULT_REPEAT, skip=(), seed=0, label=None, progress=None):
+    """
+    여러 규모에서 측정하고 JSON으로 저장할 결과 생성
+
+    Args:
+        rows: 합성 원본 행 수 목록 (기본값: DEFAULT_ROWS)
+        repeat / skip / seed: run_size() 인자
+        label: 결과에 붙일 이름 (예: 브랜치 이름)
+        progress: progress(행 수, 단계 이름, 결과 dict)
+
+    Returns:
+        dict: {'schema', 'created', 'commit', 'label', 'environment', 'options', 'results'}
+              results는 {행 수(문자열): {단계: 결과}}
+    """
+    rows = list(rows or DEFAULT_ROWS)
+    results = {}
+    for n_rows in rows:
+        stage_progress = None
+        if progress is not None:
+            stage_progress = lambda stage, result, n_rows=n_rows: progress(n_rows, stage, result)
+        results[str(n_rows)] = run_size(n_rows, repeat=repeat, skip=skip, seed=seed, progress=stage_progress)
+
+    return {
+        'schema': BENCHMARK_SCHEMA_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'label': label,
+        'environment': environment_info(),
+        'options': {'rows': rows, 'repeat': repeat, 'seed': seed, 'skip': sorted(skip)},
+        'results': results,
+    }
+
+
+def default_output_path(report):
+    """기본 저장 경로 (.cache/benchmarks/YYYYMMDD_HHMMSS_커밋.json)"""
+    stamp = datetime.fromisoformat(report['created']).strftime('%Y%m%d_%H%M%S')
+    suffix = report['commit'] or 'nogit'
+    return os.path.join(BENCHMARK_DIR, f"{stamp}_{suffix}.json")
+
+
+def save_report(report, path=None):
+    """결과 JSON 저장 후 경로 반환"""
+    path = path or default_output_path(report)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_report(path):
+    """저장한 결과 JSON 읽기"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_reports(baseline, current, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    두 결과의 단계별 시간 비교 (양쪽 모두 측정된 단계만)
+
+    Args:
+        baseline: 기준 결과 (이전 커밋)
+        current: 비교할 결과
+        threshold: current/baseline 비율이 이 값 이상이면 성능 저하
+
+    Returns:
+        list: [{'rows', 'stage', 'baseline', 'current', 'ratio', 'regression'}] (행 수, STAGES 순서)
+    """
+    comparison = []
+    for size in sorted(set(baseline['results']) & set(current['results']), key=int):
+        before, after = baseline['results'][size], current['results'][size]
+        for stage in STAGES:
+            if 'seconds' not in before.get(stage, {}) or 'seconds' not in after.get(stage, {}):
+                continue
+            old, new = before[stage]['seconds'], after[stage]['seconds']
+            ratio = new / old if old > 0 else float('inf')
+            comparison.append({
+                'rows': int(size), 'stage': stage, 'baseline': old, 'current': new,
+                'ratio': ratio, 'regression': ratio >= threshold,
+            })
+    return comparison
+
+
+# ------------------------------------------
+# 명령줄 실행
+# ------------------------------------------
+
+def main(argv=None):
+    """명령줄 실행"""
+    parser = argparse.ArgumentParser(description="합성 데이터로 대시보드 처리 단계별 성능 측정")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help="합성 원본 행 수 (여러 개 가능)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="단계별 반복 횟수 (최소값 기록)")
+    parser.add_argument('--skip', nargs='+', choices=STAGES, default=[], help="건너뛸 단계")
+    parser.add_argument('--seed', type=int, default=0, help="합성 데이터 시드")
+    parser.add_argument('--label', default=None, help="결과에 붙일 이름")
+    parser.add_argument('--output', default=None, help="결과 JSON 경로 (기본: .cache/benchmarks/)")
+    parser.add_argument('--compare', default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="이 비율 이상 느려지면 성능 저하로 표시")
+    args = parser.parse_args(argv)
+
+    def report_stage(n_rows, stage, result):
+        if 'error' in result:
+            print(f"⚠️ {n_rows:>9,}행  {stage:<14} 오류: {result['error']}")
+        else:
+            print(f"✅ {n_rows:>9,}행  {stage:<14} {result['seconds']:8.3f}초")
+
+    report = run_benchmarks(args.rows, repeat=args.repeat, skip=set(args.skip), seed=args.seed,
+                            label=args.label, progress=report_stage)
+    path = save_report(report, args.output)
+    print(f"\n📁 {path}")
+
+    if args.compare:
+        comparison = compare_reports(load_report(args.compare), report, args.threshold)
+        print(f"\n기준: {args.compare}")
+        for row in comparison:
+            mark = "🔺" if row['regression'] else "  "
+            print(f"{mark} {row['rows']:>9,}행  {row['stage']:<14} "
+                  f"{row['baseline']:8.3f}초 → {row['current']:8.3f}초  (x{row['ratio']:.2f})")
+        if any(row['regression'] for row in comparison):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,18 +3,43 @@
 설문조사 데이터와 차트를 포함한 엑셀 파일을 자동으로 생성합니다.
 """
 
+import os
+import shutil
+import tempfile
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.colors as plotly_colors
 from io import BytesIO
 import xlsxwriter
 from datetime import datetime
 
+from report_model import ReportModel, QUESTION_TITLES
+
+# 이 행 수 이상이면 스트리밍 모드 (constant_memory + 임시 파일)로 작성
+STREAMING_ROW_THRESHOLD = 50000
+
+# 원본 데이터 시트를 몇 행씩 잘라 셀 값으로 변환할지 (변환 중 메모리 사용량 상한)
+RAW_DATA_CHUNK_ROWS = 10000
+
+# Grade 값 → (표시 라벨, 서식 키)
+GRADE_LABELS = {1: ('S급', 'grade_s'), 2: ('A급', 'grade_a'), 3: ('B급', 'grade_b')}
+
+# 차트 방식: 'native' = 엑셀 차트 (편집 가능, 별도 패키지 불필요), 'image' = Plotly PNG (kaleido 필요)
+CHART_BACKENDS = ('native', 'image')
+
+# 엑셀 차트 데이터(집계표)를 기록할 시트
+CHART_DATA_SHEET = '차트 데이터'
+
+# 엑셀 차트 색상 (Plotly 차트와 같은 팔레트)
+CHART_PALETTE = px.colors.qualitative.Pastel
+
 
 class ExcelReportGenerator:
     """엑셀 보고서 생성기"""
     
-    def __init__(self, df):
+    def __init__(self, df, streaming=None, chart_backend='native', model=None):
         """
         초기화
         
@@ -22,8 +47,21 @@ class ExcelReportGenerator:
         -----------
         df : pandas.DataFrame
             보고서에 포함될 데이터프레임
+        streaming : bool, optional
+            True면 xlsxwriter constant_memory 모드로 임시 파일에 작성 (행을 쓰는 즉시 디스크로 내보냄)
+            None이면 행 수가 STREAMING_ROW_THRESHOLD 이상일 때 자동 적용
+        chart_backend : str
+            차트 시트 방식 ('native': 집계표를 가리키는 엑셀 차트, 'image': Plotly PNG 이미지)
+        model : ReportModel, optional
+            같은 df로 이미 계산한 보고서 통계 (없으면 여기서 계산)
         """
+        if chart_backend not in CHART_BACKENDS:
+            raise ValueError(f"지원하지 않는 차트 방식입니다: {chart_backend}")
         self.df = df
+        self.model = model if model is not None else ReportModel(df)
+        self.chart_backend = chart_backend
+        self.errors = []  # 보고서 안에 오류 시트로 대신 기록한 오류 (비어 있으면 정상 생성)
+        self.streaming = len(df) >= STREAMING_ROW_THRESHOLD if streaming is None else streaming
         self.output = BytesIO()
         
     def create_report(self, report_type="전체"):
@@ -40,9 +78,15 @@ class ExcelReportGenerator:
         BytesIO
             생성된 엑셀 파일의 바이트 스트림
         """
+        tmp_path = None
         try:
-            # Workbook 생성
-            workbook = xlsxwriter.Workbook(self.output, {'in_memory': True})
+            # Workbook 생성 (스트리밍 모드: 셀을 메모리에 쌓지 않고 임시 파일로 바로 기록)
+            if self.streaming:
+                fd, tmp_path = tempfile.mkstemp(suffix='.xlsx')
+                os.close(fd)
+                workbook = xlsxwriter.Workbook(tmp_path, {'constant_memory': True})
+            else:
+                workbook = xlsxwriter.Workbook(self.output, {'in_memory': True})
             
             # 서식 정의
             formats = self._create_formats(workbook)
@@ -57,6 +101,7 @@ class ExcelReportGenerator:
                     self._add_summary_sheet(workbook, formats)
             except Exception as e:
                 # 데이터 시트 생성 실패 시 에러 시트 생성
+                self.errors.append(str(e))
                 error_sheet = workbook.add_worksheet('오류')
                 error_sheet.write(0, 0, f'데이터 시트 생성 중 오류 발생: {str(e)}')
                 error_sheet.write(1, 0, '원본 데이터를 확인해주세요.')
@@ -69,21 +114,27 @@ class ExcelReportGenerator:
                 except Exception as e:
                     # 차트 생성 실패해도 보고서는 생성
                     # 차트 시트에 오류 메시지 추가
+                    self.errors.append(str(e))
                     try:
                         error_sheet = workbook.add_worksheet('차트_오류')
                         error_sheet.write(0, 0, f'차트 생성 중 오류 발생: {str(e)}')
-                        error_sheet.write(1, 0, 'kaleido 패키지가 설치되어 있는지 확인해주세요.')
-                        error_sheet.write(2, 0, '설치 명령: pip install kaleido')
+                        if self.chart_backend == 'image':
+                            error_sheet.write(1, 0, 'kaleido 패키지가 설치되어 있는지 확인해주세요.')
+                            error_sheet.write(2, 0, '설치 명령: pip install kaleido')
                     except:
                         pass  # 차트 오류 시트 생성도 실패하면 무시
             
             workbook.close()
+            if tmp_path:
+                with open(tmp_path, 'rb') as f:
+                    shutil.copyfileobj(f, self.output)
             self.output.seek(0)
             
             return self.output
             
         except Exception as e:
             # 치명적인 오류 - 새로운 BytesIO로 간단한 에러 메시지 생성
+            self.errors.append(str(e))
             error_output = BytesIO()
             error_workbook = xlsxwriter.Workbook(error_output, {'in_memory': True})
             error_sheet = error_workbook.add_worksheet('오류')
@@ -93,6 +144,9 @@ class ExcelReportGenerator:
             error_workbook.close()
             error_output.seek(0)
             return error_output
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
     def _create_formats(self, workbook):
         """엑셀 서식 정의"""
@@ -155,40 +209,101 @@ class ExcelReportGenerator:
         for col_num, col_name in enumerate(columns):
             worksheet.write(0, col_num, col_name, formats['header'])
         
-        # 데이터 작성
-        for row_num, row_data in enumerate(self.df.itertuples(index=False), start=1):
-            for col_num, value in enumerate(row_data):
-                # 날짜 처리
-                if isinstance(value, pd.Timestamp):
-                    worksheet.write(row_num, col_num, value.strftime('%Y-%m-%d'), formats['cell'])
-                # Grade 열에 조건부 서식
-                elif columns[col_num] == 'Grade':
-                    if value == 1:
-                        worksheet.write(row_num, col_num, 'S급', formats['grade_s'])
-                    elif value == 2:
-                        worksheet.write(row_num, col_num, 'A급', formats['grade_a'])
-                    elif value == 3:
-                        worksheet.write(row_num, col_num, 'B급', formats['grade_b'])
-                    else:
-                        worksheet.write(row_num, col_num, value, formats['cell'])
-                # 숫자 처리
-                elif isinstance(value, (int, float)) and not pd.isna(value):
-                    worksheet.write(row_num, col_num, value, formats['number'])
-                else:
-                    worksheet.write(row_num, col_num, str(value) if not pd.isna(value) else '', formats['cell'])
-        
-        # 열 너비 자동 조정
+        # 열 너비 자동 조정 (constant_memory 모드에서는 행을 쓰기 전에 설정해야 함)
         for col_num, col_name in enumerate(columns):
-            max_len = max(
-                len(str(col_name)),
-                self.df[col_name].astype(str).str.len().max() if len(self.df) > 0 else 0
-            )
+            max_len = max(len(str(col_name)), self._max_text_length(self.df[col_name]))
             worksheet.set_column(col_num, col_num, min(max_len + 2, 30))
         
+        # 데이터 작성 (열 단위로 값/서식을 미리 변환한 뒤 행 순서대로 기록)
+        cell_format = formats['cell']
+        for start in range(0, len(self.df), RAW_DATA_CHUNK_ROWS):
+            chunk = self.df.iloc[start:start + RAW_DATA_CHUNK_ROWS]
+            column_cells = [
+                self._column_cells(worksheet, name, chunk[name], formats) for name in columns
+            ]
+            for i in range(len(chunk)):
+                row_num = start + i + 1
+                for col_num, (values, cell_formats, write) in enumerate(column_cells):
+                    value = values[i]
+                    if value is None:
+                        worksheet.write_blank(row_num, col_num, None, cell_format)
+                    else:
+                        write(row_num, col_num, value, cell_formats[i])
+        
         # 필터 설정
         worksheet.autofilter(0, 0, len(self.df), len(columns) - 1)
         worksheet.freeze_panes(1, 0)
     
+    @staticmethod
+    def _max_text_length(series):
+        """열 값을 문자열로 바꿨을 때의 최대 길이 (범주형은 범주만 확인)"""
+        if len(series) == 0:
+            return 0
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            lengths = [len(str(v)) for v in series.cat.categories]
+            if series.isna().any():
+                lengths.append(len('nan'))
+            return max(lengths, default=0)
+        return series.astype(str).str.len().max()
+
+    @staticmethod
+    def _column_cells(worksheet, name, series, formats):
+        """
+        열 하나를 셀 값 목록으로 변환 (dtype별로 한 번만 판단)
+        
+        Returns:
+        --------
+        tuple
+            (값 목록 - 빈 셀은 None, 셀별 서식 목록, worksheet 쓰기 메서드)
+        """
+        n = len(series)
+        dtype = series.dtype
+        is_na = series.isna().to_numpy()
+
+        # 날짜 → 'YYYY-MM-DD' 문자열
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            values = series.dt.strftime('%Y-%m-%d').tolist()
+            return [None if na else v for v, na in zip(values, is_na)], [formats['cell']] * n, worksheet.write_string
+
+        # Grade 열 → 등급 라벨 + 등급별 서식
+        if name == 'Grade':
+            values, cell_formats = [], []
+            for value, na in zip(series.tolist(), is_na):
+                label, key = GRADE_LABELS.get(value, (value, 'cell')) if not na else (None, 'cell')
+                values.append(label)
+                cell_formats.append(formats[key])
+            return values, cell_formats, worksheet.write
+
+        # 범주형은 범주 값의 종류를 기준으로 판단
+        value_dtype = dtype.categories.dtype if isinstance(dtype, pd.CategoricalDtype) else dtype
+
+        # 숫자 (bool, 정수, 실수, nullable 정수)
+        if pd.api.types.is_numeric_dtype(value_dtype):
+            values = series.to_numpy(dtype=float, na_value=np.nan).tolist()
+            return [None if na else v for v, na in zip(values, is_na)], [formats['number']] * n, worksheet.write_number
+
+        # 문자열/범주형
+        if pd.api.types.is_string_dtype(value_dtype) and not pd.api.types.is_object_dtype(value_dtype):
+            values = series.astype(object).tolist()
+            return [None if na else str(v) for v, na in zip(values, is_na)], [formats['cell']] * n, worksheet.write_string
+
+        # 값 종류가 섞인 object 열 → 값마다 판단
+        values, cell_formats = [], []
+        for value, na in zip(series.tolist(), is_na):
+            if na:
+                values.append(None)
+                cell_formats.append(formats['cell'])
+            elif isinstance(value, pd.Timestamp):
+                values.append(value.strftime('%Y-%m-%d'))
+                cell_formats.append(formats['cell'])
+            elif isinstance(value, (int, float, np.number)):
+                values.append(value)
+                cell_formats.append(formats['number'])
+            else:
+                values.append(str(value))
+                cell_formats.append(formats['cell'])
+        return values, cell_formats, worksheet.write
+    
     def _add_summary_sheet(self, workbook, formats):
         """통계 요약 시트 추가"""
         worksheet = workbook.add_worksheet('통계 요약')
@@ -204,40 +319,28 @@ class ExcelReportGenerator:
         worksheet.write(row, 1, '값', formats['header'])
         row += 1
         
-        total = len(self.df)
+        model = self.model
+        total = model.total
         worksheet.write(row, 0, '총 응답 수', formats['cell'])
         worksheet.write(row, 1, total, formats['number'])
         row += 1
         
-        if 'Q6_Intent' in self.df.columns:
-            avg_intent = self.df['Q6_Intent'].mean()
+        if model.has_intent:
             worksheet.write(row, 0, '평균 분양 의향 점수', formats['cell'])
-            worksheet.write(row, 1, round(avg_intent, 2), formats['number'])
+            worksheet.write(row, 1, round(model.avg_intent, 2) if model.avg_intent is not None else '', formats['number'])
             row += 1
             
-            high_intent = len(self.df[self.df['Q6_Intent'] >= 6])
             worksheet.write(row, 0, 'S급 고객 (6점 이상)', formats['cell'])
-            worksheet.write(row, 1, high_intent, formats['number'])
+            worksheet.write(row, 1, model.s_grade, formats['number'])
             row += 1
             
-            conversion = (high_intent / total * 100) if total > 0 else 0
             worksheet.write(row, 0, 'S급 전환율', formats['cell'])
-            worksheet.write(row, 1, conversion / 100, formats['percent'])
+            worksheet.write(row, 1, model.s_grade_pct / 100, formats['percent'])
             row += 2
         
         # 2. 문항별 응답 분포
-        question_cols = {
-            'Q1_Label': 'Q1. 사업지 인지도',
-            'Q2_Label': 'Q2. 정보 습득 경로',
-            'Q3_Label': 'Q3. 만족 장점',
-            'Q4_Label': 'Q4. 구매 목적',
-            'Q5_Label': 'Q5. 선호 평형',
-            'Q7_Label': 'Q7. 청약 예정',
-            'Q8_Label': 'Q8. 희망 분양가',
-        }
-        
-        for col, title in question_cols.items():
-            if col in self.df.columns:
+        for col, title in QUESTION_TITLES.items():
+            if col in model.answer_counts:
                 row += 1
                 worksheet.merge_range(row, 0, row, 3, title, formats['title'])
                 row += 1
@@ -247,8 +350,7 @@ class ExcelReportGenerator:
                 worksheet.write(row, 2, '비율', formats['header'])
                 row += 1
                 
-                counts = self.df[col].value_counts()
-                for answer, count in counts.items():
+                for answer, count in model.counts(col).items():
                     worksheet.write(row, 0, str(answer), formats['cell'])
                     worksheet.write(row, 1, count, formats['number'])
                     worksheet.write(row, 2, count / total, formats['percent'])
@@ -259,9 +361,14 @@ class ExcelReportGenerator:
         worksheet.set_column(1, 2, 15)
     
     def _add_charts_sheet(self, workbook, formats):
-        """차트 이미지 시트 추가"""
+        """
+        차트 시트 추가 (엑셀 차트 또는 차트 이미지)
+
+        차트를 그리지 못하면 시트에 안내 문구를 남기고 self.errors에도 기록합니다
+        (오류가 있는 보고서는 호출자가 캐시하지 않도록).
+        """
+        worksheet = workbook.add_worksheet('차트')
         try:
-            worksheet = workbook.add_worksheet('차트')
             
             row = 0
             
@@ -273,35 +380,35 @@ class ExcelReportGenerator:
             charts_to_create = []
             
             # Q1 차트
-            if 'Q1_Label' in self.df.columns and not self.df['Q1_Label'].dropna().empty:
+            if self.model.has_answers('Q1_Label'):
                 charts_to_create.append(('Q1_사업지인지도', 'Q1_Label', 'Q1. 사업지 인지도', 'pie'))
             
             # Q2 차트
-            if 'Q2_Label' in self.df.columns and not self.df['Q2_Label'].dropna().empty:
+            if self.model.has_answers('Q2_Label'):
                 charts_to_create.append(('Q2_정보습득경로', 'Q2_Label', 'Q2. 정보 습득 경로', 'bar'))
             
             # Q3 차트
-            if 'Q3_Label' in self.df.columns and not self.df['Q3_Label'].dropna().empty:
+            if self.model.has_answers('Q3_Label'):
                 charts_to_create.append(('Q3_만족장점', 'Q3_Label', 'Q3. 만족 장점', 'bar'))
             
             # Q4 차트
-            if 'Q4_Label' in self.df.columns and not self.df['Q4_Label'].dropna().empty:
+            if self.model.has_answers('Q4_Label'):
                 charts_to_create.append(('Q4_구매목적', 'Q4_Label', 'Q4. 구매 목적', 'bar'))
             
             # Q5 차트
-            if 'Q5_Label' in self.df.columns and not self.df['Q5_Label'].dropna().empty:
+            if self.model.has_answers('Q5_Label'):
                 charts_to_create.append(('Q5_선호평형', 'Q5_Label', 'Q5. 선호 평형', 'pie'))
             
             # Q6 차트
-            if 'Q6_Intent' in self.df.columns and not self.df['Q6_Intent'].dropna().empty:
+            if self.model.has_answers('Q6_Intent'):
                 charts_to_create.append(('Q6_계약의향', 'Q6_Intent', 'Q6. 계약 의향 점수 분포', 'intent'))
 
             # Q7 차트
-            if 'Q7_Label' in self.df.columns and not self.df['Q7_Label'].dropna().empty:
+            if self.model.has_answers('Q7_Label'):
                 charts_to_create.append(('Q7_청약자격', 'Q7_Label', 'Q7. 청약 자격', 'pie'))
                 
             # Q8 차트
-            if 'Q8_Label' in self.df.columns and not self.df['Q8_Label'].dropna().empty:
+            if self.model.has_answers('Q8_Label'):
                 charts_to_create.append(('Q8_희망분양가', 'Q8_Label', 'Q8. 희망 분양가', 'bar'))
             
             # 차트가 하나도 없으면 메시지 표시
@@ -309,22 +416,27 @@ class ExcelReportGenerator:
                 worksheet.write(row, 0, '생성 가능한 차트가 없습니다. 데이터를 확인해주세요.', formats['cell'])
                 return
             
+            if self.chart_backend == 'native':
+                self._insert_native_charts(workbook, worksheet, formats, charts_to_create, row)
+                return
+            
             # 차트 이미지 삽입 (2열 레이아웃)
             col = 0
             successful_charts = 0
             failed_charts = []
+            # 대체 텍스트 셀은 모았다가 행 순서대로 기록 (스트리밍 모드는 지난 행에 쓸 수 없음)
+            text_cells = []
             
-            for chart_info in charts_to_create:
+            for name, column, title, chart_type in charts_to_create:
                 try:
-                    name, column, title, chart_type = chart_info
-                    
                     # 차트 생성
+                    counts = self.model.counts(column)
                     if chart_type == 'pie':
-                        fig = self._create_pie_chart(self.df, column, title)
+                        fig = self._create_pie_chart(counts, title)
                     elif chart_type == 'bar':
-                        fig = self._create_bar_chart(self.df, column, title)
+                        fig = self._create_bar_chart(counts, title)
                     elif chart_type == 'intent':
-                        fig = self._create_intent_chart(self.df)
+                        fig = self._create_intent_chart(counts)
                     else:
                         continue
                     
@@ -341,15 +453,15 @@ class ExcelReportGenerator:
                     except Exception as k_err:
                         # 이미지 변환 실패 시 텍스트로 대체 표시
                         failed_charts.append((name, str(k_err)))
-                        worksheet.write(row, col, f'❌ {title} 이미지 변환 실패', formats['cell'])
-                        worksheet.write(row+1, col, f'원인: {str(k_err)}', formats['cell'])
+                        self.errors.append(f'{title} 이미지 변환 실패: {k_err}')
+                        text_cells.append((row, col, f'❌ {title} 이미지 변환 실패'))
+                        text_cells.append((row+1, col, f'원인: {str(k_err)}'))
                         
                         # 텍스트 요약 정보라도 표시
-                        if column in self.df.columns and chart_type != 'intent':
-                            counts = self.df[column].value_counts().head(5)
+                        if chart_type != 'intent':
                             r_offset = 3
-                            for val, cnt in counts.items():
-                                worksheet.write(row+r_offset, col, f"{val}: {cnt}", formats['cell'])
+                            for val, cnt in counts.head(5).items():
+                                text_cells.append((row+r_offset, col, f"{val}: {cnt}"))
                                 r_offset += 1
 
                     # 다음 위치 계산 (2열 레이아웃) -> 간격을 넓힘 (이미지 너비 고려)
@@ -360,12 +472,16 @@ class ExcelReportGenerator:
                         
                 except Exception as e:
                     # 차트 생성 자체 실패
-                    worksheet.write(row, col, f'{title} 데이터 처리 오류', formats['cell'])
+                    self.errors.append(f'{title} 차트 생성 실패: {e}')
+                    text_cells.append((row, col, f'{title} 데이터 처리 오류'))
                     col += 10
                     if col >= 20:
                         col = 0
                         row += 22
             
+            for cell_row, cell_col, text in sorted(text_cells, key=lambda c: (c[0], c[1])):
+                worksheet.write(cell_row, cell_col, text, formats['cell'])
+            
             # 결과 메시지
             result_row = row + 25 if col == 0 else row + 40
             if successful_charts > 0:
@@ -381,13 +497,95 @@ class ExcelReportGenerator:
                     
         except Exception as e:
             # 차트 시트 전체 생성 실패 시
+            self.errors.append(f'차트 시트 생성 중 오류 발생: {e}')
             worksheet.write(0, 0, f'차트 시트 생성 중 오류 발생: {str(e)}', formats['cell'])
             worksheet.write(1, 0, '보고서의 데이터와 통계 요약 시트는 보존되었습니다.', formats['cell'])
 
     
-    def _create_pie_chart(self, df, column, title):
-        """파이 차트 생성"""
-        counts = df[column].value_counts().reset_index()
+    def _insert_native_charts(self, workbook, worksheet, formats, charts_to_create, row):
+        """
+        엑셀 차트 삽입 (이미지 변환 없음)
+        
+        차트별 집계표를 '차트 데이터' 시트에 기록하고, 차트는 그 범위를 가리키므로
+        엑셀에서 데이터/서식을 그대로 편집할 수 있습니다.
+        """
+        data_sheet = workbook.add_worksheet(CHART_DATA_SHEET)
+        data_sheet.set_column(0, 0, 25)
+        data_sheet.set_column(1, 1, 12)
+        data_row = 0
+        
+        col = 0
+        for name, column, title, chart_type in charts_to_create:
+            # 1. 집계표 기록 (제목 / 헤더 / 항목별 건수)
+            counts = self.model.counts(column)
+            
+            data_sheet.write(data_row, 0, title, formats['title'])
+            data_sheet.write(data_row + 1, 0, '응답', formats['header'])
+            data_sheet.write(data_row + 1, 1, '건수', formats['header'])
+            first = data_row + 2
+            for i, (answer, count) in enumerate(counts.items()):
+                answer = f"{answer:g}점" if chart_type == 'intent' else str(answer)
+                data_sheet.write_string(first + i, 0, answer, formats['cell'])
+                data_sheet.write_number(first + i, 1, int(count), formats['number'])
+            last = first + len(counts) - 1
+            data_row = last + 2
+            
+            # 2. 집계표 범위를 가리키는 차트
+            series = {
+                'name': title,
+                'categories': [CHART_DATA_SHEET, first, 0, last, 0],
+                'values': [CHART_DATA_SHEET, first, 1, last, 1],
+            }
+            if chart_type == 'pie':
+                chart = workbook.add_chart({'type': 'doughnut'})
+                chart.set_hole_size(40)
+                series['data_labels'] = {'percentage': True, 'category': True, 'separator': '\n'}
+            else:
+                chart = workbook.add_chart({'type': 'column'})
+                series['data_labels'] = {'value': True}
+                series['gap'] = 80
+                chart.set_legend({'none': True})
+                chart.set_y_axis({'min': 0, 'max': int(counts.max() * 1.2) or 1, 'major_gridlines': {'visible': True}})
+                if chart_type == 'intent':
+                    chart.set_x_axis({'name': '점수'})
+            series['points'] = self._chart_point_colors(chart_type, counts)
+            chart.add_series(series)
+            chart.set_title({'name': title})
+            chart.set_size({'width': 600, 'height': 400})
+            
+            worksheet.insert_chart(row, col, chart)
+            
+            # 다음 위치 계산 (2열 레이아웃, 이미지 차트와 같은 배치)
+            col += 10
+            if col >= 20:
+                col = 0
+                row += 22
+        
+        result_row = row + 25 if col == 0 else row + 40
+        worksheet.write(result_row, 0,
+            f'✅ {len(charts_to_create)}개의 차트가 성공적으로 생성되었습니다. (원본 집계표: {CHART_DATA_SHEET} 시트)',
+            formats['cell'])
+    
+    @staticmethod
+    def _chart_point_colors(chart_type, counts):
+        """항목별 막대/조각 색상 (Plotly 차트와 같은 색 구성)"""
+        if chart_type == 'intent':
+            # 건수가 많을수록 진한 파란색 (Blues 그라데이션)
+            top = counts.max() or 1
+            colors = plotly_colors.sample_colorscale('Blues', [0.25 + 0.75 * c / top for c in counts])
+        else:
+            colors = [CHART_PALETTE[i % len(CHART_PALETTE)] for i in range(len(counts))]
+        return [{'fill': {'color': ExcelReportGenerator._hex_color(c)}} for c in colors]
+    
+    @staticmethod
+    def _hex_color(rgb):
+        """'rgb(r, g, b)' → '#RRGGBB'"""
+        r, g, b = (int(round(float(v))) for v in plotly_colors.unlabel_rgb(rgb))
+        return f'#{r:02X}{g:02X}{b:02X}'
+    
+    def _create_pie_chart(self, counts, title):
+        """파이 차트 생성 (counts: 응답별 건수)"""
+        counts = counts.reset_index()
         counts.columns = ['Answer', 'Count']
         
         # 색상 적용
@@ -411,9 +609,9 @@ class ExcelReportGenerator:
         
         return fig
     
-    def _create_bar_chart(self, df, column, title):
-        """막대 차트 생성"""
-        counts = df[column].value_counts().reset_index()
+    def _create_bar_chart(self, counts, title):
+        """막대 차트 생성 (counts: 응답별 건수)"""
+        counts = counts.reset_index()
         counts.columns = ['Answer', 'Count']
         
         # 최대값 계산 (Y축 범위 설정용)
@@ -446,9 +644,9 @@ class ExcelReportGenerator:
         
         return fig
     
-    def _create_intent_chart(self, df):
-        """계약 의향 점수 차트 생성"""
-        q6_counts = df['Q6_Intent'].value_counts().sort_index().reset_index()
+    def _create_intent_chart(self, counts):
+        """계약 의향 점수 차트 생성 (counts: 점수별 건수)"""
+        q6_counts = counts.reset_index()
         q6_counts.columns = ['Score', 'Count']
         
         # 최대값 계산
@@ -483,7 +681,7 @@ class ExcelReportGenerator:
         return fig
 
 
-def generate_excel_report(df, report_type="전체"):
+def generate_excel_report(df, report_type="전체", model=None):
     """
     엑셀 보고서 생성 헬퍼 함수
     
@@ -493,11 +691,13 @@ def generate_excel_report(df, report_type="전체"):
         보고서에 포함될 데이터
     report_type : str
         보고서 유형 ("전체", "데이터만", "요약만")
+    model : ReportModel, optional
+        같은 df로 이미 계산한 보고서 통계
     
     Returns:
     --------
     BytesIO
         생성된 엑셀 파일
     """
-    generator = ExcelReportGenerator(df)
+    generator = ExcelReportGenerator(df, model=model)
     return generator.create_report(report_type)
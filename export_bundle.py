@@ -0,0 +1,215 @@
+"""
+내보내기 묶음 모듈 (Export Bundle)
+- 엑셀 보고서, PDF 보고서, 원본 데이터 추출(CSV/Parquet)을 동시에 생성해 zip 하나로 묶음
+- 보고서 생성은 순수 파이썬 연산이므로 프로세스 풀에서 병렬 실행 (전체 시간 ≈ 가장 오래 걸리는 파일)
+- 파일이 하나 끝날 때마다 진행 상황을 콜백으로 알림
+"""
+
+import io
+import sys
+import time
+import types
+import zipfile
+import threading
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from report_model import ReportModel
+
+# 원본 데이터 추출 형식
+DATA_FORMATS = ('csv', 'parquet')
+
+# 동시에 만드는 파일 수 (엑셀 / PDF / 데이터)
+DEFAULT_MAX_WORKERS = 3
+
+# 이미 압축된 형식은 zip 안에서 다시 압축하지 않음
+_STORED_EXTENSIONS = ('.xlsx', '.parquet')
+
+# 생성 결과: zip bytes, 묶은 파일 이름 목록, 오류 목록, 파일별 생성 시간(초), 전체 시간(초)
+ExportBundle = namedtuple('ExportBundle', ['data', 'files', 'errors', 'timings', 'elapsed'])
+
+
+# ------------------------------------------
+# 파일별 생성 함수 (프로세스 풀에서 실행되므로 모듈 최상위에 둠)
+# ------------------------------------------
+
+def _render_excel(df, report_type, model):
+    from excel_report_generator import ExcelReportGenerator
+
+    generator = ExcelReportGenerator(df, model=model)
+    data = generator.create_report(report_type).getvalue()
+    return data, generator.errors
+
+
+def _render_pdf(df, ai_insight, lead_summary, rfie_summary, model):
+    from pdf_report_generator import generate_pdf_report
+
+    data = generate_pdf_report(
+        df, ai_insight=ai_insight, lead_summary=lead_summary, rfie_summary=rfie_summary,
+        raise_errors=True, model=model,
+    ).getvalue()
+    return data, []
+
+
+def _render_data(df, data_format):
+    buffer = io.BytesIO()
+    if data_format == 'parquet':
+        df.to_parquet(buffer, index=False)
+    else:
+        # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+        buffer.write(df.to_csv(index=False).encode('utf-8-sig'))
+    return buffer.getvalue(), []
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    data, errors = func(*args)
+    return data, errors, time.perf_counter() - start
+
+
+# ------------------------------------------
+# 프로세스 풀
+# ------------------------------------------
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def _warm_worker():
+    """보고서 모듈을 미리 불러옴 (어느 프로세스가 어떤 파일을 맡아도 첫 생성이 느리지 않도록)"""
+    import excel_report_generator  # noqa: F401
+    import pdf_report_generator  # noqa: F401
+
+
+def _start_workers(pool, count):
+    """
+    작업 프로세스를 count개 모두 띄움
+
+    Streamlit은 실행 중인 대시보드 스크립트를 __main__으로 등록하는데, spawn 방식 작업 프로세스는
+    시작할 때 __main__ 파일을 다시 실행합니다. 프로세스를 띄우는 동안만 __main__을 빈 모듈로
+    바꿔 대시보드 스크립트가 작업 프로세스에서 실행되지 않게 합니다.
+    (ProcessPoolExecutor는 작업을 제출할 때 유휴 프로세스가 없으면 하나씩 새로 띄움)
+    """
+    main = sys.modules['__main__']
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        warmups = [pool.submit(_warm_worker) for _ in range(count)]
+    finally:
+        sys.modules['__main__'] = main
+    for future in warmups:
+        future.result()
+
+
+def get_export_pool():
+    """
+    프로세스 공용 내보내기 풀 반환 (한 번 띄운 작업 프로세스를 계속 재사용)
+
+    스레드가 많은 Streamlit 서버에서도 안전하도록 spawn 방식으로 작업 프로세스를 만듭니다.
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=DEFAULT_MAX_WORKERS, mp_context=multiprocessing.get_context('spawn')
+            )
+            try:
+                _start_workers(pool, DEFAULT_MAX_WORKERS)
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            _shared_pool = pool
+        return _shared_pool
+
+
+def _discard_pool(pool):
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is pool:
+            _shared_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ------------------------------------------
+# 묶음 생성
+# ------------------------------------------
+
+def build_export_bundle(df, model=None, ai_insight=None, lead_summary=None, rfie_summary=None,
+                        report_type="전체", data_format='csv', progress=None, executor=None,
+                        stamp=None):
+    """
+    엑셀 + PDF + 데이터 추출 파일을 동시에 만들어 zip으로 묶음
+
+    Args:
+        df: 필터가 적용된 분석용 데이터셋
+        model: 같은 df로 이미 계산한 ReportModel (없으면 한 번 계산해 모든 파일이 공유)
+        ai_insight / lead_summary / rfie_summary: PDF 보고서에 넣을 내용
+        report_type: 엑셀 보고서 유형 ("전체", "데이터만")
+        data_format: 데이터 추출 형식 ('csv' 또는 'parquet')
+        progress: 파일 하나가 끝날 때마다 progress(완료 수, 전체 수, 파일 이름) 호출
+        executor: 작업을 실행할 Executor (없으면 get_export_pool(), 프로세스 풀을 쓸 수 없으면 스레드)
+        stamp: 파일 이름에 붙일 시각 문자열 (없으면 현재 시각)
+
+    Returns:
+        ExportBundle
+    """
+    if data_format not in DATA_FORMATS:
+        raise ValueError(f"지원하지 않는 데이터 형식입니다: {data_format}")
+    if model is None:
+        model = ReportModel(df)
+    stamp = stamp or datetime.now().strftime('%Y%m%d_%H%M')
+
+    tasks = [
+        (f"PreSales_Report_{stamp}.xlsx", _render_excel, (df, report_type, model)),
+        (f"사전영업_종합보고서_{stamp}.pdf", _render_pdf, (df, ai_insight, lead_summary, rfie_summary, model)),
+        (f"PreSales_Data_{stamp}.{data_format}", _render_data, (df, data_format)),
+    ]
+
+    start = time.perf_counter()
+    if executor is not None:
+        results = _run_tasks(executor, tasks, progress)
+    else:
+        pool = None
+        try:
+            pool = get_export_pool()
+            results = _run_tasks(pool, tasks, progress)
+        except (BrokenProcessPool, OSError):
+            # 작업 프로세스를 띄울 수 없는 환경 → 스레드로 다시 생성
+            if pool is not None:
+                _discard_pool(pool)
+            with ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix='export') as threads:
+                results = _run_tasks(threads, tasks, progress)
+
+    files, errors, timings = [], [], {}
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, _, _ in tasks:  # zip 안의 파일 순서는 완료 순서와 무관하게 고정
+            data, file_errors, seconds = results[name]
+            timings[name] = seconds
+            errors.extend(f"{name}: {e}" for e in file_errors)
+            if data is None:
+                continue
+            compress = zipfile.ZIP_STORED if name.endswith(_STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+            archive.writestr(name, data, compress_type=compress)
+            files.append(name)
+
+    return ExportBundle(buffer.getvalue(), files, errors, timings, time.perf_counter() - start)
+
+
+def _run_tasks(executor, tasks, progress):
+    """작업을 모두 제출하고 끝나는 순서대로 결과 수집 (실패한 파일은 data=None)"""
+    futures = {executor.submit(_timed, func, *args): name for name, func, args in tasks}
+    results = {}
+    for future in as_completed(futures):
+        name = futures[future]
+        try:
+            results[name] = future.result()
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            results[name] = (None, [str(e)], 0.0)
+        if progress is not None:
+            progress(len(results), len(tasks), name)
+    return results
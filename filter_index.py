@@ -0,0 +1,151 @@
+"""
+필터 인덱스 모듈 (Filter Index)
+- 범주형 필터(거점, 담당자, 거주지)별 값 비트맵
+- 접수일자 정렬 인덱스 (searchsorted 기반 기간 검색)
+- 필터 조합을 비트 AND로 계산하여 중간 DataFrame 없이 행 선택
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# 사이드바에서 다중 선택으로 거르는 컬럼
+FILTER_DIMENSIONS = ['Spot', 'Manager', 'Addr_City', 'Addr_Gu']
+
+
+class FilterIndex:
+    """데이터셋 버전별로 한 번 만드는 필터 인덱스"""
+
+    def __init__(self, df, dimensions=None, date_column='Date'):
+        """
+        초기화
+
+        Args:
+            df: build_prepared_dataset() 결과 (행 순서가 인덱스의 기준)
+            dimensions: 비트맵을 만들 컬럼 목록 (기본값: FILTER_DIMENSIONS)
+            date_column: 기간 필터에 쓰는 날짜 컬럼
+        """
+        self.n_rows = len(df)
+        self._codes = {}
+        self._values = {}
+        self._bitmaps = {}
+
+        for dim in (dimensions or FILTER_DIMENSIONS):
+            if dim not in df.columns:
+                continue
+            # 결측값은 -1 → 어떤 비트맵에도 포함되지 않음 (선택 불가)
+            codes, uniques = pd.factorize(df[dim])
+            self._codes[dim] = codes
+            self._values[dim] = list(uniques)
+            self._bitmaps[dim] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(uniques)
+            }
+
+        self._date_order = None
+        self._sorted_dates = None
+        if date_column in df.columns:
+            dates = df[date_column].to_numpy(dtype='datetime64[ns]')
+            valid = np.flatnonzero(~np.isnat(dates))
+            order = valid[np.argsort(dates[valid], kind='stable')]
+            self._date_order = order
+            self._sorted_dates = dates[order]
+
+    # ------------------------------------------
+    # 비트맵 생성
+    # ------------------------------------------
+
+    def has(self, dim):
+        """해당 컬럼의 비트맵이 있는지 여부"""
+        return dim in self._bitmaps
+
+    def has_dates(self):
+        """유효한 날짜가 하나 이상 있는지 여부"""
+        return self._sorted_dates is not None and len(self._sorted_dates) > 0
+
+    def date_bounds(self):
+        """유효한 날짜의 (최소, 최대) Timestamp"""
+        return pd.Timestamp(self._sorted_dates[0]), pd.Timestamp(self._sorted_dates[-1])
+
+    def select_dates(self, start, end):
+        """start <= 날짜 <= end 인 행의 비트맵 (날짜 없는 행 제외)"""
+        lo = np.searchsorted(self._sorted_dates, np.datetime64(pd.Timestamp(start), 'ns'), side='left')
+        hi = np.searchsorted(self._sorted_dates, np.datetime64(pd.Timestamp(end), 'ns'), side='right')
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self._date_order[lo:hi]] = True
+        return np.packbits(mask)
+
+    def select_values(self, dim, values):
+        """선택한 값 중 하나에 해당하는 행의 비트맵 (값 비트맵의 OR)"""
+        bitmaps = self._bitmaps[dim]
+        result = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            bitmap = bitmaps.get(value)
+            if bitmap is not None:
+                np.bitwise_or(result, bitmap, out=result)
+        return result
+
+    @staticmethod
+    def combine(*bitmaps):
+        """
+        비트맵 AND 결합
+
+        None은 '전체 선택'을 뜻하며 결합에서 제외됩니다.
+        모두 None이면 None을 반환합니다.
+        """
+        result = None
+        for bitmap in bitmaps:
+            if bitmap is None:
+                continue
+            result = bitmap.copy() if result is None else np.bitwise_and(result, bitmap, out=result)
+        return result
+
+    @staticmethod
+    def selection_key(bitmap):
+        """비트맵을 캐시 키로 쓰기 위한 짧은 문자열 (None이면 'all')"""
+        if bitmap is None:
+            return 'all'
+        return hashlib.sha1(bitmap.tobytes()).hexdigest()
+
+    # ------------------------------------------
+    # 비트맵 → 행 선택
+    # ------------------------------------------
+
+    def positions(self, bitmap):
+        """비트맵에 해당하는 행 위치 (None이면 전체)"""
+        if bitmap is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.n_rows))
+
+    def count(self, bitmap):
+        """비트맵에 해당하는 행 수"""
+        if bitmap is None:
+            return self.n_rows
+        return int(np.unpackbits(bitmap, count=self.n_rows).sum())
+
+    def take(self, df, bitmap):
+        """
+        비트맵에 해당하는 행만 담은 DataFrame
+
+        전체 선택(None)이면 복사 없이 원본을 그대로 반환하므로
+        반환값을 수정하지 마세요.
+        """
+        if bitmap is None:
+            return df
+        return df.take(self.positions(bitmap))
+
+    def options(self, dim, bitmap=None):
+        """
+        비트맵 범위 안에 존재하는 값 목록 (등장 순서)
+
+        사이드바 선택지를 현재 필터 결과에 맞춰 보여줄 때 사용합니다.
+        """
+        codes = self._codes[dim]
+        if bitmap is not None:
+            codes = codes[np.unpackbits(bitmap, count=self.n_rows).astype(bool)]
+        present, first_seen = np.unique(codes, return_index=True)
+        keep = present >= 0
+        present = present[keep][np.argsort(first_seen[keep], kind='stable')]
+        values = self._values[dim]
+        return [values[code] for code in present]
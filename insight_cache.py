@@ -0,0 +1,125 @@
+"""
+AI 인사이트 캐시 모듈 (Insight Cache)
+- 프롬프트 + 모델명 해시를 키로 생성 결과를 디스크에 저장
+- TTL 경과 항목은 무시, 항목 수 초과 시 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 같은 필터 상태로 다시 분석하면 API 호출 없이 즉시 반환
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+from survey_data import CACHE_DIR
+
+INSIGHT_CACHE_DIR = os.path.join(CACHE_DIR, 'insights')
+
+# 기본 보관 기간 (초) / 최대 보관 항목 수
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 64
+
+
+def insight_cache_key(prompt, model):
+    """프롬프트와 모델명으로 캐시 키(sha256) 생성"""
+    digest = hashlib.sha256()
+    digest.update(model.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(prompt.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class InsightCache:
+    """디스크 기반 인사이트 캐시 (항목당 JSON 파일 1개)"""
+
+    def __init__(self, cache_dir=INSIGHT_CACHE_DIR, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        """
+        초기화
+
+        Args:
+            cache_dir: 캐시 파일 저장 폴더
+            ttl_seconds: 생성 후 유효 기간 (초, None이면 만료 없음)
+            max_entries: 최대 보관 항목 수
+            clock: 생성 시각/만료 판단에 쓰는 현재 시각 함수 (초)
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        캐시된 인사이트 반환 (없거나 만료되면 None)
+
+        조회에 성공하면 파일 수정시각을 갱신해 LRU 순서를 앞당깁니다.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.ttl_seconds is not None and self._clock() - entry.get('created_at', 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get('text')
+
+    def put(self, key, text, model=None):
+        """인사이트 저장 후 보관 한도를 넘는 오래된 항목 삭제"""
+        entry = {'created_at': self._clock(), 'model': model, 'text': text}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            return  # 캐시 기록 실패는 무시 (다음 분석 때 다시 호출)
+        self._evict()
+
+    def clear(self):
+        """모든 캐시 항목 삭제"""
+        for path in self._entries():
+            self._remove(path)
+
+    def _entries(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        return [os.path.join(self.cache_dir, n) for n in names if n.endswith('.json')]
+
+    def _evict(self):
+        entries = []
+        for path in self._entries():
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# 프로세스 공용 캐시
+insight_cache = InsightCache()
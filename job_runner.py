@@ -0,0 +1,229 @@
+"""
+백그라운드 작업 모듈 (Job Runner)
+- 오래 걸리는 작업(AI 분석 등)을 스레드 풀에서 실행하고 작업 ID로 상태 조회
+- 스트리밍 작업은 진행 중 받은 텍스트를 바로 조회 가능
+- 끝난 작업의 결과는 디스크에 저장 → 새로고침/재접속 후에도 작업 ID로 결과 확인
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from survey_data import CACHE_DIR
+
+JOB_STORE_DIR = os.path.join(CACHE_DIR, 'jobs')
+
+# 동시에 실행할 작업 수 / 디스크에 보관할 완료 작업 수
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_STORED_JOBS = 100
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Job:
+    """작업 하나의 상태 (조회용 스냅샷은 Job.to_dict())"""
+
+    def __init__(self, job_id, name=''):
+        self.id = job_id
+        self.name = name
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._chunks = []
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    @property
+    def partial(self):
+        """스트리밍 작업에서 지금까지 받은 텍스트"""
+        return ''.join(self._chunks)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls(data['id'], data.get('name', ''))
+        job.status = data.get('status', FAILED)
+        job.result = data.get('result')
+        job.error = data.get('error')
+        job.created_at = data.get('created_at')
+        job.started_at = data.get('started_at')
+        job.finished_at = data.get('finished_at')
+        return job
+
+
+class JobRunner:
+    """스레드 풀 기반 작업 실행기 (프로세스 공용으로 하나만 사용)"""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, store_dir=JOB_STORE_DIR,
+                 max_stored_jobs=DEFAULT_MAX_STORED_JOBS):
+        """
+        초기화
+
+        Args:
+            max_workers: 동시에 실행할 작업 수
+            store_dir: 완료된 작업 결과를 저장할 폴더
+            max_stored_jobs: 디스크/메모리에 보관할 완료 작업 수 (오래된 것부터 삭제)
+        """
+        self.store_dir = store_dir
+        self.max_stored_jobs = max_stored_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------
+    # 작업 등록
+    # ------------------------------------------
+
+    def submit(self, func, *args, name='', **kwargs):
+        """
+        func(*args, **kwargs)를 백그라운드에서 실행
+
+        Returns:
+            str: 작업 ID (get()으로 상태/결과 조회)
+        """
+        return self._start(name, lambda job: func(*args, **kwargs))
+
+    def submit_stream(self, func, *args, name='', **kwargs):
+        """
+        텍스트 조각을 yield하는 func를 백그라운드에서 끝까지 소비
+
+        진행 중에는 Job.partial로 받은 텍스트를, 끝나면 이어 붙인 전체 텍스트를 result로 제공합니다.
+
+        Returns:
+            str: 작업 ID
+        """
+        def consume(job):
+            for chunk in func(*args, **kwargs):
+                job._chunks.append(chunk)
+            return job.partial
+        return self._start(name, consume)
+
+    def _start(self, name, body):
+        job = Job(uuid.uuid4().hex, name)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, body)
+        return job.id
+
+    def _run(self, job, body):
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            job.result = body(job)
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            self._persist(job)
+            self._forget_old_jobs()
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+
+    def get(self, job_id):
+        """
+        작업 상태 조회 (메모리 → 디스크 순)
+
+        Returns:
+            Job 또는 None (모르는 작업 ID)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        return self._load(job_id)
+
+    # ------------------------------------------
+    # 결과 저장
+    # ------------------------------------------
+
+    def _path(self, job_id):
+        return os.path.join(self.store_dir, f"{job_id}.json")
+
+    def _persist(self, job):
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            path = self._path(job.id)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(job.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            return  # 저장 실패 시 메모리 결과만 사용
+        self._prune_store()
+
+    def _load(self, job_id):
+        # 작업 ID는 uuid hex만 허용 (경로 조작 방지)
+        if not job_id or not all(c in '0123456789abcdef' for c in job_id):
+            return None
+        try:
+            with open(self._path(job_id), 'r', encoding='utf-8') as f:
+                return Job.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _prune_store(self):
+        try:
+            names = [n for n in os.listdir(self.store_dir) if n.endswith('.json')]
+        except OSError:
+            return
+        if len(names) <= self.max_stored_jobs:
+            return
+        paths = sorted(
+            (os.path.join(self.store_dir, n) for n in names),
+            key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0,
+        )
+        for path in paths[:len(paths) - self.max_stored_jobs]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _forget_old_jobs(self):
+        """메모리에는 최근 완료 작업만 유지 (나머지는 디스크에서 조회)"""
+        with self._lock:
+            finished = [j for j in self._jobs.values() if j.finished]
+            if len(finished) <= self.max_stored_jobs:
+                return
+            finished.sort(key=lambda j: j.finished_at)
+            for job in finished[:len(finished) - self.max_stored_jobs]:
+                del self._jobs[job.id]
+
+
+_shared_runner = None
+_shared_lock = threading.Lock()
+
+
+def get_job_runner():
+    """프로세스 공용 JobRunner 반환 (모든 세션이 같은 작업 풀/저장소 사용)"""
+    global _shared_runner
+    with _shared_lock:
+        if _shared_runner is None:
+            _shared_runner = JobRunner()
+        return _shared_runner
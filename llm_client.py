@@ -0,0 +1,302 @@
+"""
+LLM 클라이언트 모듈 (Resilient LLM Client)
+- 프로세스 전체에서 재사용하는 Gemini 클라이언트 (HTTP 연결 재사용)
+- 요청별 타임아웃 + 전체 마감 시간(deadline)
+- 동시 호출 수 제한 (세마포어)
+- 지터를 섞은 지수 백오프 재시도
+- 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 호출 차단
+"""
+
+import time
+import random
+import hashlib
+import threading
+
+import httpx
+from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# 요청 1회 타임아웃 / 재시도 포함 전체 마감 시간 (초)
+DEFAULT_REQUEST_TIMEOUT = 60
+DEFAULT_DEADLINE = 120
+
+# 동시에 진행할 수 있는 API 호출 수
+DEFAULT_MAX_CONCURRENCY = 4
+
+# 재시도 횟수와 백오프 (초)
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 8.0
+
+# 서킷 브레이커: 연속 실패 횟수 / 차단 유지 시간 (초)
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_RESET = 30
+
+# 재시도할 HTTP 상태 코드 (요청 한도 초과, 서버 오류)
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """LLM 호출 실패 (재시도까지 모두 실패한 경우 포함)"""
+
+
+class LLMBusyError(LLMError):
+    """마감 시간 안에 동시 호출 슬롯을 얻지 못함"""
+
+
+class CircuitOpenError(LLMError):
+    """서킷 브레이커가 열려 호출을 차단함"""
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커 (closed → open → half-open → closed)"""
+
+    def __init__(self, failure_threshold=DEFAULT_BREAKER_THRESHOLD, reset_seconds=DEFAULT_BREAKER_RESET,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        """'closed', 'open', 'half-open' 중 하나"""
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return 'closed'
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return 'half-open'
+        return 'open'
+
+    def before_call(self):
+        """
+        호출 전 확인 - 차단 중이면 CircuitOpenError (half-open에서는 시험 호출 1건만 허용)
+
+        Returns:
+            bool: 이 호출이 half-open 시험 호출이면 True (결과 없이 끝나면 release_trial() 필요)
+        """
+        with self._lock:
+            state = self._state()
+            if state == 'open' or (state == 'half-open' and self._trial_in_flight):
+                remaining = max(0, self.reset_seconds - (self._clock() - self._opened_at))
+                raise CircuitOpenError(
+                    f"AI 서비스 응답 실패가 반복되어 호출을 잠시 중단했습니다 ({remaining:.0f}초 후 재시도)"
+                )
+            if state == 'half-open':
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release_trial(self):
+        """결과 없이 끝난 시험 호출(스트림 중단 등) 정리 - half-open 유지, 다음 호출이 다시 시험"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+def is_retryable(error):
+    """일시적인 오류(타임아웃, 연결 실패, 429/5xx)인지 여부"""
+    if isinstance(error, genai_errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError, TimeoutError, ConnectionError))
+
+
+def backoff_delay(attempt, base=DEFAULT_BACKOFF_BASE, maximum=DEFAULT_BACKOFF_MAX, rng=random):
+    """attempt번째 재시도 전 대기 시간 (지수 증가 상한 안에서 full jitter)"""
+    return rng.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+class ResilientLLMClient:
+    """재시도/타임아웃/동시성 제한/서킷 브레이커를 갖춘 Gemini 호출 래퍼"""
+
+    def __init__(self, api_key=None, model=DEFAULT_MODEL, base_url=None, client=None,
+                 request_timeout=DEFAULT_REQUEST_TIMEOUT, deadline=DEFAULT_DEADLINE,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_base=DEFAULT_BACKOFF_BASE, backoff_max=DEFAULT_BACKOFF_MAX,
+                 breaker=None, sleep=time.sleep):
+        """
+        초기화
+
+        Args:
+            api_key: Gemini API Key (client가 없을 때 사용)
+            model: 기본 모델명
+            base_url: API 주소 (테스트용 로컬 서버 등, 없으면 기본 주소)
+            client: genai.Client 호환 객체 (주어지면 그대로 사용)
+            request_timeout: 요청 1회 타임아웃 (초)
+            deadline: 재시도/대기를 포함한 호출 1건의 전체 마감 시간 (초)
+            max_concurrency: 동시에 진행할 수 있는 호출 수
+            max_retries: 일시적 오류 시 재시도 횟수
+            backoff_base, backoff_max: 지수 백오프 기준/상한 (초)
+            breaker: CircuitBreaker (없으면 기본값으로 생성)
+        """
+        if client is None:
+            http_options = genai_types.HttpOptions(
+                base_url=base_url,
+                timeout=int(request_timeout * 1000),
+            )
+            client = genai.Client(api_key=api_key, http_options=http_options)
+        self.client = client
+        self.model = model
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._sleep = sleep
+
+    # ------------------------------------------
+    # 내부 도우미
+    # ------------------------------------------
+
+    def _acquire_slot(self, deadline_at):
+        if not self._slots.acquire(timeout=max(0, deadline_at - time.monotonic())):
+            raise LLMBusyError("AI 요청이 많아 처리 대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.")
+
+    def _wait_before_retry(self, attempt, error, deadline_at):
+        """재시도 가능하면 백오프 후 True, 더 기다릴 수 없으면 False"""
+        if attempt >= self.max_retries or not is_retryable(error):
+            return False
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+        if time.monotonic() + delay >= deadline_at:
+            return False
+        self._sleep(delay)
+        return True
+
+    def _record(self, error, trial):
+        # 요청 자체가 잘못된 경우(4xx 등)는 장애도 정상 응답도 아님 → 실패 횟수를 그대로 두고 시험 호출만 반납
+        if is_retryable(error):
+            self.breaker.record_failure()
+        elif trial:
+            self.breaker.release_trial()
+
+    # ------------------------------------------
+    # 호출
+    # ------------------------------------------
+
+    def generate(self, prompt, model=None):
+        """
+        전체 응답 텍스트 생성
+
+        Raises:
+            LLMError: 재시도까지 실패, 서킷 차단, 동시 호출 대기 초과
+        """
+        deadline_at = time.monotonic() + self.deadline
+        self._acquire_slot(deadline_at)
+        try:
+            attempt = 0
+            while True:
+                trial = self.breaker.before_call()
+                settled = False
+                try:
+                    try:
+                        response = self.client.models.generate_content(
+                            model=model or self.model,
+                            contents=prompt,
+                        )
+                    except Exception as e:
+                        settled = True
+                        self._record(e, trial)
+                        if self._wait_before_retry(attempt, e, deadline_at):
+                            attempt += 1
+                            continue
+                        raise LLMError(str(e)) from e
+                    settled = True
+                    self.breaker.record_success()
+                    return response.text
+                finally:
+                    # KeyboardInterrupt 등으로 결과를 기록하지 못한 시험 호출은 반납
+                    if trial and not settled:
+                        self.breaker.release_trial()
+        finally:
+            self._slots.release()
+
+    def stream(self, prompt, model=None):
+        """
+        응답 텍스트 조각을 도착 순서대로 yield
+
+        첫 조각을 받기 전의 오류만 재시도합니다 (이미 전달한 조각은 되돌릴 수 없음).
+
+        Raises:
+            LLMError: 재시도까지 실패, 서킷 차단, 동시 호출 대기 초과, 스트림 중단
+        """
+        deadline_at = time.monotonic() + self.deadline
+        self._acquire_slot(deadline_at)
+        try:
+            attempt = 0
+            while True:
+                trial = self.breaker.before_call()
+                settled = False
+                received = False
+                try:
+                    try:
+                        for chunk in self.client.models.generate_content_stream(
+                            model=model or self.model,
+                            contents=prompt,
+                        ):
+                            text = chunk.text
+                            if text:
+                                received = True
+                                yield text
+                    except Exception as e:
+                        settled = True
+                        self._record(e, trial)
+                        if not received and self._wait_before_retry(attempt, e, deadline_at):
+                            attempt += 1
+                            continue
+                        raise LLMError(str(e)) from e
+                    settled = True
+                    self.breaker.record_success()
+                    return
+                finally:
+                    # 소비자가 스트림을 중간에 닫은 경우(GeneratorExit, 화면 재실행 등)는
+                    # 성공/실패 어느 쪽도 아님 → 시험 호출만 반납해 다음 호출이 다시 시험
+                    if trial and not settled:
+                        self.breaker.release_trial()
+        finally:
+            self._slots.release()
+
+
+# ============================================
+# 프로세스 공용 클라이언트
+# ============================================
+
+_shared_clients = {}
+_shared_lock = threading.Lock()
+
+
+def get_llm_client(api_key, model=DEFAULT_MODEL, base_url=None, **options):
+    """
+    (API Key, 모델, 주소)별로 하나씩만 만드는 공용 클라이언트 반환
+
+    같은 프로세스의 모든 세션이 HTTP 연결, 동시 호출 슬롯, 서킷 브레이커를 공유합니다.
+    options는 처음 만들 때만 적용됩니다.
+    """
+    key = (hashlib.sha256(api_key.encode('utf-8')).hexdigest(), model, base_url)
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = ResilientLLMClient(api_key=api_key, model=model, base_url=base_url, **options)
+            _shared_clients[key] = client
+        return client
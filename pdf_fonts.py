@@ -0,0 +1,112 @@
+"""
+PDF 폰트 모듈 (PDF Fonts)
+- 한글(CJK) 폰트를 검색 경로에서 찾음 (Windows 맑은 고딕, Linux 나눔/Noto CJK 등)
+- 검색 결과는 프로세스당 한 번만 계산하고 보고서마다 재사용 (폰트 폴더 탐색 생략)
+- 등록은 fpdf2 공개 API(add_font)로만 처리
+"""
+
+import os
+import threading
+from collections import namedtuple
+
+# 추가 폰트 폴더/파일 (os.pathsep 구분, 기본 검색 경로보다 먼저 확인)
+FONT_PATH_ENV = 'PRESALES_FONT_PATH'
+
+# 저장소 안 폰트 폴더 (배포 시 폰트 파일을 함께 둘 수 있는 위치)
+REPO_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+
+# OS별 기본 폰트 폴더
+DEFAULT_FONT_DIRS = [
+    'C:/Windows/Fonts',
+    os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Microsoft', 'Windows', 'Fonts'),
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    os.path.expanduser('~/.fonts'),
+    os.path.expanduser('~/.local/share/fonts'),
+    '/Library/Fonts',
+    '/System/Library/Fonts',
+    os.path.expanduser('~/Library/Fonts'),
+]
+
+# 한글 폰트 후보 (일반, 굵게, 폰트 컬렉션 번호) - 앞의 것을 우선 사용
+KOREAN_FONT_CANDIDATES = [
+    ('malgun.ttf', 'malgunbd.ttf', 0),
+    ('NanumGothic.ttf', 'NanumGothicBold.ttf', 0),
+    ('NanumBarunGothic.ttf', 'NanumBarunGothicBold.ttf', 0),
+    ('NotoSansKR-Regular.ttf', 'NotoSansKR-Bold.ttf', 0),
+    ('NotoSansCJKkr-Regular.otf', 'NotoSansCJKkr-Bold.otf', 0),
+    ('NotoSansCJK-Regular.ttc', 'NotoSansCJK-Bold.ttc', 1),  # 컬렉션 1번 = KR
+    ('AppleSDGothicNeo.ttc', 'AppleSDGothicNeo.ttc', 0),
+    ('UnDotum.ttf', 'UnDotumBold.ttf', 0),
+]
+
+# 찾은 한글 폰트 (bold가 없으면 regular와 같은 파일)
+KoreanFont = namedtuple('KoreanFont', ['regular', 'bold', 'collection_index'])
+
+
+def font_search_path():
+    """폰트 검색 경로 (환경변수 → 저장소 fonts 폴더 → OS 기본 폴더 순)"""
+    extra = [p for p in os.environ.get(FONT_PATH_ENV, '').split(os.pathsep) if p]
+    return extra + [REPO_FONT_DIR] + DEFAULT_FONT_DIRS
+
+
+def _index_font_files(search_path):
+    """검색 경로의 폰트 파일 이름(소문자) → 경로 (앞선 경로 우선)"""
+    found = {}
+    for entry in search_path:
+        if os.path.isfile(entry):
+            found.setdefault(os.path.basename(entry).lower(), entry)
+            continue
+        if not os.path.isdir(entry):
+            continue
+        for root, _, names in os.walk(entry):
+            for name in names:
+                found.setdefault(name.lower(), os.path.join(root, name))
+    return found
+
+
+_resolved = {}
+_resolve_lock = threading.Lock()
+
+
+def find_korean_font(search_path=None):
+    """
+    한글 폰트 검색 (검색 경로별로 결과를 보관해 폴더 탐색은 한 번만)
+
+    Args:
+        search_path: 폰트 폴더/파일 목록 (없으면 font_search_path())
+
+    Returns:
+        KoreanFont 또는 None (한글 폰트 없음)
+    """
+    key = tuple(search_path if search_path is not None else font_search_path())
+    with _resolve_lock:
+        if key in _resolved:
+            return _resolved[key]
+
+    files = _index_font_files(key)
+    result = None
+    for regular, bold, index in KOREAN_FONT_CANDIDATES:
+        regular_path = files.get(regular.lower())
+        if regular_path:
+            result = KoreanFont(regular_path, files.get(bold.lower(), regular_path), index)
+            break
+
+    with _resolve_lock:
+        _resolved[key] = result
+    return result
+
+
+def register_korean_font(pdf, family="Korean", search_path=None):
+    """
+    pdf에 한글 폰트(일반/굵게) 등록
+
+    Returns:
+        str: 등록한 폰트 이름, 한글 폰트를 찾지 못하면 None
+    """
+    font = find_korean_font(search_path)
+    if font is None:
+        return None
+    pdf.add_font(family, "", font.regular, collection_font_number=font.collection_index)
+    pdf.add_font(family, "B", font.bold, collection_font_number=font.collection_index)
+    return family
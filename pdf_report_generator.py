@@ -8,10 +8,18 @@ PDF 보고서 생성 모듈
 import io
 from fpdf import FPDF
 from datetime import datetime
-import pandas as pd
 
-# 한글 폰트 경로 (Windows 기본 폰트)
-FONT_PATH = "C:/Windows/Fonts/malgun.ttf"
+from pdf_fonts import register_korean_font
+from report_model import ReportModel
+
+# 설문 분석 상세에 싣는 문항 (컬럼, 제목, 첫 열 이름, 최대 행 수)
+PDF_QUESTION_TABLES = [
+    ('Q1_Label', "Q1. 사업지 인지도", "응답", 5),
+    ('Q2_Label', "Q2. 정보 습득 경로", "경로", 7),
+    ('Q4_Label', "Q4. 구매 목적", "목적", 5),
+    ('Q5_Label', "Q5. 선호 평형", "평형", 5),
+    ('Q7_Label', "Q7. 청약 자격", "자격", 5),
+]
 
 
 class PDFReport(FPDF):
@@ -19,11 +27,9 @@ class PDFReport(FPDF):
     
     def __init__(self):
         super().__init__()
-        # 한글 폰트 등록
+        # 한글 폰트 등록 (검색 경로에서 찾은 폰트, 검색 결과는 프로세스 공용으로 재사용)
         try:
-            self.add_font("Malgun", "", FONT_PATH, uni=True)
-            self.add_font("Malgun", "B", "C:/Windows/Fonts/malgunbd.ttf", uni=True)
-            self.font_name = "Malgun"
+            self.font_name = register_korean_font(self) or "Helvetica"
         except Exception:
             # 폰트 로드 실패 시 기본 폰트 사용
             self.font_name = "Helvetica"
@@ -84,10 +90,21 @@ class PDFReport(FPDF):
             fill = not fill
 
 
-def generate_pdf_report(df, ai_insight=None, lead_summary=None, rfie_summary=None):
+def generate_pdf_report(df, ai_insight=None, lead_summary=None, rfie_summary=None, raise_errors=False,
+                        model=None, generated_on=None):
     """
     PDF 보고서 생성
+
+    raise_errors=True면 출력 실패 시 오류 안내 PDF 대신 예외를 그대로 올립니다
+    (결과를 캐시하는 호출자가 오류 PDF를 보관하지 않도록).
+    model(ReportModel)이 주어지면 이미 계산한 통계를 그대로 사용합니다.
+    표지의 생성일은 generated_on(date, 없으면 오늘)을 쓰며, 보고서 내용에는 시각을 넣지 않으므로
+    같은 입력과 같은 날짜로 만든 PDF는 캐시해 두고 그날 안에 다시 내려줄 수 있습니다.
     """
+    if generated_on is None:
+        generated_on = datetime.now().date()
+    if model is None:
+        model = ReportModel(df)
     pdf = PDFReport()
     pdf.alias_nb_pages()
     
@@ -106,9 +123,9 @@ def generate_pdf_report(df, ai_insight=None, lead_summary=None, rfie_summary=Non
     pdf.set_font(pdf.font_name, "", 14)
     pdf.set_text_color(100, 100, 100)
     pdf.ln(10)
-    pdf.cell(0, 10, f"분석 기간: {get_date_range(df)}", 0, 1, "C")
-    pdf.cell(0, 10, f"보고서 생성일: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M')}", 0, 1, "C")
-    pdf.cell(0, 10, f"총 응답 수: {len(df):,}명", 0, 1, "C")
+    pdf.cell(0, 10, f"분석 기간: {model.date_range_label()}", 0, 1, "C")
+    pdf.cell(0, 10, f"보고서 생성일: {generated_on.strftime('%Y년 %m월 %d일')}", 0, 1, "C")
+    pdf.cell(0, 10, f"총 응답 수: {model.total:,}명", 0, 1, "C")
     
     pdf.ln(40)
     pdf.set_font(pdf.font_name, "", 10)
@@ -122,7 +139,7 @@ def generate_pdf_report(df, ai_insight=None, lead_summary=None, rfie_summary=Non
     # 주요 지표
     pdf.section_title("주요 지표")
     
-    stats = get_key_stats(df)
+    stats = get_key_stats(df, model)
     
     # 통계표
     summary_table = [
@@ -166,50 +183,15 @@ def generate_pdf_report(df, ai_insight=None, lead_summary=None, rfie_summary=Non
     pdf.add_page()
     pdf.chapter_title("2. 설문 분석 상세")
     
-    # Q1 인지도
-    if 'Q1_Label' in df.columns:
-        pdf.section_title("Q1. 사업지 인지도")
-        q1_data = df['Q1_Label'].value_counts()
-        table_rows = [[label, f"{count}명", f"{count/len(df)*100:.1f}%"] 
-                      for label, count in q1_data.items()]
-        pdf.add_table(["응답", "인원", "비율"], table_rows[:5])
-        pdf.ln(5)
-    
-    # Q2 정보 습득 경로
-    if 'Q2_Label' in df.columns:
-        pdf.section_title("Q2. 정보 습득 경로")
-        q2_data = df['Q2_Label'].value_counts()
-        table_rows = [[label, f"{count}명", f"{count/len(df)*100:.1f}%"] 
-                      for label, count in q2_data.items()]
-        pdf.add_table(["경로", "인원", "비율"], table_rows[:7])
-        pdf.ln(5)
-    
-    # Q4 구매 목적
-    if 'Q4_Label' in df.columns:
-        pdf.section_title("Q4. 구매 목적")
-        q4_data = df['Q4_Label'].value_counts()
-        table_rows = [[label, f"{count}명", f"{count/len(df)*100:.1f}%"] 
-                      for label, count in q4_data.items()]
-        pdf.add_table(["목적", "인원", "비율"], table_rows[:5])
+    for column, title, label, limit in PDF_QUESTION_TABLES:
+        if column not in model.answer_counts:
+            continue
+        pdf.section_title(title)
+        table_rows = [[answer, f"{count}명", f"{pct:.1f}%"]
+                      for answer, count, pct in model.answer_rows(column, limit)]
+        pdf.add_table([label, "인원", "비율"], table_rows)
         pdf.ln(5)
     
-    # Q5 선호 평형
-    if 'Q5_Label' in df.columns:
-        pdf.section_title("Q5. 선호 평형")
-        q5_data = df['Q5_Label'].value_counts()
-        table_rows = [[label, f"{count}명", f"{count/len(df)*100:.1f}%"] 
-                      for label, count in q5_data.items()]
-        pdf.add_table(["평형", "인원", "비율"], table_rows[:5])
-        pdf.ln(5)
-    
-    # Q7 청약 자격
-    if 'Q7_Label' in df.columns:
-        pdf.section_title("Q7. 청약 자격")
-        q7_data = df['Q7_Label'].value_counts()
-        table_rows = [[label, f"{count}명", f"{count/len(df)*100:.1f}%"] 
-                      for label, count in q7_data.items()]
-        pdf.add_table(["자격", "인원", "비율"], table_rows[:5])
-    
     # ========== 3. AI 인사이트 ==========
     if ai_insight and "⚠️" not in ai_insight and "❌" not in ai_insight:
         pdf.add_page()
@@ -247,7 +229,7 @@ def generate_pdf_report(df, ai_insight=None, lead_summary=None, rfie_summary=Non
     pdf.section_title("즉시 실행 가능한 마케팅 전략")
     pdf.ln(2)
     
-    actions = generate_action_items(df, lead_summary, rfie_summary)
+    actions = generate_action_items(df, lead_summary, rfie_summary, model)
     for i, action in enumerate(actions, 1):
         pdf.set_font(pdf.font_name, "B", 10)
         pdf.write(7, f"{i}. ")
@@ -260,6 +242,8 @@ def generate_pdf_report(df, ai_insight=None, lead_summary=None, rfie_summary=Non
         pdf_bytes = pdf.output()
         return io.BytesIO(pdf_bytes)
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"PDF Output Error: {e}")
         error_pdf = FPDF()
         error_pdf.add_page()
@@ -268,37 +252,21 @@ def generate_pdf_report(df, ai_insight=None, lead_summary=None, rfie_summary=Non
         return io.BytesIO(error_pdf.output())
 
 
-def get_date_range(df):
+def get_date_range(df, model=None):
     """데이터의 날짜 범위 반환"""
-    if 'Date' in df.columns:
-        dates = pd.to_datetime(df['Date'], errors='coerce').dropna()
-        if not dates.empty:
-            min_date = dates.min().strftime('%Y.%m.%d')
-            max_date = dates.max().strftime('%Y.%m.%d')
-            return f"{min_date} ~ {max_date}"
-    return "전체 기간"
+    return (model if model is not None else ReportModel(df)).date_range_label()
 
 
-def get_key_stats(df):
-    """핵심 통계 추출"""
-    total = len(df)
-    
-    avg_intent = 0
-    s_grade = 0
-    if 'Q6_Intent' in df.columns:
-        avg_intent = df['Q6_Intent'].mean()
-        s_grade = len(df[df['Q6_Intent'] >= 6])
-    
-    eligible_count = 0
-    if 'Q7_Label' in df.columns:
-        eligible_count = len(df[~df['Q7_Label'].isin(['무응답', '기타'])])
-    
+def get_key_stats(df, model=None):
+    """핵심 통계 추출 (model이 없으면 df로 계산)"""
+    if model is None:
+        model = ReportModel(df)
     return {
-        'total': total,
-        'avg_intent': avg_intent if pd.notna(avg_intent) else 0,
-        's_grade': s_grade,
-        's_grade_pct': s_grade / total * 100 if total > 0 else 0,
-        'eligible_pct': eligible_count / total * 100 if total > 0 else 0,
+        'total': model.total,
+        'avg_intent': model.avg_intent or 0,
+        's_grade': model.s_grade,
+        's_grade_pct': model.s_grade_pct,
+        'eligible_pct': model.eligible_pct,
     }
 
 
@@ -309,8 +277,10 @@ def clean_markdown(text):
     return text
 
 
-def generate_action_items(df, lead_summary=None, rfie_summary=None):
+def generate_action_items(df, lead_summary=None, rfie_summary=None, model=None):
     """권장 액션 아이템 생성"""
+    if model is None:
+        model = ReportModel(df)
     actions = []
     
     actions.append("A급 고객에게 즉시 1:1 전화 상담을 진행하세요.")
@@ -321,18 +291,12 @@ def generate_action_items(df, lead_summary=None, rfie_summary=None):
     if rfie_summary and rfie_summary.get('AtRisk_수', 0) > 0:
         actions.append(f"At Risk 고객 {rfie_summary['AtRisk_수']}명에게 리마인드 메시지를 발송하세요.")
     
-    if 'Q6_Intent' in df.columns:
-        avg_intent = df['Q6_Intent'].mean()
-        if pd.notna(avg_intent) and avg_intent < 5.0:
-            actions.append("평균 의향 점수가 낮습니다. 타겟팅 전략을 재검토하세요.")
+    if model.avg_intent is not None and model.avg_intent < 5.0:
+        actions.append("평균 의향 점수가 낮습니다. 타겟팅 전략을 재검토하세요.")
     
-    if 'Q5_Label' in df.columns:
-        type_counts = df['Q5_Label'].value_counts()
-        if len(type_counts) > 0:
-            top_type = type_counts.index[0]
-            top_pct = type_counts.iloc[0] / len(df) * 100
-            if top_pct >= 50:
-                actions.append(f"'{top_type}' 평형에 수요가 집중되어 있습니다. 해당 평형 재고를 확인하세요.")
+    top_type = model.top_answer('Q5_Label')
+    if top_type is not None and top_type[1] / model.total * 100 >= 50:
+        actions.append(f"'{top_type[0]}' 평형에 수요가 집중되어 있습니다. 해당 평형 재고를 확인하세요.")
     
     actions.append("주간 분석 리포트를 경영진에게 공유하세요.")
     
@@ -0,0 +1,290 @@
+"""
+성능 추적 모듈 (Perf Trace)
+- 대시보드 한 번의 실행(rerun) 동안 단계별 소요 시간 기록 (로딩, 매핑, 필터, 분석 탭, 고급 분석, AI, 보고서)
+- 단계는 with span('이름'): 블록으로 표시하고, 블록 안의 단계는 들여쓰기(depth)로 구분
+- 실행이 끝나면 한 줄짜리 JSON으로 로그 파일에 추가 → 실제 사용 중 느린 구간 파악
+- 추적 중이 아닌 스레드(백그라운드 작업, 보고서 프로세스 등)에서는 span이 아무 일도 하지 않음
+- rerun/st.stop()으로 중간에 끊긴 실행은 다음 실행이 시작될 때 interrupted로 표시해 기록
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from survey_data import CACHE_DIR
+
+PERF_LOG_DIR = os.path.join(CACHE_DIR, 'perf')
+PERF_LOG_PATH = os.path.join(PERF_LOG_DIR, 'dashboard_runs.jsonl')
+
+# PRESALES_PERF_LOG=0 이면 로그 파일을 쓰지 않음 (패널 표시는 계속 가능)
+PERF_LOG_ENABLED = os.environ.get('PRESALES_PERF_LOG', '1') != '0'
+
+# 로그 파일이 이 크기를 넘으면 .1로 옮기고 새 파일 시작 (이전 파일은 하나만 보관)
+DEFAULT_MAX_LOG_BYTES = 5 * 1024 * 1024
+
+# 성능 패널의 "느린 단계" 집계에 쓰는 최근 실행 수 / 표시할 단계 수
+DEFAULT_SUMMARY_RUNS = 200
+DEFAULT_SUMMARY_LIMIT = 10
+
+# 로그에 남기는 시간 단위 (초, 소수점 자리)
+_SECONDS_DIGITS = 6
+
+# 현재 스레드(세션 실행)의 추적
+_current_trace = ContextVar('presales_perf_trace', default=None)
+
+
+class PerfTrace:
+    """한 번의 실행 동안의 단계별 소요 시간"""
+
+    def __init__(self, run_id=None, **meta):
+        """
+        초기화
+
+        Args:
+            run_id: 실행 ID (없으면 새로 생성)
+            **meta: 로그에 함께 남길 값 (세션 ID, 데이터 버전 등)
+        """
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.meta = dict(meta)
+        self.spans = []
+        self.started_at = datetime.now()
+        self.finished = False
+        self.interrupted = False
+        self._start = time.perf_counter()
+        self._depth = 0
+        self._total = None
+
+    @contextmanager
+    def span(self, name, **tags):
+        """블록 실행 시간을 name으로 기록 (블록에서 예외가 나도 기록)"""
+        if self.finished:
+            yield
+            return
+        entry = {'name': name, 'depth': self._depth, 'start': time.perf_counter() - self._start}
+        if tags:
+            entry['tags'] = tags
+        self.spans.append(entry)
+        self._depth += 1
+        try:
+            yield
+        except BaseException as e:
+            entry['error'] = type(e).__name__
+            raise
+        finally:
+            self._depth -= 1
+            entry['seconds'] = time.perf_counter() - self._start - entry['start']
+
+    def record(self, name, seconds, **tags):
+        """다른 곳에서 잰 시간을 그대로 기록 (백그라운드 작업 등)"""
+        if self.finished:
+            return
+        entry = {'name': name, 'depth': self._depth, 'start': time.perf_counter() - self._start,
+                 'seconds': seconds}
+        if tags:
+            entry['tags'] = tags
+        self.spans.append(entry)
+
+    @property
+    def total(self):
+        """실행 시작부터 지금까지 (끝난 추적은 끝날 때까지) 걸린 시간"""
+        if self._total is not None:
+            return self._total
+        return time.perf_counter() - self._start
+
+    def rows(self):
+        """패널 표시용 행 목록 [{'단계', '시간(ms)', '비율(%)'}] (실행 순서, 안쪽 단계는 들여쓰기)"""
+        total = self.total
+        return [
+            {
+                '단계': '　' * s['depth'] + s['name'] + (' ⚠️' if 'error' in s else ''),
+                '시간(ms)': round(s.get('seconds', 0.0) * 1000, 1),
+                '비율(%)': round(s.get('seconds', 0.0) / total * 100, 1) if total > 0 else 0.0,
+            }
+            for s in self.spans
+        ]
+
+    def finish(self, interrupted=False):
+        """
+        추적 종료 (이후의 span/record는 무시)
+
+        interrupted=True면 중간에 끊긴 실행으로 표시하고, 전체 시간은 마지막 단계가 끝난 시각까지로 계산합니다
+        (끊긴 뒤 다음 실행이 시작될 때까지 기다린 시간은 제외).
+        """
+        if not self.finished:
+            if interrupted:
+                ends = [s['start'] + s['seconds'] for s in self.spans if 'seconds' in s]
+                self._total = max(ends, default=0.0)
+                self.interrupted = True
+            else:
+                self._total = time.perf_counter() - self._start
+            self.finished = True
+        return self
+
+    def to_record(self):
+        """로그 한 줄에 쓸 dict"""
+        spans = []
+        for s in self.spans:
+            item = {'name': s['name'], 'depth': s['depth'],
+                    'seconds': round(s.get('seconds', 0.0), _SECONDS_DIGITS)}
+            for key in ('tags', 'error'):
+                if key in s:
+                    item[key] = s[key]
+            spans.append(item)
+        record = {
+            'ts': self.started_at.isoformat(timespec='milliseconds'),
+            'run': self.run_id,
+            **self.meta,
+            'total': round(self.total, _SECONDS_DIGITS),
+            'spans': spans,
+        }
+        if self.interrupted:
+            record['interrupted'] = True
+        return record
+
+
+class PerfLog:
+    """실행 기록을 JSON Lines 파일에 추가 (스레드 안전, 크기 한도 초과 시 교체)"""
+
+    def __init__(self, path=PERF_LOG_PATH, max_bytes=DEFAULT_MAX_LOG_BYTES, enabled=PERF_LOG_ENABLED):
+        """
+        초기화
+
+        Args:
+            path: 로그 파일 경로
+            max_bytes: 파일 크기 한도 (넘으면 path.1로 옮김)
+            enabled: False면 기록하지 않음
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        """기록 한 줄 추가 (기록 실패는 무시 - 대시보드 실행에 영향을 주지 않음)"""
+        if not self.enabled:
+            return False
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                return True
+            except OSError:
+                return False
+
+    def read(self, limit=None):
+        """최근 기록 목록 (오래된 것부터, limit개까지)"""
+        records = []
+        with self._lock:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            continue  # 쓰다 만 줄
+            except OSError:
+                return []
+        return records[-limit:] if limit else records
+
+
+# 프로세스 공용 로그
+perf_log = PerfLog()
+
+
+def summarize_runs(records, limit=DEFAULT_SUMMARY_LIMIT):
+    """
+    여러 실행 기록에서 단계별 평균/최대 시간 집계 (느린 단계 찾기)
+
+    Args:
+        records: PerfLog.read() 결과
+        limit: 평균 시간이 긴 순서로 돌려줄 단계 수
+
+    Returns:
+        list: [{'단계', '실행 수', '평균(ms)', '최대(ms)'}] (평균 시간 내림차순)
+    """
+    stats = {}
+    for record in records:
+        for s in record.get('spans', []):
+            count, total, longest = stats.get(s['name'], (0, 0.0, 0.0))
+            stats[s['name']] = (count + 1, total + s['seconds'], max(longest, s['seconds']))
+    rows = [
+        {'단계': name, '실행 수': count, '평균(ms)': round(total / count * 1000, 1),
+         '최대(ms)': round(longest * 1000, 1)}
+        for name, (count, total, longest) in stats.items()
+    ]
+    return sorted(rows, key=lambda row: row['평균(ms)'], reverse=True)[:limit]
+
+
+# ------------------------------------------
+# 현재 실행의 추적 (모듈 어디서나 span()으로 기록)
+# ------------------------------------------
+
+def start_trace(previous=None, log=None, **meta):
+    """
+    현재 스레드에서 새 추적 시작
+
+    이전 추적(previous, 없으면 현재 스레드의 추적)이 끝나지 않았으면 rerun/st.stop() 등으로 끊긴 실행이므로
+    interrupted로 표시해 로그에 추가합니다.
+
+    Args:
+        previous: 같은 세션의 직전 추적 (다음 실행이 다른 스레드에서 시작될 수 있어 세션 상태로 전달)
+        log: 끊긴 추적을 기록할 PerfLog (없으면 perf_log)
+        **meta: PerfTrace에 전달할 값
+    """
+    previous = previous or _current_trace.get()
+    if previous is not None and not previous.finished:
+        previous.finish(interrupted=True)
+        (log or perf_log).append(previous.to_record())
+    trace = PerfTrace(**meta)
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace():
+    """현재 스레드의 추적 (없으면 None)"""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name, **tags):
+    """현재 추적에 단계 기록 (추적 중이 아니면 그냥 실행)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name, **tags):
+        yield
+
+
+def record(name, seconds, **tags):
+    """현재 추적에 다른 곳에서 잰 시간 기록"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record(name, seconds, **tags)
+
+
+def finish_trace(log=None):
+    """
+    현재 추적을 끝내고 로그에 추가
+
+    Args:
+        log: 기록할 PerfLog (없으면 perf_log)
+
+    Returns:
+        PerfTrace: 끝난 추적 (추적 중이 아니었으면 None)
+    """
+    trace = _current_trace.get()
+    if trace is None or trace.finished:
+        return trace
+    trace.finish()
+    (log or perf_log).append(trace.to_record())
+    return trace
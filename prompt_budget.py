@@ -0,0 +1,168 @@
+"""
+프롬프트 예산 모듈 (Prompt Budget)
+- 토큰 수 로컬 추정 (API 호출/토크나이저 없이 글자 종류로 근사)
+- 공백 없는 JSON 인코딩
+- 주차별 트렌드 점진 요약: 최근 주차는 주 단위, 그 이전은 2주/4주/8주… 구간으로 묶음
+- 예산을 넘으면 단계별로 더 압축 → 분양 기간이 길어져도 프롬프트 크기가 일정
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from week_buckets import get_week_numbers, format_week_range_label
+
+# 인사이트 프롬프트 기본 토큰 예산
+DEFAULT_PROMPT_TOKEN_BUDGET = 2000
+
+# 압축 단계 (앞에서부터 시도, 예산 안에 들어오는 첫 단계 사용)
+#   recent_weeks: 주 단위로 그대로 보여줄 최근 주차 수 (이전 주차는 구간 요약)
+#   segment_details: 리드 등급별 상세 포함 여부
+COMPACTION_LEVELS = (
+    {'recent_weeks': 8, 'segment_details': True},
+    {'recent_weeks': 4, 'segment_details': True},
+    {'recent_weeks': 2, 'segment_details': False},
+    {'recent_weeks': 1, 'segment_details': False},
+)
+
+# 구간별 최다 응답 항목 (컬럼, 키)
+_TOP_ANSWER_FIELDS = [('Q5_Label', '최다_선호평형'), ('Q2_Label', '최다_유입경로')]
+
+
+def estimate_tokens(text):
+    """
+    토큰 수 추정 (보수적 근사)
+
+    영문/숫자/기호(ASCII)는 약 4글자당 1토큰, 한글 등 그 외 문자는 1글자당 1토큰으로 계산합니다.
+    """
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    return -(-ascii_chars // 4) + (len(text) - ascii_chars)
+
+
+def compact_json(data):
+    """들여쓰기/공백 없는 JSON 문자열 (한글은 그대로)"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def plan_week_buckets(weeks, recent_weeks):
+    """
+    주차 구간 계획
+
+    최근 recent_weeks개 주차는 한 주씩, 그 이전은 가까운 쪽부터 2주, 4주, 8주… 길이로 묶습니다.
+    구간 수가 전체 주차 수의 로그에 비례하므로 기간이 길어져도 거의 늘지 않습니다.
+
+    Args:
+        weeks: 데이터가 있는 주차 번호 (오름차순)
+        recent_weeks: 주 단위로 유지할 최근 주차 수 (None이면 전부 주 단위)
+
+    Returns:
+        list: (시작 주차, 끝 주차) 목록 (시간 순, 데이터 있는 구간만)
+    """
+    weeks = [int(w) for w in weeks]
+    if not weeks:
+        return []
+    if recent_weeks is None or len(weeks) <= recent_weeks:
+        return [(w, w) for w in weeks]
+
+    recent = weeks[-recent_weeks:] if recent_weeks > 0 else []
+    older = [(w, w) for w in reversed(recent)]
+
+    end = (recent[0] if recent else weeks[-1] + 1) - 1
+    size = 2
+    present = set(weeks)
+    while end >= weeks[0]:
+        start = max(weeks[0], end - size + 1)
+        if any(w in present for w in range(start, end + 1)):
+            older.append((start, end))
+        end = start - 1
+        size *= 2
+    return older[::-1]
+
+
+def _label_codes(series):
+    """라벨 컬럼 → (정수 코드 배열(-1=결측), 코드 순서의 값 목록)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), list(series.cat.categories)
+    codes, uniques = pd.factorize(series)
+    return codes, list(uniques)
+
+
+def summarize_weeks(df, recent_weeks=None):
+    """
+    주차별(또는 주차 구간별) 트렌드 요약
+
+    recent_weeks=None이면 주차마다 한 행씩 (주 단위) 요약하고,
+    값을 주면 이전 주차를 plan_week_buckets 구간으로 묶어 요약합니다.
+    집계는 구간 번호에 대한 bincount 한 번씩으로 처리합니다.
+
+    Returns:
+        list: 구간별 통계 dict 목록 (시간 순), 날짜가 없으면 None
+    """
+    if 'Date' not in df.columns:
+        return None
+    week_nums, anchor = get_week_numbers(df['Date'])
+    valid = week_nums > 0
+    if not valid.any():
+        return None
+
+    nums = week_nums[valid]
+    buckets = plan_week_buckets(np.unique(nums), recent_weeks)
+    starts = np.array([start for start, _ in buckets])
+    bucket_ids = np.searchsorted(starts, nums, side='right') - 1
+    n_buckets = len(buckets)
+
+    counts = np.bincount(bucket_ids, minlength=n_buckets)
+    rows = [
+        {"주차": format_week_range_label(start, end, anchor), "응답수": int(count)}
+        for (start, end), count in zip(buckets, counts)
+    ]
+
+    if 'Q6_Intent' in df.columns:
+        intent = pd.to_numeric(df['Q6_Intent'], errors='coerce').to_numpy(dtype=float)[valid]
+        answered = ~np.isnan(intent)
+        sums = np.bincount(bucket_ids[answered], weights=intent[answered], minlength=n_buckets)
+        answered_counts = np.bincount(bucket_ids[answered], minlength=n_buckets)
+        s_counts = np.bincount(bucket_ids, weights=intent >= 6, minlength=n_buckets)
+        for i, row in enumerate(rows):
+            mean = sums[i] / answered_counts[i] if answered_counts[i] else None
+            row["평균_의향점수"] = round(float(mean), 2) if mean is not None else None
+            row["S급_비율"] = f"{round(s_counts[i] / counts[i] * 100, 1)}%"
+
+    for col, key in _TOP_ANSWER_FIELDS:
+        if col not in df.columns:
+            continue
+        codes, values = _label_codes(df[col])
+        codes = codes[valid]
+        answered = codes >= 0
+        if not values or not answered.any():
+            continue
+        table = np.bincount(
+            bucket_ids[answered] * len(values) + codes[answered],
+            minlength=n_buckets * len(values),
+        ).reshape(n_buckets, len(values))
+        for row, bucket_counts in zip(rows, table):
+            if bucket_counts.any():
+                row[key] = values[int(bucket_counts.argmax())]
+
+    return rows
+
+
+def fit_to_budget(render, token_budget=DEFAULT_PROMPT_TOKEN_BUDGET, levels=COMPACTION_LEVELS):
+    """
+    압축 단계를 차례로 적용해 예산 안에 들어오는 첫 결과 반환
+
+    Args:
+        render: 압축 단계 dict를 받아 프롬프트 문자열을 만드는 함수
+        token_budget: 토큰 예산 (None이면 첫 단계 그대로)
+        levels: 압축 단계 목록 (덜 압축된 것부터)
+
+    Returns:
+        tuple: (프롬프트, 추정 토큰 수) - 마지막 단계로도 넘치면 마지막 단계 결과
+    """
+    for level in levels:
+        text = render(level)
+        tokens = estimate_tokens(text)
+        if token_budget is None or tokens <= token_budget:
+            break
+    return text, tokens
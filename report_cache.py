@@ -0,0 +1,177 @@
+"""
+보고서 캐시 모듈 (Report Cache)
+- 필터 상태(행 선택 digest) + 데이터셋 버전 + 보고서 유형을 키로 생성된 파일 bytes 보관
+- 메모리 LRU (총 바이트 한도) → 넘치는 항목은 디스크로 내보냄 (디스크도 총 바이트 한도)
+- 같은 화면에서 다시 내려받으면 보고서를 다시 만들지 않고 즉시 반환
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from survey_data import CACHE_DIR
+
+REPORT_CACHE_DIR = os.path.join(CACHE_DIR, 'reports')
+
+# 메모리 / 디스크 보관 한도 (바이트)
+DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 512 * 1024 * 1024
+
+# 보고서 레이아웃이 바뀌면 올려서 이전 캐시를 무효화
+REPORT_FORMAT_VERSION = 1
+
+
+def frame_digest(df):
+    """데이터프레임 내용(인덱스 포함)의 digest (행 선택 digest를 따로 알 수 없을 때 사용)"""
+    hashed = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    digest = hashlib.sha1(hashed.tobytes())
+    digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def report_cache_key(selection_key, dataset_version, report_type, fmt='xlsx'):
+    """
+    보고서 캐시 키(sha256) 생성
+
+    Args:
+        selection_key: 필터된 행 digest (FilterIndex.selection_key 또는 frame_digest)
+        dataset_version: 원본 데이터 버전 (source_fingerprint)
+        report_type: 보고서 유형 ("전체", "데이터만" 등)
+        fmt: 파일 형식 ('xlsx', 'pdf' 등)
+    """
+    parts = [str(REPORT_FORMAT_VERSION), fmt, str(dataset_version), str(selection_key), str(report_type)]
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """메모리 + 디스크 2단 보고서 캐시 (스레드 안전)"""
+
+    def __init__(self, cache_dir=REPORT_CACHE_DIR, max_memory_bytes=DEFAULT_MAX_MEMORY_BYTES,
+                 max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        """
+        초기화
+
+        Args:
+            cache_dir: 메모리에서 밀려난 항목을 저장할 폴더
+            max_memory_bytes: 메모리에 보관할 보고서 총 크기
+            max_disk_bytes: 디스크에 보관할 보고서 총 크기 (0이면 디스크 사용 안 함)
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def get(self, key):
+        """
+        캐시된 보고서 bytes 반환 (없으면 None)
+
+        디스크에서 찾은 항목은 다시 메모리로 올립니다.
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        """보고서 bytes 저장 (메모리 한도를 넘으면 오래된 항목부터 디스크로 내보냄)"""
+        if len(data) > self.max_memory_bytes:
+            self._spill(key, data)
+            return
+        self._remember(key, data)
+
+    def clear(self):
+        """메모리/디스크의 모든 항목 삭제"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        for path in self._disk_entries():
+            self._remove(path)
+
+    # ------------------------------------------
+    # 메모리 → 디스크
+    # ------------------------------------------
+
+    def _remember(self, key, data):
+        spilled = []
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                old_key, old_data = self._memory.popitem(last=False)
+                self._memory_bytes -= len(old_data)
+                spilled.append((old_key, old_data))
+        for old_key, old_data in spilled:
+            self._spill(old_key, old_data)
+
+    def _spill(self, key, data):
+        if self.max_disk_bytes <= 0 or len(data) > self.max_disk_bytes:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return  # 디스크 기록 실패 시 해당 항목은 버림 (다음 요청 때 다시 생성)
+        self._evict_disk()
+
+    def _disk_entries(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        return [os.path.join(self.cache_dir, n) for n in names if n.endswith('.bin')]
+
+    def _evict_disk(self):
+        entries = []
+        for path in self._disk_entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# 프로세스 공용 캐시
+report_cache = ReportCache()
@@ -0,0 +1,143 @@
+"""
+보고서 모델 모듈 (Report Model)
+- 필터 상태별로 한 번만 데이터를 훑어 보고서 공통 통계를 계산
+- 엑셀(통계 요약/차트), PDF(핵심 요약/문항 표/권장 액션), AI 프롬프트(데이터 요약),
+  대시보드 핵심 지표가 같은 결과를 사용
+"""
+
+import pandas as pd
+
+# 보고서에 싣는 문항 (컬럼, 제목)
+QUESTION_TITLES = {
+    'Q1_Label': 'Q1. 사업지 인지도',
+    'Q2_Label': 'Q2. 정보 습득 경로',
+    'Q3_Label': 'Q3. 만족 장점',
+    'Q4_Label': 'Q4. 구매 목적',
+    'Q5_Label': 'Q5. 선호 평형',
+    'Q7_Label': 'Q7. 청약 예정',
+    'Q8_Label': 'Q8. 희망 분양가',
+}
+
+# S급 기준 의향 점수 (Q6 6점 이상)
+S_GRADE_MIN_INTENT = 6
+
+# 청약 자격이 없는 것으로 보는 Q7 응답
+INELIGIBLE_LABELS = ('무응답', '기타')
+
+# AI 프롬프트 데이터 요약에 넣는 최다 응답 (컬럼, 키 이름)
+PROMPT_TOP_ANSWERS = [('Q1_Label', '인지도'), ('Q2_Label', '정보습득경로'), ('Q4_Label', '구매목적'), ('Q5_Label', '선호평형')]
+
+
+class ReportModel:
+    """필터가 적용된 데이터셋 하나의 보고서 공통 통계 (읽기 전용으로 공유)"""
+
+    def __init__(self, df):
+        """
+        초기화 (모든 통계를 한 번에 계산)
+
+        Args:
+            df: 필터가 적용된 분석용 데이터셋
+        """
+        self.total = len(df)
+
+        # Q6 계약 의향
+        self.has_intent = 'Q6_Intent' in df.columns
+        self.avg_intent = None
+        self.s_grade = 0
+        self.intent_counts = pd.Series(dtype='int64')
+        if self.has_intent:
+            intent = df['Q6_Intent']
+            mean = intent.mean()
+            self.avg_intent = float(mean) if pd.notna(mean) else None
+            self.s_grade = int((intent >= S_GRADE_MIN_INTENT).sum())
+            self.intent_counts = intent.value_counts().sort_index()
+
+        # 등급(Grade) S/A 합계 (없으면 None)
+        self.sa_count = int(df['Grade'].isin([1, 2]).sum()) if 'Grade' in df.columns else None
+
+        # 문항별 응답 건수 (건수 내림차순, category의 미관측 항목 제외)
+        self.answer_counts = {}
+        for col in QUESTION_TITLES:
+            if col in df.columns:
+                counts = df[col].value_counts()
+                self.answer_counts[col] = counts[counts > 0]
+
+        # 청약 자격 보유 (무응답/기타를 제외한 나머지, 결측 포함)
+        self.eligible = None
+        if 'Q7_Label' in df.columns:
+            q7 = self.answer_counts['Q7_Label']
+            self.eligible = self.total - int(q7.reindex(INELIGIBLE_LABELS, fill_value=0).sum())
+
+        # 접수 기간
+        self.date_min = self.date_max = None
+        if 'Date' in df.columns:
+            dates = pd.to_datetime(df['Date'], errors='coerce')
+            if dates.notna().any():
+                self.date_min, self.date_max = dates.min(), dates.max()
+
+    # ------------------------------------------
+    # 파생 지표
+    # ------------------------------------------
+
+    @staticmethod
+    def _pct(count, total):
+        return count / total * 100 if total > 0 else 0
+
+    @property
+    def s_grade_pct(self):
+        """S급 비율 (%)"""
+        return self._pct(self.s_grade, self.total)
+
+    @property
+    def eligible_pct(self):
+        """청약 자격 보유율 (%)"""
+        return self._pct(self.eligible or 0, self.total)
+
+    def date_range_label(self, fmt='%Y.%m.%d'):
+        """접수 기간 표시 문자열 (날짜가 없으면 '전체 기간')"""
+        if self.date_min is None:
+            return "전체 기간"
+        return f"{self.date_min.strftime(fmt)} ~ {self.date_max.strftime(fmt)}"
+
+    def counts(self, column):
+        """문항별 응답 건수 (Q6_Intent는 점수 순, 나머지는 건수 내림차순, 없으면 빈 Series)"""
+        if column == 'Q6_Intent':
+            return self.intent_counts
+        return self.answer_counts.get(column, pd.Series(dtype='int64'))
+
+    def has_answers(self, column):
+        """응답이 한 건 이상 있는 문항인지 여부"""
+        return not self.counts(column).empty
+
+    def top_answer(self, column):
+        """최다 응답 (값, 건수), 응답이 없으면 None"""
+        counts = self.counts(column)
+        if counts.empty:
+            return None
+        return counts.index[0], int(counts.iloc[0])
+
+    def answer_rows(self, column, limit=None):
+        """문항 표 행 목록 [(응답, 건수, 비율%)]"""
+        counts = self.counts(column)
+        if limit is not None:
+            counts = counts.head(limit)
+        return [(answer, int(count), self._pct(count, self.total)) for answer, count in counts.items()]
+
+    # ------------------------------------------
+    # AI 프롬프트용 요약
+    # ------------------------------------------
+
+    def prompt_summary(self):
+        """AI 프롬프트 데이터 요약 (JSON 직렬화 가능한 dict)"""
+        summary = {
+            "총_응답_수": self.total,
+            "평균_계약_의향_점수": (
+                round(self.avg_intent, 2) if self.avg_intent is not None else None
+            ) if self.has_intent else "N/A",
+            "S급_고객_수": self.s_grade,
+        }
+        for col, label in PROMPT_TOP_ANSWERS:
+            top = self.top_answer(col)
+            if top is not None:
+                summary[f"최다_{label}"] = f"{top[0]} ({top[1]}명)"
+        return summary
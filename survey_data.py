@@ -0,0 +1,317 @@
+"""
+설문 데이터 로딩 모듈 (Survey Data)
+- '고객설문지DB' 시트 로딩
+- 컬럼형(Parquet) 스냅샷 캐시: 원본 xlsx가 실제로 바뀐 경우에만 다시 파싱
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet 스냅샷 엔진)
+    SNAPSHOT_ENABLED = True
+except ImportError:
+    SNAPSHOT_ENABLED = False
+
+SOURCE_SHEET = '고객설문지DB'
+
+# 스냅샷 포맷이 바뀌면 올려서 기존 스냅샷을 무효화
+SNAPSHOT_SCHEMA_VERSION = 1
+
+CACHE_DIR = os.environ.get(
+    'PRESALES_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+)
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'snapshots')
+MANIFEST_PATH = os.path.join(SNAPSHOT_DIR, 'manifest.json')
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+# ============================================
+# 원본 식별 (경로 + 수정시각 + 내용 해시)
+# ============================================
+
+def _hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(manifest):
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, MANIFEST_PATH)
+    except OSError:
+        pass  # 캐시 기록 실패는 무시 (다음 로딩 때 다시 해시 계산)
+
+
+def source_fingerprint(file_source):
+    """
+    원본 파일의 내용 해시(sha256) 반환
+
+    경로가 주어지면 manifest에 기록된 (경로, 수정시각, 크기)가 같을 때
+    파일을 다시 읽지 않고 기록된 해시를 재사용합니다.
+    업로드 파일(file-like)은 내용 전체를 해시합니다.
+
+    Args:
+        file_source: 파일 경로 또는 업로드된 파일 객체
+
+    Returns:
+        str: 데이터셋 버전으로 사용하는 내용 해시
+    """
+    if not isinstance(file_source, (str, os.PathLike)):
+        if hasattr(file_source, 'getvalue'):
+            return _hash_bytes(file_source.getvalue())
+        position = file_source.tell()
+        data = file_source.read()
+        file_source.seek(position)
+        return _hash_bytes(data)
+
+    path = os.path.abspath(file_source)
+    stat = os.stat(path)
+    manifest = _read_manifest()
+    entry = manifest.get(path)
+    if entry and entry.get('mtime') == stat.st_mtime and entry.get('size') == stat.st_size:
+        return entry['sha256']
+
+    # 수정시각이 바뀌었어도 내용이 같으면 같은 해시 → 같은 스냅샷 재사용
+    sha256 = _hash_file(path)
+    manifest[path] = {'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': sha256}
+    _write_manifest(manifest)
+    return sha256
+
+
+# ============================================
+# 시트 로딩 + 스냅샷
+# ============================================
+
+def filter_valid_rows(df):
+    """원본 시트에서 유효 행(Q1 응답 존재)만 남김"""
+    # Filter valid rows (Q1 existence)
+    q1_col_name = df.columns[4]
+    return df[df[q1_col_name].notna()]
+
+
+def read_survey_sheet(file_source):
+    """xlsx에서 '고객설문지DB' 시트를 읽고 유효 행(Q1 응답 존재)만 남김"""
+    df = pd.read_excel(file_source, sheet_name=SOURCE_SHEET, header=0)
+    return filter_valid_rows(df)
+
+
+def _snapshot_path(version):
+    return os.path.join(SNAPSHOT_DIR, f"{version}.v{SNAPSHOT_SCHEMA_VERSION}.parquet")
+
+
+def _arrow_compatible(df):
+    """Parquet로 쓸 수 없는 컬럼(문자열이 아닌 컬럼명, 혼합 타입 object 컬럼)을 문자열로 정규화"""
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    for col in df.columns:
+        if df[col].dtype == object:
+            values = df[col].dropna()
+            if values.map(type).nunique() > 1:
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def _write_snapshot(df, path):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_survey_sheet(file_source, version=None):
+    """
+    '고객설문지DB' 시트 로딩 (스냅샷 우선)
+
+    내용 해시가 같은 스냅샷이 있으면 Parquet에서 바로 읽고,
+    없으면 xlsx를 파싱한 뒤 스냅샷을 남깁니다.
+
+    Args:
+        file_source: 파일 경로 또는 업로드된 파일 객체
+        version: source_fingerprint() 결과 (없으면 계산)
+
+    Returns:
+        DataFrame: 유효 행만 남긴 원본 시트
+    """
+    if not SNAPSHOT_ENABLED:
+        return read_survey_sheet(file_source)
+
+    if version is None:
+        version = source_fingerprint(file_source)
+    path = _snapshot_path(version)
+
+    if os.path.exists(path):
+        try:
+            return pd.read_parquet(path)
+        except Exception:
+            pass  # 손상된 스냅샷 → 원본에서 다시 생성
+
+    df = read_survey_sheet(file_source)
+    try:
+        _write_snapshot(df, path)
+    except Exception:
+        # 혼합 타입 등으로 바로 쓸 수 없으면 정규화 후 재시도
+        # (스냅샷과 동일한 형태를 반환해야 다음 로딩 결과와 일치)
+        try:
+            df = _arrow_compatible(df)
+            _write_snapshot(df, path)
+        except Exception:
+            pass
+    return df
+
+
+# ============================================
+# 분석용 데이터셋 (컬럼 매핑 + 타입 정리 + 라벨)
+# ============================================
+
+# 원본 시트의 컬럼 위치 → 분석용 컬럼명
+COLUMN_POSITIONS = {
+    1: 'Date',
+    2: 'Manager',
+    3: 'Spot',
+    4: 'Q1_Awareness',
+    5: 'Q2_Channel',
+    6: 'Q3_Pros',
+    7: 'Q4_Purpose',
+    8: 'Q5_Type',
+    9: 'Q6_Intent',
+    10: 'Q7_Subscription',
+    11: 'Q8_Price',
+    12: 'Addr_City',
+    13: 'Addr_Gu',
+    14: 'Addr_Dong',
+    16: 'Gender',
+    17: 'Grade',
+}
+
+NUMERIC_COLUMNS = ['Q6_Intent', 'Q4_Purpose', 'Q5_Type', 'Q1_Awareness', 'Q2_Channel', 'Q7_Subscription', 'Q8_Price', 'Gender']
+
+# 평균/비교 연산에 쓰이는 점수 컬럼 (코드로 줄이지 않고 float 유지)
+SCORE_COLUMNS = ['Q6_Intent']
+
+# 반복 값이 많은 문자열 컬럼 → category
+CATEGORY_COLUMNS = ['Spot', 'Manager', 'Addr_City', 'Addr_Gu', 'Addr_Dong']
+
+# Mapping Dictionaries
+Q1_MAP = {1: '잘 알고있다', 2: '들어본 적 있다', 3: '처음 알았다'}
+Q2_MAP = {1: '외부홍보', 2: '부동산', 3: '가족/지인', 4: '옥외광고', 5: '홈페이지', 6: '온라인광고', 7: '기사'}
+Q3_MAP = {1: '브랜드', 2: '주거쾌적성', 3: '교통환경', 4: '교육환경', 5: '투자가치'}
+Q4_MAP = {1: '실거주', 2: '투자', 3: '실거주+투자'}
+Q5_MAP = {1: '59㎡', 2: '74㎡', 3: '75㎡', 4: '84㎡'}
+Q7_MAP = {1: '특별공급', 2: '1순위', 3: '2순위', 4: '무응답'}
+Q8_MAP = {
+    1: '11.5~12억', 2: '12~12.5억', 3: '12.5~13억', 4: '13~13.5억',
+    5: '14~14.5억', 6: '14.5~15억', 7: '15~15.5억', 8: '15.5~16억'
+}
+GENDER_MAP = {1: '남성', 2: '여성'}
+
+# 라벨 컬럼: (코드 컬럼, 매핑, 매핑 실패 시 라벨)
+LABEL_COLUMNS = {
+    'Q1_Label': ('Q1_Awareness', Q1_MAP, '기타'),
+    'Q2_Label': ('Q2_Channel', Q2_MAP, '기타'),
+    'Q3_Label': ('Q3_Pros', Q3_MAP, '기타'),
+    'Q4_Label': ('Q4_Purpose', Q4_MAP, '기타'),
+    'Q5_Label': ('Q5_Type', Q5_MAP, '기타'),
+    'Q7_Label': ('Q7_Subscription', Q7_MAP, '기타'),
+    'Q8_Label': ('Q8_Price', Q8_MAP, '기타'),
+    'Gender_Label': ('Gender', GENDER_MAP, '미기재'),
+}
+
+
+def _compact_codes(series):
+    """문항 코드를 nullable Int8로 축소 (정수가 아닌 값이 섞여 있으면 float 유지)"""
+    values = series.dropna()
+    if values.empty or (
+        (values == values.round()).all() and values.min() >= -128 and values.max() <= 127
+    ):
+        return series.astype('Int8')
+    return series
+
+
+def _label_categorical(codes, mapping, fallback):
+    """코드 → 라벨 변환을 매핑 순서의 ordered Categorical로 생성"""
+    categories = list(mapping.values())
+    if fallback not in categories:
+        categories.append(fallback)
+    positions = {code: i for i, code in enumerate(mapping)}
+    label_codes = codes.map(positions).fillna(categories.index(fallback)).astype('int8')
+    return pd.Series(
+        pd.Categorical.from_codes(label_codes.to_numpy(), categories=categories, ordered=True),
+        index=codes.index,
+    )
+
+
+def build_prepared_dataset(raw_df):
+    """
+    원본 시트를 분석용 데이터셋으로 변환
+
+    컬럼명 매핑, 숫자/날짜 변환, 문항 라벨 생성을 한 번에 수행합니다.
+    문항 코드는 Int8, 라벨은 매핑 순서의 ordered Categorical,
+    거점/담당자/주소는 category로 저장해 메모리를 줄입니다.
+    입력 DataFrame은 수정하지 않고 새 DataFrame을 반환합니다.
+    반환값은 여러 세션이 공유하므로 읽기 전용으로 다뤄야 합니다.
+
+    Args:
+        raw_df: load_survey_sheet() 결과
+
+    Returns:
+        DataFrame: 분석용 데이터셋
+    """
+    cols = raw_df.columns.tolist()
+    col_map = {cols[pos]: name for pos, name in COLUMN_POSITIONS.items()}
+    df = raw_df.rename(columns=col_map)
+
+    # --- Data Cleaning & Mapping ---
+    # Ensure Numeric
+    converted = {}
+    for c in NUMERIC_COLUMNS:
+        if c in df.columns:
+            converted[c] = pd.to_numeric(df[c], errors='coerce')
+
+    # Date
+    if 'Date' in df.columns:
+        converted['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+
+    # Apply Mappings (Q3는 숫자 변환 없이 원본 값으로 매핑)
+    for label_col, (code_col, mapping, fallback) in LABEL_COLUMNS.items():
+        codes = converted.get(code_col, df.get(code_col))
+        if codes is not None:
+            converted[label_col] = _label_categorical(codes, mapping, fallback)
+
+    for c in NUMERIC_COLUMNS:
+        if c in converted and c not in SCORE_COLUMNS:
+            converted[c] = _compact_codes(converted[c])
+
+    for c in CATEGORY_COLUMNS:
+        if c in df.columns:
+            converted[c] = df[c].astype('category')
+
+    return df.assign(**converted)
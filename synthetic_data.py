@@ -0,0 +1,210 @@
+"""
+합성 설문 데이터 모듈 (Synthetic Data)
+- '고객설문지DB' 시트와 같은 18개 컬럼 구조의 원본 데이터를 원하는 규모로 생성
+- 접수일자 기간, 영업 거점, 담당자, 거주 지역을 지정할 수 있고, 같은 seed면 항상 같은 데이터
+- 문항 응답은 실제 데이터와 비슷하게 서로 연관 (분양 의향이 높을수록 상담 등급/청약 순위가 높음)
+- 성능 측정(benchmark_suite.py)과 테스트에서 대용량 입력으로 사용
+"""
+
+import numpy as np
+import pandas as pd
+
+from survey_data import SOURCE_SHEET, build_prepared_dataset, filter_valid_rows
+
+# 원본 시트의 컬럼 순서 (build_prepared_dataset()은 위치로 매핑)
+SURVEY_COLUMNS = [
+    'No', '접수일자', '담당자', '거점',
+    '질문 1', '질문 2', '질문 3', '질문 4', '질문 5', '질문 6', '질문 7', '질문 8',
+    '시/도', '시/군/구', '읍/면/동', '연락처', '성별', '등급',
+]
+
+# 응답이 비어 있을 수 있는 컬럼 ('질문 1'이 비면 로딩 시 행 전체가 제외됨)
+NULLABLE_COLUMNS = [
+    '접수일자', '질문 1', '질문 2', '질문 3', '질문 4', '질문 5', '질문 6', '질문 7', '질문 8',
+    '시/군/구', '읍/면/동', '성별', '등급',
+]
+
+DEFAULT_SPOTS = ['신촌', '홍대', '연희', '불광']
+DEFAULT_MANAGERS = ['1조', '2조', '3조', '김팀장']
+
+# 시/도 → 시/군/구 → 읍/면/동 (앞쪽 지역일수록 응답이 많음)
+DEFAULT_REGIONS = {
+    '서울': {
+        '서대문구': ['연희동', '신촌동', '북가좌동', '남가좌동', '홍제동'],
+        '마포구': ['망원동', '합정동', '서교동', '성산동'],
+        '은평구': ['불광동', '응암동', '녹번동', '역촌동'],
+        '종로구': ['평창동', '부암동', '무악동'],
+    },
+    '경기': {
+        '고양시': ['화정동', '행신동', '삼송동'],
+        '파주시': ['운정동', '교하동'],
+    },
+}
+
+# 엑셀 시트 한 장에 들어가는 최대 데이터 행 수 (머리글 1행 제외)
+MAX_WORKBOOK_ROWS = 1048575
+
+# 분양 의향(질문 6, 1~7점) 분포
+_INTENT_WEIGHTS = [0.05, 0.07, 0.12, 0.20, 0.22, 0.20, 0.14]
+
+# 문항별 응답 코드와 분포 (질문 6, 7은 의향에 따라 따로 생성)
+_ANSWER_WEIGHTS = {
+    '질문 1': {1: 0.30, 2: 0.45, 3: 0.25},
+    '질문 2': {1: 0.22, 2: 0.18, 3: 0.20, 4: 0.10, 5: 0.08, 6: 0.15, 7: 0.07},
+    '질문 3': {1: 0.25, 2: 0.20, 3: 0.30, 4: 0.10, 5: 0.15},
+    '질문 4': {1: 0.55, 2: 0.15, 3: 0.30},
+    '질문 5': {1: 0.20, 2: 0.25, 3: 0.15, 4: 0.40},
+    '질문 8': {1: 0.06, 2: 0.10, 3: 0.16, 4: 0.20, 5: 0.18, 6: 0.14, 7: 0.10, 8: 0.06},
+    '성별': {1: 0.48, 2: 0.52},
+}
+
+# 주말(토/일)에는 평일보다 방문 상담이 많음
+_WEEKEND_WEIGHT = 2.5
+
+
+def _choice(rng, mapping, n_rows):
+    """{값: 비율} 분포에서 n_rows개 추출"""
+    values = np.array(list(mapping))
+    weights = np.array(list(mapping.values()), dtype=float)
+    return rng.choice(values, n_rows, p=weights / weights.sum())
+
+
+def _ranked_weights(n):
+    """앞쪽 항목일수록 많이 뽑히는 비율 (1, 1/2, 1/3, ...)"""
+    weights = 1.0 / np.arange(1, n + 1)
+    return weights / weights.sum()
+
+
+def _survey_dates(rng, n_rows, start_date, days):
+    """기간 안의 접수일자 (주말 가중치 적용)"""
+    calendar = pd.date_range(start_date, periods=days, freq='D')
+    weights = np.where(calendar.dayofweek >= 5, _WEEKEND_WEIGHT, 1.0)
+    return calendar[rng.choice(days, n_rows, p=weights / weights.sum())]
+
+
+def _addresses(rng, n_rows, regions):
+    """(시/도, 시/군/구, 읍/면/동) 배열 - 시/군/구는 앞쪽일수록, 읍/면/동은 균등하게 추출"""
+    districts = [(city, gu, dongs) for city, gus in regions.items() for gu, dongs in gus.items()]
+    picks = rng.choice(len(districts), n_rows, p=_ranked_weights(len(districts)))
+
+    cities = np.empty(n_rows, dtype=object)
+    gus = np.empty(n_rows, dtype=object)
+    dongs = np.empty(n_rows, dtype=object)
+    for i, (city, gu, gu_dongs) in enumerate(districts):
+        rows = np.flatnonzero(picks == i)
+        cities[rows] = city
+        gus[rows] = gu
+        dongs[rows] = np.array(gu_dongs, dtype=object)[rng.integers(0, len(gu_dongs), len(rows))]
+    return cities, gus, dongs
+
+
+def _grades(rng, intent):
+    """분양 의향 → 상담 등급 (1=S ~ 4=C, 의향이 높을수록 높은 등급, 일부는 한 단계 어긋남)"""
+    grade = np.select([intent >= 7, intent >= 6, intent >= 4], [1, 2, 3], default=4)
+    shift = rng.choice([-1, 0, 1], len(intent), p=[0.1, 0.8, 0.1])
+    return np.clip(grade + shift, 1, 4)
+
+
+def _subscriptions(rng, intent):
+    """분양 의향 → 청약 순위 (의향이 낮을수록 '무응답'(4)이 많음)"""
+    no_answer = rng.random(len(intent)) < (8 - intent) / 10
+    rank = rng.choice([1, 2, 3], len(intent), p=[0.2, 0.55, 0.25])
+    return np.where(no_answer, 4, rank)
+
+
+def generate_survey_frame(n_rows, start_date='2025-12-01', days=60, spots=None, managers=None,
+                          regions=None, missing_rate=0.02, seed=0):
+    """
+    '고객설문지DB' 시트와 같은 구조의 합성 원본 데이터 생성
+
+    Args:
+        n_rows: 행 수
+        start_date: 접수 시작일
+        days: 접수 기간 (일)
+        spots: 영업 거점 목록 (기본값: DEFAULT_SPOTS)
+        managers: 담당자 목록 (기본값: DEFAULT_MANAGERS, 담당자마다 주로 맡는 거점이 있음)
+        regions: {시/도: {시/군/구: [읍/면/동, ...]}} (기본값: DEFAULT_REGIONS)
+        missing_rate: NULLABLE_COLUMNS 각 칸이 비어 있을 비율
+        seed: 난수 시드
+
+    Returns:
+        DataFrame: SURVEY_COLUMNS 순서의 원본 시트 (load_survey_sheet()의 유효 행 필터 전)
+    """
+    spots = list(spots or DEFAULT_SPOTS)
+    managers = list(managers or DEFAULT_MANAGERS)
+    regions = regions or DEFAULT_REGIONS
+    rng = np.random.default_rng(seed)
+
+    # 담당자는 70% 확률로 자기 거점에서, 나머지는 다른 거점에서 상담
+    manager_idx = rng.integers(0, len(managers), n_rows)
+    home_spot = manager_idx % len(spots)
+    other_spot = rng.integers(0, len(spots), n_rows)
+    spot_idx = np.where(rng.random(n_rows) < 0.7, home_spot, other_spot)
+
+    intent = rng.choice(np.arange(1, 8), n_rows, p=_INTENT_WEIGHTS)
+    cities, gus, dongs = _addresses(rng, n_rows, regions)
+    contacts = pd.Series(rng.integers(0, 10000, n_rows)).astype(str).str.zfill(4)
+
+    columns = {
+        'No': np.arange(1, n_rows + 1),
+        '접수일자': _survey_dates(rng, n_rows, start_date, days),
+        '담당자': np.array(managers, dtype=object)[manager_idx],
+        '거점': np.array(spots, dtype=object)[spot_idx],
+        '시/도': cities,
+        '시/군/구': gus,
+        '읍/면/동': dongs,
+        '연락처': ('010-****-' + contacts).to_numpy(),
+        '질문 6': intent,
+        '질문 7': _subscriptions(rng, intent),
+        '등급': _grades(rng, intent),
+    }
+    for col, weights in _ANSWER_WEIGHTS.items():
+        columns[col] = _choice(rng, weights, n_rows)
+
+    df = pd.DataFrame({col: columns[col] for col in SURVEY_COLUMNS})
+
+    # 빈 칸 (숫자 문항은 실제 시트처럼 float, 날짜는 NaT)
+    for col in NULLABLE_COLUMNS:
+        missing = rng.random(n_rows) < missing_rate
+        if missing.any():
+            if df[col].dtype.kind in 'iu':
+                df[col] = df[col].astype(float)
+            df.loc[missing, col] = None
+    return df
+
+
+def generate_prepared_frame(n_rows, **options):
+    """
+    합성 원본을 로딩/매핑까지 거친 분석용 데이터셋 생성
+
+    Args:
+        n_rows: 원본 행 수 (유효 행 필터 후 조금 줄어듦)
+        **options: generate_survey_frame() 인자
+
+    Returns:
+        DataFrame: build_prepared_dataset() 결과
+    """
+    return build_prepared_dataset(filter_valid_rows(generate_survey_frame(n_rows, **options)))
+
+
+def write_survey_workbook(path, n_rows=None, df=None, **options):
+    """
+    합성 원본을 '고객설문지DB' 시트 하나짜리 xlsx로 저장
+
+    Args:
+        path: 저장할 파일 경로 (또는 file-like 객체)
+        n_rows: 생성할 행 수 (df가 없을 때)
+        df: 저장할 원본 데이터 (없으면 generate_survey_frame()으로 생성)
+        **options: generate_survey_frame() 인자
+
+    Returns:
+        DataFrame: 저장한 원본 데이터
+    """
+    if df is None:
+        df = generate_survey_frame(n_rows, **options)
+    if len(df) > MAX_WORKBOOK_ROWS:
+        raise ValueError(f"엑셀 시트 한 장에는 {MAX_WORKBOOK_ROWS:,}행까지만 저장할 수 있습니다.")
+
+    with pd.ExcelWriter(path, engine='xlsxwriter', datetime_format='yyyy-mm-dd') as writer:
+        df.to_excel(writer, sheet_name=SOURCE_SHEET, index=False)
+    return df
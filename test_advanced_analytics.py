@@ -0,0 +1,200 @@
+"""
+고급 분석 테스트 스크립트
+advanced_analytics.py의 컬럼 단위 계산이 행 단위 계산과 같은 결과를 내는지 확인합니다.
+
+    python -m pytest -q test_advanced_analytics.py
+    (100만 행 속도 측정: python benchmark_suite.py --rows 1000000 --skip load_xlsx excel pdf)
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+from advanced_analytics import (
+    calculate_lead_score,
+    get_lead_grade,
+    calculate_lead_scores,
+    apply_lead_scoring,
+    calculate_rfie_scores,
+)
+from survey_data import Q2_MAP, Q3_MAP, Q4_MAP, Q7_MAP, Q8_MAP, LABEL_COLUMNS, build_prepared_dataset
+
+
+def make_prepared_sample(n_rows, seed=0):
+    """build_prepared_dataset()을 거친 분석용 샘플 데이터 (결측 포함)"""
+    rng = np.random.default_rng(seed)
+
+    def codes(mapping, extra=(np.nan, 99)):
+        pool = list(mapping) + list(extra)
+        return rng.choice(np.array(pool, dtype=float), n_rows)
+
+    raw = pd.DataFrame({
+        'No': np.arange(n_rows),
+        '접수일자': pd.Timestamp('2025-12-01') + pd.to_timedelta(rng.integers(0, 60, n_rows), unit='D'),
+        '담당자': rng.choice(['김철수', '이영희', '박민수'], n_rows),
+        '거점': rng.choice(['서대문', '마포', '은평'], n_rows),
+        '질문1': codes({1: 0, 2: 0, 3: 0}),
+        '질문2': codes(Q2_MAP),
+        '질문3': codes({1: 0, 2: 0, 3: 0, 4: 0, 5: 0}),
+        '질문4': codes(Q4_MAP),
+        '질문5': codes({1: 0, 2: 0, 3: 0, 4: 0}),
+        '질문6': codes({i: 0 for i in range(1, 8)}, extra=(np.nan, 0)),
+        '질문7': codes(Q7_MAP),
+        '질문8': codes({**Q8_MAP, 13: 0, 14: 0, 15: 0, 17: 0}),
+        '시/도': rng.choice(['서울', '경기'], n_rows),
+        '시/군/구': rng.choice(['서대문구', '마포구', '은평구'], n_rows),
+        '읍/면/동': rng.choice(['연희동', '망원동'], n_rows),
+        '연락처': ['010'] * n_rows,
+        '성별': codes({1: 0, 2: 0}),
+        '등급': codes({1: 0, 2: 0, 3: 0, 4: 0}),
+    })
+    return build_prepared_dataset(raw)
+
+
+def make_object_sample():
+    """라벨이 일반 문자열/결측인 경우 (업로드 원본에 가까운 형태)"""
+    return pd.DataFrame({
+        'Q6_Intent': [7, 5.5, 3, 2, np.nan, 6],
+        'Q7_Label': ['1순위', ' 무응답 ', np.nan, '', '특별공급', '기타'],
+        'Q4_Label': ['실거주', '실거주+투자', '투자', '기타', np.nan, '무응답'],
+        'Q8_Price': [13, 16, 12.5, 17, np.nan, 10],
+        'Q2_Label': ['가족/지인', '현장 방문', '온라인광고', '부동산', np.nan, '추천'],
+    })
+
+
+def test_prepared_dataset_has_every_label_column():
+    df = make_prepared_sample(500)
+    assert set(LABEL_COLUMNS) <= set(df.columns)
+
+    # Q3은 숫자 변환 대상이 아니어도 원본 코드로 라벨이 만들어짐
+    answered = df['Q3_Pros'].isin(list(Q3_MAP))
+    assert (df.loc[answered, 'Q3_Label'].astype(str) == df.loc[answered, 'Q3_Pros'].map(Q3_MAP)).all()
+
+
+def reference_scores(df, price_range=(13, 16)):
+    """기존 행 단위 구현 (비교 기준)"""
+    return df.apply(lambda row: calculate_lead_score(row, price_range), axis=1)
+
+
+def test_lead_scores_match_row_wise():
+    df = make_prepared_sample(3000)
+    expected = reference_scores(df)
+    actual = calculate_lead_scores(df)
+    assert actual.tolist() == expected.tolist()
+
+
+def test_lead_scores_match_row_wise_for_plain_labels():
+    df = make_object_sample()
+    for price_range in [(13, 16), (11, 12)]:
+        assert calculate_lead_scores(df, price_range).tolist() == reference_scores(df, price_range).tolist()
+
+
+def test_lead_scores_with_missing_columns():
+    df = make_object_sample()[['Q6_Intent']]
+    assert calculate_lead_scores(df).tolist() == reference_scores(df).tolist()
+
+
+def test_lead_grades_match_row_wise():
+    df = make_prepared_sample(3000, seed=1)
+    result = apply_lead_scoring(df)
+    assert result['Lead_Grade'].tolist() == result['Lead_Score'].apply(get_lead_grade).tolist()
+    assert result.index.equals(df.index)
+
+
+def reference_rfie_scores(df):
+    """기존 행 단위 RFIE 구현 (비교 기준)"""
+    df_result = df.copy()
+
+    if 'Date' in df_result.columns:
+        dates = pd.to_datetime(df_result['Date'], errors='coerce')
+        max_date = dates.max()
+
+        def r_score(date):
+            if pd.isna(date):
+                return 3
+            days_diff = (max_date - date).days
+            if days_diff <= 3:
+                return 5
+            elif days_diff <= 7:
+                return 4
+            elif days_diff <= 14:
+                return 3
+            elif days_diff <= 21:
+                return 2
+            return 1
+
+        df_result['R_Score'] = dates.apply(r_score)
+    else:
+        df_result['R_Score'] = 3
+
+    def i_score(intent):
+        if pd.isna(intent):
+            return 3
+        if intent >= 7:
+            return 5
+        elif intent >= 5:
+            return 4
+        elif intent >= 3:
+            return 3
+        elif intent >= 2:
+            return 2
+        return 1
+
+    df_result['I_Score'] = df_result['Q6_Intent'].apply(i_score) if 'Q6_Intent' in df_result.columns else 3
+
+    def e_score(label):
+        text = str(label).strip()
+        if pd.notna(label) and text not in ['', '무응답', '기타', 'nan']:
+            return 2
+        return 0
+
+    df_result['E_Score'] = df_result['Q7_Label'].apply(e_score) if 'Q7_Label' in df_result.columns else 0
+    df_result['RFIE_Score'] = df_result['R_Score'] + 3 + df_result['I_Score'] + df_result['E_Score']
+
+    def rfie_segment(score):
+        if score >= 15:
+            return '🏆 Champion'
+        elif score >= 12:
+            return '⭐ Loyal'
+        elif score >= 8:
+            return '🌱 Promising'
+        elif score >= 5:
+            return '💤 At Risk'
+        return '❌ Lost'
+
+    df_result['RFIE_Segment'] = df_result['RFIE_Score'].apply(rfie_segment)
+    return df_result
+
+
+RFIE_COLUMNS = ['R_Score', 'I_Score', 'E_Score', 'RFIE_Score', 'RFIE_Segment']
+
+
+def assert_rfie_match(df):
+    expected = reference_rfie_scores(df)
+    actual = calculate_rfie_scores(df)
+    for col in RFIE_COLUMNS:
+        assert actual[col].tolist() == expected[col].tolist(), col
+
+
+def test_rfie_scores_match_row_wise():
+    df = make_prepared_sample(3000, seed=3)
+    df.loc[df.index[::11], 'Date'] = pd.NaT
+    assert_rfie_match(df)
+
+
+def test_rfie_scores_match_row_wise_for_plain_labels():
+    df = make_object_sample()
+    df['Date'] = ['2025-12-01', '2025-12-20 10:30', None, '2025-12-24', '2025-11-01', '2025-12-17']
+    assert_rfie_match(df)
+
+
+def test_rfie_scores_without_dates_or_answers():
+    df = make_object_sample()[['Q4_Label']]
+    assert_rfie_match(df)
+    df['Date'] = pd.NaT
+    assert_rfie_match(df)
@@ -0,0 +1,177 @@
+"""
+AI 분석 테스트 스크립트
+실제 Gemini API 대신 로컬 가짜 클라이언트로 ai_analyzer.py의 생성/스트리밍/캐시 동작을 확인합니다.
+
+    python -m pytest -q test_ai_analyzer.py
+"""
+
+import sys
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+import ai_analyzer
+from analysis_context import AnalysisContext
+from insight_cache import InsightCache
+from prompt_budget import DEFAULT_PROMPT_TOKEN_BUDGET, estimate_tokens, summarize_weeks
+from test_advanced_analytics import make_prepared_sample
+
+RESPONSE_CHUNKS = ["## 📊 현황 요약\n", "- 총 응답 300건\n", "\n## 🎯 액션 아이템\n", "1. 현장 방문객 재접촉\n"]
+
+
+class FakeModels:
+    """genai.Client().models 대역 (호출 기록 + 조각 단위 응답 + 동시 호출 수 기록)"""
+
+    def __init__(self, chunks, fail_after=None, barrier=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.barrier = barrier
+        self.calls = []
+        self.produced = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, model, contents):
+        with self._lock:
+            self.calls.append(('generate_content', model))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.barrier is not None:
+                # 다른 호출이 모두 시작될 때까지 대기 (순차 실행이면 시간 초과로 실패)
+                self.barrier.wait(timeout=5)
+            return SimpleNamespace(text=''.join(self.chunks))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def generate_content_stream(self, model, contents):
+        self.calls.append(('generate_content_stream', model))
+        for i, text in enumerate(self.chunks):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("stream reset")
+            self.produced += 1
+            yield SimpleNamespace(text=text)
+
+
+class FakeClient:
+    def __init__(self, chunks=RESPONSE_CHUNKS, fail_after=None, barrier=None):
+        self.models = FakeModels(chunks, fail_after, barrier)
+
+
+def use_temp_cache(monkeypatch):
+    """테스트 동안만 빈 임시 캐시 사용 (테스트가 끝나면 monkeypatch가 원래 캐시로 되돌림)"""
+    monkeypatch.setattr(ai_analyzer, 'insight_cache', InsightCache(tempfile.mkdtemp()))
+
+
+def test_stream_yields_chunks_as_they_arrive(monkeypatch):
+    use_temp_cache(monkeypatch)
+    df = make_prepared_sample(300)
+    client = FakeClient()
+
+    stream = ai_analyzer.stream_ai_insight(df, client=client)
+    first = next(stream)
+    # 첫 조각은 나머지 응답을 기다리지 않고 바로 전달
+    assert first == RESPONSE_CHUNKS[0]
+    assert client.models.produced == 1
+
+    rest = list(stream)
+    assert [first] + rest == RESPONSE_CHUNKS
+    assert client.models.calls == [('generate_content_stream', ai_analyzer.GEMINI_MODEL)]
+
+
+def test_streamed_text_is_cached_for_full_generation(monkeypatch):
+    use_temp_cache(monkeypatch)
+    df = make_prepared_sample(300)
+    client = FakeClient()
+
+    streamed = ''.join(ai_analyzer.stream_ai_insight(df, client=client))
+    # 같은 필터 상태 → API 호출 없이 같은 텍스트 (PDF 보고서에 그대로 전달되는 값)
+    assert ai_analyzer.generate_ai_insight(df, client=client) == streamed
+    assert ''.join(ai_analyzer.stream_ai_insight(df, client=client)) == streamed
+    assert len(client.models.calls) == 1
+
+    ai_analyzer.generate_ai_insight(df, force_refresh=True, client=client)
+    assert client.models.calls[-1] == ('generate_content', ai_analyzer.GEMINI_MODEL)
+
+
+def test_stream_error_is_reported_and_not_cached(monkeypatch):
+    use_temp_cache(monkeypatch)
+    df = make_prepared_sample(300)
+    client = FakeClient(fail_after=2)
+
+    chunks = list(ai_analyzer.stream_ai_insight(df, client=client))
+    assert chunks[:2] == RESPONSE_CHUNKS[:2]
+    assert chunks[-1].strip().startswith("❌") and "stream reset" in chunks[-1]
+
+    retry = FakeClient()
+    assert ''.join(ai_analyzer.stream_ai_insight(df, client=retry)) == ''.join(RESPONSE_CHUNKS)
+    assert len(retry.models.calls) == 1
+
+
+def test_prompt_reuses_analysis_context():
+    df = make_prepared_sample(300)
+    context = AnalysisContext(df)
+    expected = ai_analyzer.build_insight_prompt(df)
+
+    # 컨텍스트가 있으면 스코어링/RFIE를 다시 계산하지 않음
+    originals = ai_analyzer.apply_lead_scoring, ai_analyzer.calculate_rfie_scores
+
+    def fail(*args, **kwargs):
+        raise AssertionError("recomputed")
+
+    ai_analyzer.apply_lead_scoring = ai_analyzer.calculate_rfie_scores = fail
+    try:
+        assert ai_analyzer.build_insight_prompt(df, context) == expected
+        # 두 번째 프롬프트는 보관된 요약 텍스트를 그대로 사용
+        assert ai_analyzer.build_insight_prompt(df, context) == expected
+    finally:
+        ai_analyzer.apply_lead_scoring, ai_analyzer.calculate_rfie_scores = originals
+
+
+def test_prompt_size_stays_flat_for_long_campaigns():
+    df = make_prepared_sample(3000)
+    sizes = []
+    for days in (30, 180, 720):
+        # 같은 응답을 점점 긴 기간에 흩뿌림 (주차 수 4 → 26 → 103)
+        spread = df.assign(Date=pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(len(df)) % days, unit='D'))
+        sizes.append(estimate_tokens(ai_analyzer.build_insight_prompt(spread)))
+
+        # 전체 합계는 구간으로 묶어도 그대로
+        rows = summarize_weeks(spread, recent_weeks=4)
+        assert sum(row['응답수'] for row in rows) == len(df)
+    assert max(sizes) <= DEFAULT_PROMPT_TOKEN_BUDGET
+    assert sizes[2] - sizes[1] < 0.1 * sizes[1]
+
+    # 예산이 빠듯하면 더 압축한 단계로 맞춤
+    tight = ai_analyzer.build_insight_prompt(spread, token_budget=sizes[2] - 100)
+    assert estimate_tokens(tight) <= sizes[2] - 100
+    assert '"응답수"' in tight
+
+
+def test_batch_insights_run_concurrently(monkeypatch):
+    use_temp_cache(monkeypatch)
+    df = make_prepared_sample(600)
+    gus = ['은평구', '서대문구', '마포구']
+    client = FakeClient(barrier=threading.Barrier(len(gus)))
+
+    report = ai_analyzer.generate_batch_insights(df, 'Addr_Gu', gus, max_concurrency=3, client=client)
+
+    # 세 번의 호출이 동시에 진행 (세 호출 모두 barrier에 도달해야 응답)
+    assert len(client.models.calls) == 3
+    assert client.models.max_in_flight == 3
+    headings = [line for line in report.splitlines() if line.startswith('## 📍')]
+    assert [h.split()[2] for h in headings] == gus
+    assert report.count(''.join(RESPONSE_CHUNKS)) == 3
+
+    # 파티션별 결과도 캐시됨
+    ai_analyzer.generate_batch_insights(df, 'Addr_Gu', gus, client=client)
+    assert len(client.models.calls) == 3
@@ -0,0 +1,103 @@
+"""
+일괄 보고서 테스트 스크립트
+batch_reports.py가 기준 값별로 보고서를 날짜 폴더에 만드는지 확인합니다.
+
+    python -m pytest -q test_batch_reports.py
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+import openpyxl
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+from batch_reports import run_batch, safe_filename, report_file_stems
+from test_advanced_analytics import make_prepared_sample
+
+
+def test_one_report_per_partition_in_dated_folder():
+    df = make_prepared_sample(300)
+    output_root = tempfile.mkdtemp()
+    done = []
+
+    out_dir, results = run_batch(
+        df, 'spot', output_root, report_type="데이터만", workers=1,
+        today=datetime(2026, 1, 5), progress=lambda i, total, result: done.append((i, total)),
+    )
+
+    assert out_dir == os.path.join(output_root, '20260105_영업거점')
+    assert [r.value for r in results] == sorted(df['Spot'].dropna().unique())
+    assert done == [(1, 3), (2, 3), (3, 3)]
+    assert sum(r.rows for r in results) == df['Spot'].notna().sum()
+    assert all(not r.errors for r in results)
+
+    # 파티션 보고서의 총 응답 수 = 해당 값의 행 수
+    first = results[0]
+    assert sorted(os.listdir(out_dir)) == sorted(os.path.basename(r.files[0]) for r in results)
+    assert os.path.basename(first.files[0]) == f"PreSales_Report_영업거점_{first.value}.xlsx"
+    sheet = openpyxl.load_workbook(first.files[0], read_only=True)['통계 요약']
+    total_row = next(sheet.iter_rows(min_row=4, max_row=4, values_only=True))
+    assert total_row[:2] == ('총 응답 수', first.rows)
+
+
+def test_process_pool_matches_in_process_run():
+    df = make_prepared_sample(300)
+    today = datetime(2026, 1, 5)
+
+    out_dir, results = run_batch(df, 'gu', tempfile.mkdtemp(), report_type="데이터만", workers=2, today=today)
+    _, expected = run_batch(df, 'gu', tempfile.mkdtemp(), report_type="데이터만", workers=1, today=today)
+
+    assert [(r.value, r.rows, r.errors) for r in results] == [(r.value, r.rows, r.errors) for r in expected]
+    assert all(not r.errors for r in results)
+    assert sorted(os.listdir(out_dir)) == sorted(os.path.basename(r.files[0]) for r in expected)
+
+
+def test_failed_partition_does_not_stop_batch():
+    df = make_prepared_sample(300)
+    output_root = tempfile.mkdtemp()
+    today = datetime(2026, 1, 5)
+    # 첫 값의 엑셀 파일 자리에 폴더가 있어 쓰기 실패 (OSError)
+    first = sorted(df['Spot'].dropna().unique())[0]
+    os.makedirs(os.path.join(output_root, '20260105_영업거점', f"PreSales_Report_영업거점_{first}.xlsx"))
+
+    _, results = run_batch(df, 'spot', output_root, report_type="데이터만", workers=1, today=today)
+
+    assert len(results) == 3
+    assert results[0].value == first and results[0].files == []
+    assert len(results[0].errors) == 1 and results[0].errors[0].startswith("Excel: ")
+    assert all(r.files and not r.errors for r in results[1:])
+
+
+def test_safe_filename():
+    assert safe_filename('1조/2조 합동') == '1조_2조_합동'
+    assert safe_filename(' ') == '값없음'
+
+
+def test_colliding_filenames_get_numbered():
+    df = make_prepared_sample(300)
+    # 'A B'와 'A_B', 공백뿐인 값 두 개는 정리하면 같은 파일 이름이 됨
+    df['Spot'] = (['A B', 'A_B', ' ', '\t'] * len(df))[:len(df)]
+    output_root = tempfile.mkdtemp()
+
+    out_dir, results = run_batch(df, 'spot', output_root, report_type="데이터만", workers=1)
+
+    files = [os.path.basename(r.files[0]) for r in results]
+    assert len(set(files)) == len(results) == 4
+    assert sorted(os.listdir(out_dir)) == sorted(files)
+    by_value = dict(zip([r.value for r in results], files))
+    assert by_value['A B'] == 'PreSales_Report_영업거점_A_B.xlsx'
+    assert by_value['A_B'] == 'PreSales_Report_영업거점_A_B_2.xlsx'
+    # 값 순서 ('\t' < ' ' < 'A B' < 'A_B')에서 나중에 나온 값에 번호를 붙이고 안내
+    assert by_value['\t'] == 'PreSales_Report_영업거점_값없음.xlsx'
+    assert {r.value: r.warnings for r in results if r.warnings} == {
+        ' ': ['파일 이름 중복 → PreSales_Report_영업거점_값없음_2'],
+        'A_B': ['파일 이름 중복 → PreSales_Report_영업거점_A_B_2'],
+    }
+    assert all(not r.errors for r in results)
+
+    # 대소문자만 다른 이름도 겹치는 것으로 봄
+    assert report_file_stems(['Spot', 'spot'], 'x') == {'Spot': 'PreSales_Report_x_Spot', 'spot': 'PreSales_Report_x_spot_2'}
@@ -0,0 +1,85 @@
+"""
+내보내기 묶음 테스트 스크립트
+export_bundle.py가 엑셀/PDF/데이터 파일을 zip 하나로 묶고 진행 상황을 알리는지 확인합니다.
+
+    python -m pytest -q test_export_bundle.py
+"""
+
+import sys
+import os
+import io
+import zipfile
+import types
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pdf_fonts
+import export_bundle
+from export_bundle import build_export_bundle
+from test_advanced_analytics import make_prepared_sample
+from test_pdf_report import make_korean_font
+
+
+def test_bundle_contains_all_artifacts():
+    df = make_prepared_sample(300)
+    steps = []
+
+    font_dir = tempfile.mkdtemp()
+    make_korean_font(font_dir)
+    os.environ[pdf_fonts.FONT_PATH_ENV] = font_dir
+    try:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            bundle = build_export_bundle(
+                df, ai_insight="## 요약\n- 총 응답 300건", data_format='parquet',
+                progress=lambda done, total, name: steps.append((done, total)), executor=pool, stamp='test',
+            )
+    finally:
+        del os.environ[pdf_fonts.FONT_PATH_ENV]
+
+    assert bundle.errors == []
+    assert steps == [(1, 3), (2, 3), (3, 3)]
+    archive = zipfile.ZipFile(io.BytesIO(bundle.data))
+    assert archive.namelist() == bundle.files == [
+        'PreSales_Report_test.xlsx', '사전영업_종합보고서_test.pdf', 'PreSales_Data_test.parquet'
+    ]
+    assert archive.read('사전영업_종합보고서_test.pdf').startswith(b'%PDF')
+    extract = pd.read_parquet(io.BytesIO(archive.read('PreSales_Data_test.parquet')))
+    assert len(extract) == 300 and list(extract.columns) == list(df.columns)
+    assert set(bundle.timings) == set(bundle.files)
+
+
+def test_default_process_pool_skips_dashboard_main():
+    df = make_prepared_sample(300)
+    font_dir = tempfile.mkdtemp()
+    make_korean_font(font_dir)
+
+    # Streamlit처럼 대시보드 스크립트가 __main__ → 작업 프로세스에서 실행되면 표시 파일을 남김
+    marker = os.path.join(tempfile.mkdtemp(), 'dashboard_ran')
+    script = os.path.join(tempfile.mkdtemp(), 'dashboard.py')
+    with open(script, 'w', encoding='utf-8') as f:
+        f.write(f"open({marker!r}, 'w').close()\n")
+    dashboard_main = types.ModuleType('__main__')
+    dashboard_main.__file__ = script
+
+    original_main = sys.modules['__main__']
+    os.environ[pdf_fonts.FONT_PATH_ENV] = font_dir
+    sys.modules['__main__'] = dashboard_main
+    try:
+        bundle = build_export_bundle(df, ai_insight="## 요약", stamp='test')
+        pool = export_bundle._shared_pool
+    finally:
+        sys.modules['__main__'] = original_main
+        del os.environ[pdf_fonts.FONT_PATH_ENV]
+        if export_bundle._shared_pool is not None:
+            export_bundle._discard_pool(export_bundle._shared_pool)
+
+    # 스레드로 대체하지 않고 spawn 프로세스 풀에서 생성
+    assert isinstance(pool, ProcessPoolExecutor)
+    assert bundle.errors == []
+    assert bundle.files == ['PreSales_Report_test.xlsx', '사전영업_종합보고서_test.pdf', 'PreSales_Data_test.csv']
+    assert not os.path.exists(marker)
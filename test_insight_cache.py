@@ -0,0 +1,101 @@
+"""
+AI 인사이트 캐시 테스트 스크립트
+insight_cache.py의 만료(TTL), 항목 수 한도(LRU), 강제 새로 생성, 프롬프트+모델 키 동작을 확인합니다.
+
+    python -m pytest -q test_insight_cache.py
+"""
+
+import sys
+import os
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+import ai_analyzer
+from insight_cache import InsightCache, DEFAULT_MAX_ENTRIES, insight_cache_key
+from test_advanced_analytics import make_prepared_sample
+from test_ai_analyzer import FakeClient
+
+
+class FakeClock:
+    """InsightCache(clock=...)용 수동 시계 (초)"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    clock = FakeClock()
+    cache = InsightCache(tmp_path, ttl_seconds=60, clock=clock)
+    cache.put('a', '인사이트')
+
+    clock.now += 60
+    assert cache.get('a') == '인사이트'  # 경계 시각까지는 유효
+
+    clock.now += 1
+    assert cache.get('a') is None
+    assert not (tmp_path / 'a.json').exists()  # 만료 항목은 파일도 삭제
+
+    no_ttl = InsightCache(tmp_path, ttl_seconds=None, clock=clock)
+    no_ttl.put('b', '영구')
+    clock.now += 10 ** 9
+    assert no_ttl.get('b') == '영구'
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = InsightCache(tmp_path)
+    keys = [f"k{i:02d}" for i in range(DEFAULT_MAX_ENTRIES)]
+    for i, key in enumerate(keys):
+        cache.put(key, key)
+        # 파일 수정시각 = 마지막 사용 시각 → 순서가 분명하도록 과거 시각을 차례로 지정
+        stamp = 1_000_000 + i
+        os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+
+    # 가장 오래된 k00을 조회하면 최근 사용으로 바뀌어 살아남고, 그다음 오래된 k01이 삭제됨
+    assert cache.get('k00') == 'k00'
+    cache.put('new', 'new')
+
+    remaining = sorted(p.stem for p in tmp_path.glob('*.json'))
+    assert len(remaining) == DEFAULT_MAX_ENTRIES
+    assert 'k00' in remaining and 'new' in remaining
+    assert 'k01' not in remaining
+    assert cache.get('k01') is None
+
+
+def test_force_refresh_overwrites_cached_insight(tmp_path, monkeypatch):
+    monkeypatch.setattr(ai_analyzer, 'insight_cache', InsightCache(tmp_path))
+    df = make_prepared_sample(300)
+
+    first = ai_analyzer.generate_ai_insight(df, client=FakeClient(["첫 번째 분석"]))
+    assert first == "첫 번째 분석"
+
+    # 캐시 적중 → 새 응답을 받지 않음
+    unused = FakeClient(["호출되면 안 됨"])
+    assert ai_analyzer.generate_ai_insight(df, client=unused) == first
+    assert unused.models.calls == []
+
+    # 강제 새로 생성 → 같은 키의 항목을 새 응답으로 덮어씀
+    refreshed = ai_analyzer.generate_ai_insight(df, force_refresh=True, client=FakeClient(["두 번째 분석"]))
+    assert refreshed == "두 번째 분석"
+    assert len(list(tmp_path.glob('*.json'))) == 1
+    assert ai_analyzer.generate_ai_insight(df, client=unused) == refreshed
+    assert unused.models.calls == []
+
+
+def test_key_depends_on_prompt_and_model(tmp_path):
+    key = insight_cache_key("프롬프트", "gemini-a")
+    assert key == insight_cache_key("프롬프트", "gemini-a")
+    assert len(key) == 64
+    assert key != insight_cache_key("프롬프트 ", "gemini-a")
+    assert key != insight_cache_key("프롬프트", "gemini-b")
+    # 모델명과 프롬프트의 경계가 섞이지 않음
+    assert insight_cache_key("bc", "a") != insight_cache_key("c", "ab")
+
+    cache = InsightCache(tmp_path)
+    cache.put(key, "모델 A 결과", model="gemini-a")
+    assert cache.get(insight_cache_key("프롬프트", "gemini-a")) == "모델 A 결과"
+    assert cache.get(insight_cache_key("프롬프트", "gemini-b")) is None
+    assert cache.get(insight_cache_key("다른 프롬프트", "gemini-a")) is None
@@ -0,0 +1,287 @@
+"""
+LLM 클라이언트 테스트 스크립트
+로컬 HTTP 대역 서버(Gemini REST 응답 흉내)를 띄워 llm_client.py의 재시도/타임아웃/
+동시성 제한/서킷 브레이커/스트리밍/연결 재사용을 확인합니다.
+
+    python -m pytest -q test_llm_client.py
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+from llm_client import (
+    ResilientLLMClient,
+    CircuitBreaker,
+    LLMError,
+    LLMBusyError,
+    CircuitOpenError,
+)
+
+
+def gemini_payload(text):
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}]}
+
+
+class StandInServer:
+    """
+    Gemini API 대역 서버
+
+    scripted에 넣은 응답을 순서대로 돌려주고, 비어 있으면 기본 응답을 보냅니다.
+    응답 항목: ('ok', text) / ('status', code) / ('sleep', seconds) / ('stream', [text, ...])
+    """
+
+    def __init__(self):
+        self.scripted = []
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, code, body):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with server._lock:
+                    server.requests.append((self.path, self.client_address[1]))
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                    action = server.scripted.pop(0) if server.scripted else ('ok', 'default')
+                try:
+                    kind, value = action
+                    if kind == 'sleep':
+                        time.sleep(value)
+                        self._send_json(200, gemini_payload('slow'))
+                    elif kind == 'status':
+                        self._send_json(value, {"error": {"code": value, "message": "stand-in error", "status": "UNAVAILABLE"}})
+                    elif kind == 'stream':
+                        body = ''.join(f"data: {json.dumps(gemini_payload(t))}\r\n\r\n" for t in value).encode('utf-8')
+                        self.send_response(200)
+                        self.send_header('Content-Type', 'text/event-stream')
+                        self.send_header('Content-Length', str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                    else:
+                        self._send_json(200, gemini_payload(value))
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def make_client(server, **options):
+    options.setdefault('sleep', lambda seconds: None)  # 백오프 대기 생략
+    return ResilientLLMClient(api_key='test-key', base_url=server.url, **options)
+
+
+def test_generate_and_reuse_connection():
+    server = StandInServer()
+    try:
+        client = make_client(server)
+        assert client.generate("안녕") == 'default'
+        assert client.generate("안녕") == 'default'
+        assert all(':generateContent' in path for path, _ in server.requests)
+        # keep-alive: 같은 연결(클라이언트 포트)로 두 요청 처리
+        assert server.requests[0][1] == server.requests[1][1]
+    finally:
+        server.close()
+
+
+def test_retries_transient_errors_with_backoff():
+    server = StandInServer()
+    try:
+        delays = []
+        client = make_client(server, sleep=delays.append, max_retries=3)
+        server.scripted = [('status', 503), ('status', 429), ('ok', '복구됨')]
+        assert client.generate("x") == '복구됨'
+        assert len(server.requests) == 3
+        # 지터 포함 지수 백오프: 각 대기는 상한(base * 2^attempt) 이내
+        assert len(delays) == 2 and delays[0] <= 0.5 and delays[1] <= 1.0
+    finally:
+        server.close()
+
+
+def test_client_errors_are_not_retried():
+    server = StandInServer()
+    try:
+        client = make_client(server)
+        server.scripted = [('status', 400)]
+        try:
+            client.generate("x")
+            assert False, "LLMError expected"
+        except LLMError:
+            pass
+        assert len(server.requests) == 1
+        assert client.breaker.state == 'closed'
+    finally:
+        server.close()
+
+
+def test_request_timeout():
+    server = StandInServer()
+    try:
+        client = make_client(server, request_timeout=0.3, max_retries=1)
+        server.scripted = [('sleep', 1.5), ('sleep', 1.5)]
+        start = time.monotonic()
+        try:
+            client.generate("x")
+            assert False, "LLMError expected"
+        except LLMError:
+            pass
+        assert time.monotonic() - start < 1.5
+        assert len(server.requests) == 2
+    finally:
+        server.close()
+
+
+def test_circuit_breaker_opens_and_recovers():
+    server = StandInServer()
+    try:
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=lambda: now[0])
+        client = make_client(server, max_retries=0, breaker=breaker)
+        server.scripted = [('status', 503), ('status', 503)]
+        for _ in range(2):
+            try:
+                client.generate("x")
+            except LLMError:
+                pass
+        assert breaker.state == 'open'
+
+        try:
+            client.generate("x")
+            assert False, "CircuitOpenError expected"
+        except CircuitOpenError:
+            pass
+        assert len(server.requests) == 2  # 차단 중에는 서버로 요청이 가지 않음
+
+        now[0] += 31
+        assert breaker.state == 'half-open'
+        assert client.generate("x") == 'default'
+        assert breaker.state == 'closed'
+    finally:
+        server.close()
+
+
+def test_client_errors_do_not_reset_breaker():
+    server = StandInServer()
+    try:
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30, clock=lambda: now[0])
+        client = make_client(server, max_retries=0, breaker=breaker)
+        # 장애 중 잘못된 요청(400)이 섞여도 연속 실패 수는 유지
+        server.scripted = [('status', 503), ('status', 400), ('status', 503), ('status', 503)]
+        for _ in range(4):
+            try:
+                client.generate("x")
+            except LLMError:
+                pass
+        assert breaker.state == 'open'
+
+        # half-open 시험 호출이 400으로 끝나면 닫지도 다시 열지도 않고 다음 호출에 시험을 넘김
+        now[0] += 31
+        server.scripted = [('status', 400)]
+        try:
+            client.generate("x")
+        except LLMError:
+            pass
+        assert breaker.state == 'half-open'
+        assert client.generate("x") == 'default'
+        assert breaker.state == 'closed'
+    finally:
+        server.close()
+
+
+def test_bounded_concurrency():
+    server = StandInServer()
+    try:
+        client = make_client(server, max_concurrency=2)
+        server.scripted = [('sleep', 0.3)] * 6
+        threads = [threading.Thread(target=client.generate, args=("x",)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(server.requests) == 6
+        assert server.max_active <= 2
+
+        busy = make_client(server, max_concurrency=1, deadline=0.2)
+        server.scripted = [('sleep', 0.6)]
+        worker = threading.Thread(target=busy.generate, args=("x",))
+        worker.start()
+        time.sleep(0.1)
+        try:
+            busy.generate("y")
+            assert False, "LLMBusyError expected"
+        except LLMBusyError:
+            pass
+        worker.join()
+    finally:
+        server.close()
+
+
+def test_stream_chunks_and_retry_before_first_chunk():
+    server = StandInServer()
+    try:
+        client = make_client(server)
+        server.scripted = [('status', 503), ('stream', ["## 요약\n", "- 응답 300건\n", "끝"])]
+        chunks = list(client.stream("x"))
+        assert chunks == ["## 요약\n", "- 응답 300건\n", "끝"]
+        assert ':streamGenerateContent' in server.requests[-1][0]
+        assert len(server.requests) == 2
+    finally:
+        server.close()
+
+
+def test_abandoned_half_open_stream_releases_trial():
+    server = StandInServer()
+    try:
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30, clock=lambda: now[0])
+        client = make_client(server, max_retries=0, breaker=breaker)
+        server.scripted = [('status', 503)]
+        try:
+            client.generate("x")
+        except LLMError:
+            pass
+        now[0] += 31
+        assert breaker.state == 'half-open'
+
+        # 시험 호출 스트림을 첫 조각만 받고 닫음 (화면 재실행으로 소비자가 사라진 경우)
+        server.scripted = [('stream', ["첫 조각", "둘째 조각"])]
+        stream = client.stream("x")
+        assert next(stream) == "첫 조각"
+        stream.close()
+
+        assert breaker.state == 'half-open'
+        assert client.generate("x") == 'default'  # 다음 호출이 다시 시험 호출로 허용됨
+        assert breaker.state == 'closed'
+    finally:
+        server.close()
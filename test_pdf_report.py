@@ -0,0 +1,112 @@
+"""
+PDF 보고서 테스트 스크립트
+임시 한글 폰트로 pdf_fonts.py의 폰트 검색과 검색 결과 재사용을 확인합니다.
+
+    python -m pytest -q test_pdf_report.py
+"""
+
+import sys
+import os
+import tempfile
+from datetime import date
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pdf_fonts
+import pdf_report_generator
+from pdf_report_generator import generate_pdf_report
+from test_advanced_analytics import make_prepared_sample
+
+# 임시 폰트에 넣을 글자 (ASCII, 기호, 한글 음절)
+FONT_RANGES = [(0x21, 0x7F), (0xA1, 0x250), (0x2000, 0x2C00), (0x3000, 0x3400), (0xAC00, 0xD7A4)]
+
+
+def make_korean_font(font_dir):
+    """모든 글자가 사각형인 한글 TTF를 NanumGothic.ttf 이름으로 생성"""
+    codepoints = [c for start, end in FONT_RANGES for c in range(start, end)]
+    order = ['.notdef', 'space'] + [f'uni{c:04X}' for c in codepoints]
+    cmap = {c: f'uni{c:04X}' for c in codepoints}
+    cmap[0x20] = 'space'
+
+    pen = TTGlyphPen(None)
+    pen.moveTo((50, 0))
+    pen.lineTo((50, 700))
+    pen.lineTo((550, 700))
+    pen.lineTo((550, 0))
+    pen.closePath()
+    box, empty = pen.glyph(), TTGlyphPen(None).glyph()
+
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(order)
+    fb.setupCharacterMap(cmap)
+    fb.setupGlyf({g: (empty if g == 'space' else box) for g in order})
+    fb.setupHorizontalMetrics({g: (600, 0) for g in order})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({'familyName': 'TestGothic', 'styleName': 'Regular'})
+    fb.setupOS2(sTypoAscender=800, usWinAscent=800, usWinDescent=200)
+    fb.setupPost()
+    path = os.path.join(font_dir, 'NanumGothic.ttf')
+    fb.save(path)
+    return path
+
+
+def test_korean_font_is_found_on_search_path():
+    font_dir = tempfile.mkdtemp()
+    assert pdf_fonts.find_korean_font([font_dir]) is None
+
+    other_dir = tempfile.mkdtemp()
+    path = make_korean_font(other_dir)
+    font = pdf_fonts.find_korean_font([other_dir])
+    # 굵게 파일이 없으면 일반 파일을 함께 사용
+    assert font == pdf_fonts.KoreanFont(path, path, 0)
+
+
+def test_font_search_runs_once_across_reports():
+    font_dir = tempfile.mkdtemp()
+    make_korean_font(font_dir)
+    os.environ[pdf_fonts.FONT_PATH_ENV] = font_dir
+    original_index = pdf_fonts._index_font_files
+    try:
+        df = make_prepared_sample(300)
+        first = generate_pdf_report(df, ai_insight="## 요약\n- 총 응답 300건", raise_errors=True).getvalue()
+
+        # 두 번째 보고서는 찾아 둔 폰트 경로를 재사용 (폰트 폴더를 다시 탐색하지 않음)
+        def fail(search_path):
+            raise AssertionError("searched again")
+
+        pdf_fonts._index_font_files = fail
+        second = generate_pdf_report(df, ai_insight="## 요약\n- 재방문 의향 높음", raise_errors=True).getvalue()
+        assert first.startswith(b'%PDF') and second.startswith(b'%PDF')
+        assert b'/FontFile2' in second
+    finally:
+        pdf_fonts._index_font_files = original_index
+        del os.environ[pdf_fonts.FONT_PATH_ENV]
+
+
+def test_cover_date_comes_from_generated_on():
+    texts = []
+
+    class RecordingReport(pdf_report_generator.PDFReport):
+        def cell(self, w=None, h=None, text="", *args, **kwargs):
+            texts.append(str(text))
+            return super().cell(w, h, text, *args, **kwargs)
+
+    font_dir = tempfile.mkdtemp()
+    make_korean_font(font_dir)
+    os.environ[pdf_fonts.FONT_PATH_ENV] = font_dir
+    original_report = pdf_report_generator.PDFReport
+    pdf_report_generator.PDFReport = RecordingReport
+    try:
+        generate_pdf_report(make_prepared_sample(300), ai_insight="## 요약", raise_errors=True,
+                            generated_on=date(2025, 3, 4))
+    finally:
+        pdf_report_generator.PDFReport = original_report
+        del os.environ[pdf_fonts.FONT_PATH_ENV]
+
+    # 캐시된 PDF를 다시 내려줘도 맞도록 표지에는 날짜만 (시각 없음)
+    cover = [t for t in texts if t.startswith("보고서 생성일")]
+    assert cover == ["보고서 생성일: 2025년 03월 04일"]
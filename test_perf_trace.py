@@ -0,0 +1,119 @@
+"""
+성능 추적 테스트 스크립트
+perf_trace.py가 단계별 시간을 중첩 순서대로 기록하고, 실행이 끝나면 JSON Lines 로그에 남기는지 확인합니다.
+
+    python -m pytest -q test_perf_trace.py
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+import perf_trace
+from perf_trace import PerfLog, start_trace, finish_trace, span, summarize_runs
+
+
+def test_nested_spans_are_logged_once_per_run():
+    log = PerfLog(os.path.join(tempfile.mkdtemp(), 'runs.jsonl'))
+    trace = start_trace(session='abc')
+
+    with span('filter.date'):
+        pass
+    with span('tabs.main'):
+        with span('tabs.main.survey', rows=10):
+            pass
+        try:
+            with span('tabs.main.weekly'):
+                raise ValueError("차트 오류")
+        except ValueError:
+            pass
+    perf_trace.record('ai.job', 1.5, job='ai_insight')
+
+    # 추적 중이 아닌 스레드에서는 기록하지 않음
+    worker = threading.Thread(target=lambda: span('background').__enter__())
+    worker.start()
+    worker.join()
+
+    assert finish_trace(log) is trace
+    with span('after.finish'):
+        pass
+    assert finish_trace(log) is trace  # 두 번 끝내도 한 번만 기록
+
+    records = log.read()
+    assert len(records) == 1
+    record = records[0]
+    assert record['session'] == 'abc' and record['run'] == trace.run_id
+    assert [(s['name'], s['depth']) for s in record['spans']] == [
+        ('filter.date', 0), ('tabs.main', 0), ('tabs.main.survey', 1), ('tabs.main.weekly', 1), ('ai.job', 0),
+    ]
+    assert record['spans'][2]['tags'] == {'rows': 10}
+    assert record['spans'][3]['error'] == 'ValueError'
+    assert record['spans'][1]['seconds'] >= record['spans'][2]['seconds']
+    assert record['total'] >= record['spans'][1]['seconds']
+    assert [row['단계'] for row in trace.rows()][2] == '　tabs.main.survey'
+
+
+def test_interrupted_run_is_logged_by_next_run():
+    log = PerfLog(os.path.join(tempfile.mkdtemp(), 'runs.jsonl'))
+    first = start_trace(log=log, session='abc')
+
+    # st.rerun()/st.stop()처럼 실행 중간에 예외로 끊김 → finish_trace까지 가지 못함
+    try:
+        with span('tabs.main'):
+            raise KeyboardInterrupt
+    except KeyboardInterrupt:
+        pass
+    time.sleep(0.2)  # 다음 실행까지 기다린 시간은 끊긴 실행 시간에 넣지 않음
+
+    second = start_trace(log=log, session='abc')
+    records = log.read()
+    assert len(records) == 1
+    record = records[0]
+    assert record['run'] == first.run_id and record['interrupted'] is True
+    assert record['spans'][0]['error'] == 'KeyboardInterrupt'
+    assert record['spans'][0]['seconds'] <= record['total'] < 0.2
+
+    # 다음 실행이 다른 스레드에서 시작되면 세션에 보관한 직전 추적을 넘겨받아 기록
+    worker = threading.Thread(target=lambda: start_trace(previous=second, log=log, session='abc'))
+    worker.start()
+    worker.join()
+    assert second.interrupted
+    assert finish_trace(log) is second  # 이미 기록된 추적은 다시 쓰지 않음
+    assert [r['run'] for r in log.read()] == [first.run_id, second.run_id]
+
+    finished = start_trace(log=log, session='abc')
+    finish_trace(log)
+    start_trace(previous=finished, log=log, session='abc')
+    assert 'interrupted' not in log.read()[-1]
+    finish_trace(log)
+
+
+def test_log_rotation_and_summary():
+    path = os.path.join(tempfile.mkdtemp(), 'runs.jsonl')
+    log = PerfLog(path, max_bytes=200)
+    for i in range(5):
+        log.append({'run': str(i), 'spans': [
+            {'name': 'tabs.main', 'depth': 0, 'seconds': 0.1 * (i + 1)},
+            {'name': 'filter.take', 'depth': 0, 'seconds': 0.001},
+        ]})
+
+    assert os.path.exists(f"{path}.1")
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"run": "쓰다 만')  # 중간에 끊긴 줄은 건너뜀
+    records = log.read()
+    assert records and all(json.dumps(r) for r in records)
+
+    # 이전 파일은 하나만 보관 → 남은 기록만 집계 (가장 최근 기록은 항상 남음)
+    kept = PerfLog(f"{path}.1").read() + records
+    assert 0 < len(kept) < 5
+    summary = summarize_runs(kept)
+    assert [row['단계'] for row in summary] == ['tabs.main', 'filter.take']
+    assert summary[0]['실행 수'] == len(kept) and summary[0]['최대(ms)'] == 500.0
+
+    assert PerfLog(path, enabled=False).append({'run': 'x'}) is False
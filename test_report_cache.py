@@ -0,0 +1,94 @@
+"""
+보고서 캐시 테스트 스크립트
+report_cache.py의 키 생성, 메모리 한도 초과 시 디스크 이동, 디스크 한도 정리와
+차트 오류가 있는 엑셀 보고서가 캐시 대상에서 빠지는지 확인합니다.
+
+    python -m pytest -q test_report_cache.py
+"""
+
+import sys
+import os
+import tempfile
+
+import openpyxl
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+from report_cache import ReportCache, report_cache_key, frame_digest
+from excel_report_generator import ExcelReportGenerator
+from test_advanced_analytics import make_prepared_sample
+
+
+def test_cache_key_depends_on_rows_version_and_type():
+    df = make_prepared_sample(200)
+    rows = frame_digest(df)
+    assert frame_digest(df.copy()) == rows
+    assert frame_digest(df.iloc[1:]) != rows
+
+    key = report_cache_key(rows, 'v1', '전체')
+    assert report_cache_key(rows, 'v1', '전체') == key
+    assert report_cache_key(rows, 'v2', '전체') != key
+    assert report_cache_key(rows, 'v1', '데이터만') != key
+    assert report_cache_key(rows, 'v1', '전체', fmt='pdf') != key
+
+
+def test_memory_overflow_spills_to_disk():
+    cache_dir = tempfile.mkdtemp()
+    cache = ReportCache(cache_dir, max_memory_bytes=250, max_disk_bytes=10_000)
+    for i in range(3):
+        cache.put(f'k{i}', bytes([i]) * 100)
+
+    # 가장 오래된 항목은 디스크로 밀려났지만 여전히 조회 가능
+    assert 'k0' not in cache._memory
+    assert os.listdir(cache_dir) == ['k0.bin']
+    assert cache.get('k0') == bytes([0]) * 100
+
+    # 다른 프로세스(새 캐시 객체)도 디스크 항목을 사용
+    assert ReportCache(cache_dir).get('k0') == bytes([0]) * 100
+    assert cache.get('missing') is None
+
+
+def test_disk_is_size_bounded():
+    cache_dir = tempfile.mkdtemp()
+    cache = ReportCache(cache_dir, max_memory_bytes=0, max_disk_bytes=300)
+    for i in range(5):
+        cache.put(f'k{i}', bytes([i]) * 100)
+        os.utime(os.path.join(cache_dir, f'k{i}.bin'), (i, i))  # 기록 순서대로 mtime 지정
+
+    cache.put('k5', b'x' * 100)
+    names = sorted(os.listdir(cache_dir))
+    assert len(names) == 3 and 'k5.bin' in names and 'k0.bin' not in names
+
+
+def test_chart_failures_mark_report_as_not_cacheable():
+    df = make_prepared_sample(200)
+
+    # 엑셀 차트 삽입 실패 → 차트 시트에 안내 + errors 기록
+    native = ExcelReportGenerator(df)
+
+    def broken_native_charts(*args):
+        raise RuntimeError("차트 범위 오류")
+
+    native._insert_native_charts = broken_native_charts
+    data = native.create_report("전체")
+    assert native.errors == ['차트 시트 생성 중 오류 발생: 차트 범위 오류']
+    sheet = openpyxl.load_workbook(data)['차트']
+    assert sheet['A1'].value.startswith('차트 시트 생성 중 오류 발생')
+
+    # 차트 이미지 변환 실패 → 차트마다 errors 기록
+    class UnrenderableFigure:
+        def to_image(self, **kwargs):
+            raise ValueError("kaleido 없음")
+
+    image = ExcelReportGenerator(df, chart_backend='image')
+    image._create_pie_chart = image._create_bar_chart = lambda counts, title: UnrenderableFigure()
+    image._create_intent_chart = lambda counts: UnrenderableFigure()
+    image.create_report("전체")
+    assert len(image.errors) == 8
+    assert all('이미지 변환 실패: kaleido 없음' in e for e in image.errors)
+
+    # 정상 보고서는 errors가 비어 있어 캐시 대상
+    healthy = ExcelReportGenerator(df)
+    healthy.create_report("전체")
+    assert healthy.errors == []
@@ -0,0 +1,65 @@
+"""
+보고서 모델 테스트 스크립트
+report_model.py의 통계가 직접 계산한 값과 같은지, 엑셀/PDF/프롬프트가 같은 모델을 공유하는지 확인합니다.
+
+    python -m pytest -q test_report_model.py
+"""
+
+import sys
+import os
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+import report_model
+from report_model import ReportModel
+from ai_analyzer import collect_data_summary
+from analysis_context import AnalysisContext
+from excel_report_generator import ExcelReportGenerator
+from pdf_report_generator import get_key_stats
+from test_advanced_analytics import make_prepared_sample
+
+
+def test_model_matches_direct_aggregation():
+    df = make_prepared_sample(500)
+    model = ReportModel(df)
+
+    assert model.total == 500
+    assert model.avg_intent == df['Q6_Intent'].mean()
+    assert model.s_grade == len(df[df['Q6_Intent'] >= 6])
+    q5 = df['Q5_Label'].value_counts()
+    assert model.counts('Q5_Label').to_dict() == q5[q5 > 0].to_dict()
+    assert model.top_answer('Q5_Label') == (q5.index[0], int(q5.iloc[0]))
+
+    stats = get_key_stats(df, model)
+    assert stats['s_grade_pct'] == model.s_grade / 500 * 100
+    assert stats['eligible_pct'] == len(df[~df['Q7_Label'].isin(['무응답', '기타'])]) / 500 * 100
+
+    # 빈 데이터에서도 보고서 통계가 만들어짐
+    empty = ReportModel(df.iloc[:0])
+    assert empty.avg_intent is None and empty.s_grade_pct == 0
+    assert empty.date_range_label() == "전체 기간"
+
+
+def test_outputs_share_one_model():
+    df = make_prepared_sample(300)
+    context = AnalysisContext(df)
+    model = context.report_model
+
+    builds = []
+    original_init = ReportModel.__init__
+
+    def counting_init(self, frame):
+        builds.append(len(frame))
+        original_init(self, frame)
+
+    report_model.ReportModel.__init__ = counting_init
+    try:
+        ExcelReportGenerator(df, model=model).create_report("데이터만")
+        summary = collect_data_summary(df, context.report_model)
+    finally:
+        report_model.ReportModel.__init__ = original_init
+
+    assert builds == []
+    assert summary == collect_data_summary(df)
+    assert summary["총_응답_수"] == 300
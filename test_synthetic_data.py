@@ -0,0 +1,77 @@
+"""
+합성 데이터 / 성능 측정 테스트 스크립트
+synthetic_data.py가 '고객설문지DB' 구조의 데이터를 만들고, benchmark_suite.py가 단계별 시간을 JSON으로 남기는지 확인합니다.
+
+    python -m pytest -q test_synthetic_data.py
+"""
+
+import sys
+import os
+import tempfile
+
+import pandas as pd
+
+# 현재 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(__file__))
+
+from survey_data import read_survey_sheet, build_prepared_dataset
+from synthetic_data import SURVEY_COLUMNS, generate_survey_frame, generate_prepared_frame, write_survey_workbook
+from benchmark_suite import STAGES, run_benchmarks, save_report, load_report, compare_reports
+
+
+def test_generated_workbook_loads_like_survey_db():
+    regions = {'서울': {'마포구': ['망원동'], '은평구': ['불광동']}}
+    raw = generate_survey_frame(
+        400, start_date='2026-03-02', days=14, spots=['합정'], managers=['박조장', '최조장'],
+        regions=regions, seed=3,
+    )
+
+    assert list(raw.columns) == SURVEY_COLUMNS
+    assert raw.equals(generate_survey_frame(
+        400, start_date='2026-03-02', days=14, spots=['합정'], managers=['박조장', '최조장'],
+        regions=regions, seed=3,
+    ))
+    assert raw['접수일자'].min() >= pd.Timestamp('2026-03-02')
+    assert raw['접수일자'].max() <= pd.Timestamp('2026-03-15')
+    assert set(raw['거점']) == {'합정'}
+    assert set(raw['시/군/구'].dropna()) == {'마포구', '은평구'}
+
+    # xlsx로 저장했다가 대시보드 로더로 읽은 결과 = 메모리에서 바로 만든 분석용 데이터셋
+    path = os.path.join(tempfile.mkdtemp(), 'DB.xlsx')
+    write_survey_workbook(path, df=raw)
+    loaded = build_prepared_dataset(read_survey_sheet(path))
+    prepared = generate_prepared_frame(
+        400, start_date='2026-03-02', days=14, spots=['합정'], managers=['박조장', '최조장'],
+        regions=regions, seed=3,
+    )
+    assert len(loaded) == len(prepared) == raw['질문 1'].notna().sum()
+    assert loaded['Q6_Intent'].equals(prepared['Q6_Intent'])
+    assert loaded['Manager'].astype(str).tolist() == prepared['Manager'].astype(str).tolist()
+
+    # 분양 의향이 높을수록 상담 등급이 높음 (1=S)
+    high = prepared.loc[prepared['Q6_Intent'] >= 6, 'Grade'].mean()
+    low = prepared.loc[prepared['Q6_Intent'] <= 3, 'Grade'].mean()
+    assert high < low
+
+
+def test_benchmark_results_round_trip_and_compare():
+    steps = []
+    report = run_benchmarks(
+        [300], repeat=1, skip={'load_xlsx', 'excel', 'pdf'}, label='test',
+        progress=lambda n_rows, stage, result: steps.append(stage),
+    )
+
+    measured = [s for s in STAGES if s not in ('load_xlsx', 'excel', 'pdf')]
+    assert steps == measured
+    assert list(report['results']['300']) == measured
+    assert all(r['seconds'] >= 0 for r in report['results']['300'].values())
+
+    path = save_report(report, os.path.join(tempfile.mkdtemp(), 'bench.json'))
+    baseline = load_report(path)
+    assert baseline == report
+
+    slower = load_report(path)
+    slower['results']['300']['mapping']['seconds'] = baseline['results']['300']['mapping']['seconds'] * 2 + 1
+    comparison = compare_reports(baseline, slower)
+    assert [row['stage'] for row in comparison] == measured
+    assert [row['stage'] for row in comparison if row['regression']] == ['mapping']
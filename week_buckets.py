@@ -0,0 +1,93 @@
+"""
+주차 구간 모듈 (Week Buckets)
+- 접수일자를 월~일 주차 구간으로 분류 ("1주차 (12/08~12/14)")
+- 주차 번호는 벡터 연산으로 계산하고, 라벨 문자열은 주차별로 한 번만 생성
+- 결과는 주차 순서의 ordered Categorical → 별도 파싱 없이 정렬 가능
+"""
+
+import numpy as np
+import pandas as pd
+
+# 날짜가 없는 행의 라벨 (항상 마지막 주차 뒤에 정렬)
+UNKNOWN_WEEK_LABEL = '미확인'
+
+_NS_PER_DAY = 24 * 60 * 60 * 10 ** 9
+
+
+def format_week_label(week_num, anchor):
+    """주차 번호 → "N주차 (MM/DD~MM/DD)" 라벨"""
+    w_start = anchor + pd.Timedelta(days=(week_num - 1) * 7)
+    w_end = w_start + pd.Timedelta(days=6)
+    return f"{week_num}주차 ({w_start.strftime('%m/%d')}~{w_end.strftime('%m/%d')})"
+
+
+def format_week_range_label(first_week, last_week, anchor):
+    """여러 주를 묶은 구간 라벨 → "N~M주차 (MM/DD~MM/DD)" (한 주면 format_week_label과 같음)"""
+    if first_week == last_week:
+        return format_week_label(first_week, anchor)
+    w_start = anchor + pd.Timedelta(days=(first_week - 1) * 7)
+    w_end = anchor + pd.Timedelta(days=last_week * 7 - 1)
+    return f"{first_week}~{last_week}주차 ({w_start.strftime('%m/%d')}~{w_end.strftime('%m/%d')})"
+
+
+def get_week_numbers(date_series):
+    """
+    날짜별 주차 번호 계산 (get_weekly_period와 같은 기준)
+
+    Returns:
+        tuple: (주차 번호 int64 배열 - 날짜 없으면 0, 1주차 기준일 Timestamp 또는 None)
+    """
+    dates = pd.to_datetime(date_series, errors='coerce')
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    valid = ~np.isnat(values)
+    week_nums = np.zeros(len(values), dtype=np.int64)
+    if not valid.any():
+        return week_nums, None
+
+    # 1주차 기준일: 최소 날짜가 속한 주의 월요일
+    min_date = pd.Timestamp(values[valid].min())
+    anchor = min_date - pd.Timedelta(days=min_date.weekday())
+
+    # 기준일로부터 경과 일수 // 7 + 1
+    elapsed = values[valid].astype(np.int64) - np.int64(anchor.value)
+    week_nums[valid] = elapsed // _NS_PER_DAY // 7 + 1
+    return week_nums, anchor
+
+
+def get_weekly_period(date_series):
+    """
+    날짜를 주차별(월~일)로 그룹화
+
+    가장 이른 날짜가 속한 주의 월요일을 1주차 시작으로 삼습니다.
+
+    Args:
+        date_series: 날짜 Series (datetime으로 변환 가능한 값)
+
+    Returns:
+        Series: 주차 라벨의 ordered Categorical (주차 순서, '미확인'은 마지막)
+    """
+    # 1. 주차 번호 (벡터 연산, 날짜 없으면 0)
+    week_nums, anchor = get_week_numbers(date_series)
+    valid = week_nums > 0
+
+    if not valid.any():
+        categories = [UNKNOWN_WEEK_LABEL] if len(week_nums) else []
+        codes = np.zeros(len(week_nums), dtype=np.int64)
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=categories, ordered=True),
+            index=date_series.index,
+        )
+
+    # 2. 존재하는 주차만 라벨 생성 (주차 수만큼만 strftime)
+    present, week_codes = np.unique(week_nums[valid], return_inverse=True)
+    categories = [format_week_label(int(w), anchor) for w in present]
+
+    codes = np.full(len(week_nums), len(categories), dtype=np.int64)
+    codes[valid] = week_codes
+    if not valid.all():
+        categories.append(UNKNOWN_WEEK_LABEL)
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories, ordered=True),
+        index=date_series.index,
+    )